@@ -4,21 +4,48 @@ from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .const import CONF_ENVIRONMENT, DOMAIN, SIGNAL_ENTRY_UNLOADED
 from .coordinator import UKFuelFinderCoordinator
+from .history import async_get_price_history
+from .services import async_setup_services
+from .store import async_get_station_store
+from .token_store import async_get_token_store
+from .websocket_api import async_setup_websocket_api
 
-PLATFORMS = ["sensor"]
+PLATFORMS = ["binary_sensor", "sensor"]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the UK Fuel Finder services and WebSocket API."""
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up UK Fuel Finder from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    coordinator = UKFuelFinderCoordinator(hass, entry.data)
+    token_store = await async_get_token_store(hass)
+    station_store = await async_get_station_store(hass, entry.data[CONF_ENVIRONMENT])
+    price_history = await async_get_price_history(hass)
+    coordinator = UKFuelFinderCoordinator(
+        hass, entry.data, token_store, station_store, price_history
+    )
     coordinator.config_entry = entry  # Set reference for device removal
 
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        # Setup is retried with a new coordinator, stop this one's worker pool
+        await coordinator.async_shutdown()
+        raise
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
@@ -32,6 +59,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if coordinator:
+            # Cancel queued API calls, a running call finishes in the background
+            await coordinator.async_shutdown()
+        # End WebSocket subscriptions to the old coordinator
+        async_dispatcher_send(hass, SIGNAL_ENTRY_UNLOADED.format(entry.entry_id))
 
     return unload_ok
@@ -0,0 +1,113 @@
+"""Binary sensor platform for UK Fuel Finder."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import ATTRIBUTION, CONF_FUEL_TYPES, DOMAIN, FUEL_TYPES
+from .coordinator import UKFuelFinderCoordinator
+
+
+@dataclass(frozen=True, kw_only=True)
+class UKFuelFinderPriceMoveDescription(BinarySensorEntityDescription):
+    """Describe a price move sensor."""
+
+    stations_key: str  # changes of nearby stations that moved this way
+
+
+PRICE_MOVE_SENSORS: tuple[UKFuelFinderPriceMoveDescription, ...] = (
+    UKFuelFinderPriceMoveDescription(
+        key="drop",
+        name="Price Drop",
+        icon="mdi:trending-down",
+        stations_key="dropped",
+    ),
+    UKFuelFinderPriceMoveDescription(
+        key="spike",
+        name="Price Spike",
+        icon="mdi:trending-up",
+        stations_key="rose",
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up UK Fuel Finder binary sensors."""
+    coordinator: UKFuelFinderCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    # One drop and one spike sensor per selected fuel type
+    async_add_entities(
+        UKFuelFinderPriceMoveSensor(coordinator, fuel_type, description)
+        for fuel_type in entry.data.get(CONF_FUEL_TYPES, FUEL_TYPES)
+        for description in PRICE_MOVE_SENSORS
+    )
+
+
+class UKFuelFinderPriceMoveSensor(CoordinatorEntity[UKFuelFinderCoordinator], BinarySensorEntity):
+    """Binary sensor that is on when prices of a fuel type dropped or spiked."""
+
+    entity_description: UKFuelFinderPriceMoveDescription
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: UKFuelFinderCoordinator,
+        fuel_type: str,
+        description: UKFuelFinderPriceMoveDescription,
+    ) -> None:
+        """Initialize the price move sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._fuel_type = fuel_type
+        entry_id = coordinator.config_entry.entry_id
+        self._attr_unique_id = f"{entry_id}_price_{description.key}_{fuel_type}"
+        self._attr_name = f"{fuel_type.replace('_', ' ').title()} {description.name}"
+
+        # Same device as the cheapest sensors
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, "cheapest")},
+            name="Cheapest Fuel Prices",
+            manufacturer="UK Fuel Finder",
+            model="Aggregate Sensor",
+        )
+
+    def _moves(self) -> dict[str, Any]:
+        """Return the price moves of the fuel type in the last refresh."""
+        return (self.coordinator.data or {}).get("price_moves", {}).get(self._fuel_type, {})
+
+    @property
+    def is_on(self) -> bool:
+        """Return True if prices moved by at least the threshold."""
+        return bool(self._moves().get(self.entity_description.key))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the stations that moved and the cheapest price window."""
+        moves = self._moves()
+        price_moves = self.coordinator.price_moves
+        return {
+            "fuel_type": self._fuel_type,
+            "stations": moves.get(self.entity_description.stations_key, []),
+            "cheapest_price": moves.get("cheapest_price"),
+            "cheapest_change": moves.get("cheapest_change"),
+            "window_low": moves.get("window_low"),
+            "window_high": moves.get("window_high"),
+            "threshold": price_moves.threshold,
+            "window_hours": price_moves.window.total_seconds() / 3600,
+            "attribution": ATTRIBUTION,
+        }
@@ -0,0 +1,108 @@
+"""Filters for extra cheapest price sensors."""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    CONF_CHEAPEST_AMENITY,
+    CONF_CHEAPEST_BRANDS,
+    CONF_CHEAPEST_FILTERS,
+    FILTER_AMENITY,
+    FILTER_BRANDS,
+    FILTER_NO_MOTORWAY,
+    FILTER_OPEN,
+    FILTER_OPEN_NOW,
+    FILTER_SUPERMARKET,
+)
+from .station_index import StationIndex
+
+
+@dataclass(frozen=True, kw_only=True)
+class CheapestFilter:
+    """Stations a filtered cheapest sensor picks from."""
+
+    key: str
+    name: str
+    brands: tuple[str, ...] | None = None
+    amenities: tuple[str, ...] = ()
+    is_supermarket: bool | None = None
+    is_motorway: bool | None = None
+    exclude_closed: bool = False
+    open_now: bool = False  # also leave out stations outside their opening hours
+
+    def select(
+        self, index: StationIndex, closed_now: frozenset[str] = frozenset()
+    ) -> frozenset[str]:
+        """Return the IDs of matching stations from the station index.
+
+        Args:
+            index: Station index of the last refresh
+            closed_now: IDs of stations currently outside their opening hours
+        """
+        selected = index.select(
+            brands=self.brands,
+            amenities=self.amenities,
+            is_supermarket=self.is_supermarket,
+            is_motorway=self.is_motorway,
+            exclude_closed=self.exclude_closed,
+        )
+        return selected - closed_now if self.open_now else selected
+
+
+PRESET_FILTERS = {
+    FILTER_SUPERMARKET: CheapestFilter(
+        key=FILTER_SUPERMARKET, name="Supermarket", is_supermarket=True
+    ),
+    FILTER_NO_MOTORWAY: CheapestFilter(
+        key=FILTER_NO_MOTORWAY, name="Off Motorway", is_motorway=False
+    ),
+    FILTER_OPEN: CheapestFilter(key=FILTER_OPEN, name="Open", exclude_closed=True),
+    FILTER_OPEN_NOW: CheapestFilter(
+        key=FILTER_OPEN_NOW, name="Open Now", exclude_closed=True, open_now=True
+    ),
+}
+
+
+def brands_key(brands: tuple[str, ...]) -> str:
+    """Return a filter key identifying a set of brands.
+
+    The key ends up in sensor unique IDs, so a different brand list gets a
+    new sensor with its own history instead of taking over the old one.
+    Order, case and duplicates do not change the key.
+    """
+    normalized = ",".join(sorted({brand.casefold() for brand in brands}))
+    return f"{FILTER_BRANDS}_{hashlib.sha1(normalized.encode()).hexdigest()[:8]}"
+
+
+def cheapest_filters(entry_data: dict[str, Any]) -> list[CheapestFilter]:
+    """Return the filters configured for extra cheapest sensors."""
+    filters = [
+        PRESET_FILTERS[key]
+        for key in entry_data.get(CONF_CHEAPEST_FILTERS, [])
+        if key in PRESET_FILTERS
+    ]
+
+    brands = tuple(
+        brand.strip()
+        for brand in entry_data.get(CONF_CHEAPEST_BRANDS, "").split(",")
+        if brand.strip()
+    )
+    if brands:
+        filters.append(
+            CheapestFilter(key=brands_key(brands), name=", ".join(brands), brands=brands)
+        )
+
+    amenity = entry_data.get(CONF_CHEAPEST_AMENITY, "").strip()
+    if amenity:
+        filters.append(
+            CheapestFilter(
+                key=f"{FILTER_AMENITY}_{amenity}",
+                name=f"With {amenity.replace('_', ' ').title()}",
+                amenities=(amenity,),
+            )
+        )
+
+    return filters
@@ -0,0 +1,86 @@
+"""Circuit breaker with jittered exponential backoff for the Fuel Finder API."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import BACKOFF_MAX, BREAKER_FAILURE_THRESHOLD
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Track consecutive API failures and decide when to try again.
+
+    Every failure pushes the next attempt out exponentially from the normal
+    update interval, with jitter so many instances do not retry in lockstep.
+    After BREAKER_FAILURE_THRESHOLD consecutive failures, or when the API
+    sends a Retry-After, the breaker opens and rejects refreshes until the
+    backoff has elapsed. The first attempt after that is a half-open probe.
+    """
+
+    def __init__(
+        self,
+        base_delay: timedelta,
+        threshold: int = BREAKER_FAILURE_THRESHOLD,
+        max_delay: timedelta = timedelta(seconds=BACKOFF_MAX),
+    ) -> None:
+        """Initialize the breaker."""
+        self.base_delay = base_delay
+        self.threshold = threshold
+        self.max_delay = max(max_delay, base_delay)
+        self.failures = 0
+        self.open_until: datetime | None = None
+
+    @property
+    def state(self) -> str:
+        """Return the breaker state."""
+        if self.open_until is None:
+            return STATE_CLOSED
+        if dt_util.utcnow() < self.open_until:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    def allow_request(self) -> bool:
+        """Return True if an API request may be made now."""
+        return self.state != STATE_OPEN
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        self.failures = 0
+        self.open_until = None
+
+    def record_failure(self, retry_after: float | None = None) -> timedelta:
+        """Record a failed request and return the delay before the next attempt.
+
+        Args:
+            retry_after: Seconds the API asked us to wait (HTTP 429), if any
+        """
+        self.failures += 1
+
+        # Exponential backoff from the normal interval, jittered upwards so a
+        # retry never comes sooner than a normal poll would
+        floor = min(self.base_delay * 2 ** (self.failures - 1), self.max_delay)
+        delay = min(floor * (1 + random.random()), self.max_delay)
+
+        if retry_after:
+            delay = max(delay, timedelta(seconds=retry_after))
+
+        if retry_after or self.failures >= self.threshold:
+            self.open_until = dt_util.utcnow() + delay
+
+        return delay
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "open_until": self.open_until.isoformat() if self.open_until else None,
+        }
@@ -2,29 +2,86 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET, CONF_LATITUDE, CONF_LONGITUDE
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
 
 from .const import (
+    CHEAPEST_FILTER_OPTIONS,
+    CONF_CHEAPEST_AMENITY,
+    CONF_CHEAPEST_BRANDS,
+    CONF_CHEAPEST_FILTERS,
     CONF_ENVIRONMENT,
+    CONF_EXTERNAL_STATISTICS,
     CONF_FUEL_TYPES,
+    CONF_MAX_DATA_AGE,
+    CONF_MAX_PRICE_AGE,
+    CONF_PRICE_MOVE_THRESHOLD,
+    CONF_PRICE_MOVE_WINDOW,
     CONF_RADIUS,
     CONF_UPDATE_INTERVAL,
     DEFAULT_ENVIRONMENT,
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_MAX_PRICE_AGE,
+    DEFAULT_PRICE_MOVE_THRESHOLD,
+    DEFAULT_PRICE_MOVE_WINDOW,
     DEFAULT_RADIUS,
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
     FUEL_TYPES,
+    MAX_MAX_DATA_AGE,
+    MAX_MAX_PRICE_AGE,
+    MAX_PRICE_MOVE_THRESHOLD,
+    MAX_PRICE_MOVE_WINDOW,
     MAX_RADIUS,
     MAX_UPDATE_INTERVAL,
+    MIN_MAX_DATA_AGE,
+    MIN_MAX_PRICE_AGE,
+    MIN_PRICE_MOVE_THRESHOLD,
+    MIN_PRICE_MOVE_WINDOW,
     MIN_RADIUS,
     MIN_UPDATE_INTERVAL,
+    VALIDATION_TIMEOUT,
 )
+from .token_store import async_get_token_store
+
+
+async def _async_validate_credentials(
+    hass: HomeAssistant, client_id: str, client_secret: str, environment: str
+) -> str | None:
+    """Check credentials with a single token request.
+
+    Downloading station data just to test authentication takes many seconds
+    and burns API quota, so only the OAuth token exchange is performed. The
+    token is cached so the coordinator's first refresh can reuse it.
+
+    Returns:
+        An error key for the form, or None if the credentials are valid
+    """
+    from ukfuelfinder import FuelFinderClient
+    from ukfuelfinder.exceptions import InvalidCredentialsError
+
+    try:
+        client = FuelFinderClient(
+            client_id=client_id,
+            client_secret=client_secret,
+            environment=environment,
+        )
+        async with asyncio.timeout(VALIDATION_TIMEOUT):
+            await hass.async_add_executor_job(client.authenticator.get_token)
+    except InvalidCredentialsError:
+        return "invalid_auth"
+    except Exception:
+        return "cannot_connect"
+
+    token_store = await async_get_token_store(hass)
+    token_store.capture(client, client_id, environment)
+    return None
 
 
 class UKFuelFinderConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -44,20 +101,14 @@ class UKFuelFinderConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "no_fuel_types"
             else:
                 # Validate credentials
-                try:
-                    from ukfuelfinder import FuelFinderClient
-
-                    client = FuelFinderClient(
-                        client_id=user_input[CONF_CLIENT_ID],
-                        client_secret=user_input[CONF_CLIENT_SECRET],
-                        environment=user_input[CONF_ENVIRONMENT],
-                    )
-
-                    # Test connection
-                    await self.hass.async_add_executor_job(client.get_all_pfs_info)
-
-                except Exception:
-                    errors["base"] = "cannot_connect"
+                error = await _async_validate_credentials(
+                    self.hass,
+                    user_input[CONF_CLIENT_ID],
+                    user_input[CONF_CLIENT_SECRET],
+                    user_input[CONF_ENVIRONMENT],
+                )
+                if error:
+                    errors["base"] = error
                 else:
                     # Create unique ID based on client_id
                     await self.async_set_unique_id(user_input[CONF_CLIENT_ID])
@@ -113,22 +164,15 @@ class UKFuelFinderConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
 
         if user_input is not None:
-            try:
-                from ukfuelfinder import FuelFinderClient
-
-                entry = self._get_reauth_entry()
-
-                client = FuelFinderClient(
-                    client_id=user_input[CONF_CLIENT_ID],
-                    client_secret=user_input[CONF_CLIENT_SECRET],
-                    environment=entry.data[CONF_ENVIRONMENT],
-                )
-
-                # Test connection
-                await self.hass.async_add_executor_job(client.get_all_pfs_info)
-
-            except Exception:
-                errors["base"] = "invalid_auth"
+            entry = self._get_reauth_entry()
+            error = await _async_validate_credentials(
+                self.hass,
+                user_input[CONF_CLIENT_ID],
+                user_input[CONF_CLIENT_SECRET],
+                entry.data[CONF_ENVIRONMENT],
+            )
+            if error:
+                errors["base"] = error
             else:
                 return self.async_update_reload_and_abort(
                     entry,
@@ -169,6 +213,14 @@ class UKFuelFinderConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         CONF_RADIUS: user_input[CONF_RADIUS],
                         CONF_UPDATE_INTERVAL: user_input[CONF_UPDATE_INTERVAL],
                         CONF_FUEL_TYPES: user_input[CONF_FUEL_TYPES],
+                        CONF_MAX_DATA_AGE: user_input[CONF_MAX_DATA_AGE],
+                        CONF_MAX_PRICE_AGE: user_input[CONF_MAX_PRICE_AGE],
+                        CONF_EXTERNAL_STATISTICS: user_input[CONF_EXTERNAL_STATISTICS],
+                        CONF_CHEAPEST_FILTERS: user_input[CONF_CHEAPEST_FILTERS],
+                        CONF_CHEAPEST_BRANDS: user_input[CONF_CHEAPEST_BRANDS],
+                        CONF_CHEAPEST_AMENITY: user_input[CONF_CHEAPEST_AMENITY],
+                        CONF_PRICE_MOVE_THRESHOLD: user_input[CONF_PRICE_MOVE_THRESHOLD],
+                        CONF_PRICE_MOVE_WINDOW: user_input[CONF_PRICE_MOVE_WINDOW],
                     },
                 )
 
@@ -192,6 +244,49 @@ class UKFuelFinderConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     ): cv.multi_select(
                         {fuel_type: fuel_type.replace("_", " ").title() for fuel_type in FUEL_TYPES}
                     ),
+                    vol.Optional(
+                        CONF_MAX_DATA_AGE,
+                        default=entry.data.get(CONF_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_MAX_DATA_AGE, max=MAX_MAX_DATA_AGE),
+                    ),
+                    vol.Optional(
+                        CONF_MAX_PRICE_AGE,
+                        default=entry.data.get(CONF_MAX_PRICE_AGE, DEFAULT_MAX_PRICE_AGE),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_MAX_PRICE_AGE, max=MAX_MAX_PRICE_AGE),
+                    ),
+                    vol.Optional(
+                        CONF_EXTERNAL_STATISTICS,
+                        default=entry.data.get(CONF_EXTERNAL_STATISTICS, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_CHEAPEST_FILTERS, default=entry.data.get(CONF_CHEAPEST_FILTERS, [])
+                    ): cv.multi_select(CHEAPEST_FILTER_OPTIONS),
+                    vol.Optional(
+                        CONF_CHEAPEST_BRANDS, default=entry.data.get(CONF_CHEAPEST_BRANDS, "")
+                    ): str,
+                    vol.Optional(
+                        CONF_CHEAPEST_AMENITY, default=entry.data.get(CONF_CHEAPEST_AMENITY, "")
+                    ): str,
+                    vol.Optional(
+                        CONF_PRICE_MOVE_THRESHOLD,
+                        default=entry.data.get(
+                            CONF_PRICE_MOVE_THRESHOLD, DEFAULT_PRICE_MOVE_THRESHOLD
+                        ),
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=MIN_PRICE_MOVE_THRESHOLD, max=MAX_PRICE_MOVE_THRESHOLD),
+                    ),
+                    vol.Optional(
+                        CONF_PRICE_MOVE_WINDOW,
+                        default=entry.data.get(CONF_PRICE_MOVE_WINDOW, DEFAULT_PRICE_MOVE_WINDOW),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_PRICE_MOVE_WINDOW, max=MAX_PRICE_MOVE_WINDOW),
+                    ),
                 }
             ),
             errors=errors,
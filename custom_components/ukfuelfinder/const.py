@@ -7,17 +7,61 @@ CONF_ENVIRONMENT = "environment"
 CONF_RADIUS = "radius"
 CONF_UPDATE_INTERVAL = "update_interval"
 CONF_FUEL_TYPES = "fuel_types"
+CONF_MAX_DATA_AGE = "max_data_age"
+CONF_MAX_PRICE_AGE = "max_price_age"
+CONF_EXTERNAL_STATISTICS = "external_statistics"
+CONF_CHEAPEST_FILTERS = "cheapest_filters"
+CONF_CHEAPEST_BRANDS = "cheapest_brands"
+CONF_CHEAPEST_AMENITY = "cheapest_amenity"
+CONF_PRICE_MOVE_THRESHOLD = "price_move_threshold"
+CONF_PRICE_MOVE_WINDOW = "price_move_window"
 
 # Defaults
 DEFAULT_ENVIRONMENT = "production"
 DEFAULT_RADIUS = 5.0
 DEFAULT_UPDATE_INTERVAL = 30
+DEFAULT_MAX_DATA_AGE = 120  # minutes
+DEFAULT_MAX_PRICE_AGE = 30  # days
+DEFAULT_PRICE_MOVE_THRESHOLD = 3.0  # pence
+DEFAULT_PRICE_MOVE_WINDOW = 24  # hours
 
 # Limits
 MIN_RADIUS = 0.1
 MAX_RADIUS = 50.0
 MIN_UPDATE_INTERVAL = 5
 MAX_UPDATE_INTERVAL = 1440
+MIN_MAX_DATA_AGE = 0
+MAX_MAX_DATA_AGE = 1440
+MIN_MAX_PRICE_AGE = 0
+MAX_MAX_PRICE_AGE = 365
+MIN_PRICE_MOVE_THRESHOLD = 0.1
+MAX_PRICE_MOVE_THRESHOLD = 50.0
+MIN_PRICE_MOVE_WINDOW = 1
+MAX_PRICE_MOVE_WINDOW = 168
+
+# API worker pool
+API_MAX_WORKERS = 2
+API_CALL_TIMEOUT = 180  # seconds, a national download is ~20 paginated requests
+VALIDATION_TIMEOUT = 30  # seconds for the config flow credential check
+PRICE_PAGE_SIZE = 500  # records per /pfs and /pfs/fuel-prices page, a short page is the last one
+
+# Minimum spacing between real API fetches, refreshes inside it reuse the last result
+MIN_REFRESH_SPACING = 60  # seconds
+
+# Fired once per refresh with the prices that changed since the last one
+EVENT_PRICES_CHANGED = f"{DOMAIN}_prices_changed"
+
+# Dispatcher signal sent when a config entry unloads, formatted with the entry ID
+SIGNAL_ENTRY_UNLOADED = f"{DOMAIN}_entry_unloaded_{{}}"
+
+# Data components fetched on each refresh
+COMPONENT_STATIONS = "stations"
+COMPONENT_PRICES = "prices"
+
+# Failure handling
+BREAKER_FAILURE_THRESHOLD = 3  # consecutive failures before refreshes are rejected
+BACKOFF_MAX = 21600  # seconds, cap for the exponential retry delay
+MAX_POLL_PHASE_OFFSET = 300  # seconds, random delay added to the first scheduled poll
 
 # Fuel types
 # Maps to API fuel type codes (normalized to lowercase with underscores)
@@ -32,5 +76,19 @@ FUEL_TYPES = [
     "lpg",  # Liquefied petroleum gas
 ]
 
+# Extra cheapest sensors
+FILTER_SUPERMARKET = "supermarket"  # supermarket stations only
+FILTER_NO_MOTORWAY = "no_motorway"  # motorway service stations left out
+FILTER_OPEN = "open"  # temporarily or permanently closed stations left out
+FILTER_OPEN_NOW = "open_now"  # closed stations and those outside their opening hours left out
+FILTER_BRANDS = "brands"  # stations of the configured brands
+FILTER_AMENITY = "amenity"  # stations with the configured amenity
+CHEAPEST_FILTER_OPTIONS = {
+    FILTER_SUPERMARKET: "Supermarket only",
+    FILTER_NO_MOTORWAY: "Exclude motorway stations",
+    FILTER_OPEN: "Exclude closed stations",
+    FILTER_OPEN_NOW: "Exclude stations closed right now (opening hours)",
+}
+
 # Attribution
 ATTRIBUTION = "Data provided by UK Government Fuel Finder"
@@ -2,31 +2,148 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import partial
 from typing import Any
 
 from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET, CONF_LATITUDE, CONF_LONGITUDE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-
-from .const import CONF_ENVIRONMENT, CONF_RADIUS, CONF_UPDATE_INTERVAL, DOMAIN
+from homeassistant.util import dt as dt_util
+
+from .cheapest_filters import cheapest_filters
+from .circuit_breaker import CircuitBreaker
+from .const import (
+    COMPONENT_PRICES,
+    COMPONENT_STATIONS,
+    CONF_ENVIRONMENT,
+    CONF_EXTERNAL_STATISTICS,
+    CONF_MAX_DATA_AGE,
+    CONF_MAX_PRICE_AGE,
+    CONF_PRICE_MOVE_THRESHOLD,
+    CONF_PRICE_MOVE_WINDOW,
+    CONF_RADIUS,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_MAX_PRICE_AGE,
+    DEFAULT_PRICE_MOVE_THRESHOLD,
+    DEFAULT_PRICE_MOVE_WINDOW,
+    DOMAIN,
+    EVENT_PRICES_CHANGED,
+    MAX_POLL_PHASE_OFFSET,
+    MIN_REFRESH_SPACING,
+    PRICE_PAGE_SIZE,
+)
+from .executor import FuelFinderExecutor
+from .external_statistics import PriceStatisticsPublisher
+from .freshness import price_freshness
+from .history import PriceHistory
+from .metrics import (
+    PHASE_AUTH,
+    PHASE_CHEAPEST,
+    PHASE_CLEANUP,
+    PHASE_HISTORY,
+    PHASE_JOIN,
+    PHASE_PRICES,
+    PHASE_REGIONAL,
+    PHASE_SEARCH,
+    PHASE_STORE,
+    PhaseTimer,
+    RefreshMetrics,
+)
+from .opening_times import OpeningTable
+from .price_changes import PriceMoveTracker, PriceSnapshot
+from .regional import (
+    REGION_AREA,
+    REGION_COUNTY,
+    REGION_NAMES,
+    REGION_NATIONAL,
+    build_price_indexes,
+    home_region,
+)
+from .station_index import StationIndex
+from .store import SYNC_PRICES, SYNC_STATIONS, StationStore
+from .token_store import TokenStore
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class _NoResponseCache:
+    """Response cache for the client's price service that keeps nothing.
+
+    ``PriceService`` stores every page it downloads, even when asked not to
+    use the cache, which would hold the whole national price download in
+    memory for the cache TTL.
+    """
+
+    def generate_key(self, endpoint: str, params: dict[str, Any] | None = None) -> str:
+        """Return the endpoint, nothing is looked up by it."""
+        return endpoint
+
+    def get(self, key: str) -> None:
+        """Always miss."""
+        return None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        """Drop the response."""
+
+    def clear(self) -> None:
+        """Nothing to clear."""
+
+
 class UKFuelFinderCoordinator(DataUpdateCoordinator):
     """Class to manage fetching UK Fuel Finder data."""
 
-    def __init__(self, hass: HomeAssistant, entry_data: dict[str, Any]) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_data: dict[str, Any],
+        token_store: TokenStore | None = None,
+        station_store: StationStore | None = None,
+        price_history: PriceHistory | None = None,
+    ) -> None:
         """Initialize coordinator."""
         self.entry_data = entry_data
         self.config_entry = None  # Set by __init__.py after coordinator creation
         self.previous_stations: set[str] = set()
         self.missing_stations: dict[str, int] = {}  # station_id -> missing_count
 
+        # Refresh coalescing: one fetch at a time, recent results are reused
+        self._fetch_lock = asyncio.Lock()
+        self._last_fetch: datetime | None = None
+        self._last_result: dict[str, Any] | None = None
+        self.coalesced_refreshes = 0
+        self.metrics = RefreshMetrics()
+
+        # Last good data per component, served when only one half of a fetch fails
+        self._last_good: dict[str, Any] = {}
+        self.station_index = StationIndex()
+        self.opening_tables: dict[str, OpeningTable | None] = {}
+        self.price_snapshot = PriceSnapshot()
+        self.price_moves = PriceMoveTracker(
+            entry_data.get(CONF_PRICE_MOVE_THRESHOLD, DEFAULT_PRICE_MOVE_THRESHOLD),
+            timedelta(hours=entry_data.get(CONF_PRICE_MOVE_WINDOW, DEFAULT_PRICE_MOVE_WINDOW)),
+        )
+        self._unsub_opening_change: CALLBACK_TYPE | None = None
+        self._closed_stations: frozenset[str] = frozenset()
+        self.component_updated: dict[str, datetime] = {}
+        self.stale_components: dict[str, Exception] = {}
+        self.max_data_age = timedelta(
+            minutes=entry_data.get(CONF_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE)
+        )
+        max_price_age = entry_data.get(CONF_MAX_PRICE_AGE, DEFAULT_MAX_PRICE_AGE)
+        self.max_price_age = timedelta(days=max_price_age) if max_price_age else None
+
         from ukfuelfinder import FuelFinderClient
 
         self.client = FuelFinderClient(
@@ -34,21 +151,77 @@ class UKFuelFinderCoordinator(DataUpdateCoordinator):
             client_secret=entry_data[CONF_CLIENT_SECRET],
             environment=entry_data[CONF_ENVIRONMENT],
         )
+        # Price pages are read once per refresh, station search pages stay
+        # cached for the station store metadata sync
+        self.client.price_service.cache = _NoResponseCache()
+        self.executor = FuelFinderExecutor(hass)
+
+        # Bytes of API response bodies downloaded, for the payload size metrics
+        self.response_bytes = 0
+        self._response_bytes_lock = threading.Lock()
+        self.client.http_client.session.hooks["response"].append(self._count_response_bytes)
+
+        # Reuse a still valid OAuth token from a previous run or the config flow
+        self.token_store = token_store
+        self._token_restored = bool(token_store) and token_store.restore(
+            self.client, entry_data[CONF_CLIENT_ID], entry_data[CONF_ENVIRONMENT]
+        )
+
+        # National stations and prices seen while refreshing, for local queries
+        self.station_store = station_store
+        self.price_history = price_history
+        self.cheapest_filters = cheapest_filters(entry_data)
+        self.statistics_publisher = (
+            PriceStatisticsPublisher(hass) if entry_data.get(CONF_EXTERNAL_STATISTICS) else None
+        )
 
         update_interval = timedelta(minutes=entry_data[CONF_UPDATE_INTERVAL])
+        self.base_update_interval = update_interval
+        self.breaker = CircuitBreaker(update_interval)
+
+        # Random phase for the first scheduled poll so instances set up at the
+        # same time (e.g. after a release) do not poll the API in lockstep
+        self._phase_offset: timedelta | None = timedelta(
+            seconds=random.uniform(0, min(MAX_POLL_PHASE_OFFSET, update_interval.total_seconds()))
+        )
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=update_interval,
+            # Batch manual refresh requests (e.g. homeassistant.update_entity spam)
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=MIN_REFRESH_SPACING, immediate=True
+            ),
         )
 
-    def get_cheapest_fuel(self, fuel_type: str) -> dict[str, Any] | None:
+    async def async_shutdown(self) -> None:
+        """Cancel scheduled refreshes and stop the API worker pool."""
+        await super().async_shutdown()
+        self._cancel_opening_change()
+        await self.executor.async_shutdown()
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next refresh and the next opening hours change."""
+        super()._schedule_refresh()
+        self._schedule_opening_change(dt_util.utcnow())
+
+    @callback
+    def _unschedule_refresh(self) -> None:
+        """Stop refreshing and tracking opening hours once there are no listeners."""
+        super()._unschedule_refresh()
+        self._cancel_opening_change()
+
+    def get_cheapest_fuel(
+        self, fuel_type: str, filter_key: str | None = None
+    ) -> dict[str, Any] | None:
         """Find the cheapest price for a given fuel type.
 
         Args:
             fuel_type: Fuel type to search for (e.g., "e10", "b7")
+            filter_key: Key of a configured cheapest filter, to search only its stations
 
         Returns:
             Dictionary with station info and price, or None if no stations have this fuel type
@@ -56,139 +229,731 @@ class UKFuelFinderCoordinator(DataUpdateCoordinator):
         if not self.data or "stations" not in self.data:
             return None
 
-        cheapest = None
-        cheapest_price = float("inf")
-
-        for station_id, station_data in self.data["stations"].items():
-            price = station_data["prices"].get(fuel_type)
-            if price and price < cheapest_price:
-                cheapest_price = price
-                price_timestamp = station_data.get("price_timestamps", {}).get(fuel_type)
-                cheapest = {
-                    "station_id": station_id,
-                    "price": price,
-                    "price_last_updated": price_timestamp.isoformat() if price_timestamp else None,
-                    **station_data["info"],
-                    "distance": station_data["distance"],
+        if filter_key is not None:
+            return self.data.get("cheapest_filtered", {}).get(filter_key, {}).get(fuel_type)
+
+        # Precomputed once per refresh, fall back to a scan for data set elsewhere
+        cheapest = self.data.get("cheapest")
+        if cheapest is None:
+            cheapest = self._find_cheapest(self.data["stations"])
+
+        return cheapest.get(fuel_type)
+
+    @classmethod
+    def _find_cheapest(cls, stations: dict[str, Any]) -> dict[str, dict[str, Any]]:
+        """Find the cheapest station for every fuel type in one pass."""
+        return cls._find_cheapest_by_filter(stations, {})[0]
+
+    @staticmethod
+    def _find_cheapest_by_filter(
+        stations: dict[str, Any],
+        station_sets: dict[str, frozenset[str]],
+        stale: dict[str, frozenset[str]] | None = None,
+    ) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, dict[str, Any]]]]:
+        """Find the cheapest station for every fuel type, overall and per filter, in one pass.
+
+        Args:
+            stations: Coordinator station data
+            station_sets: IDs of the stations each filter picks from, by filter key
+            stale: Fuel types with stale prices by station ID, left out of the search
+
+        Returns:
+            The cheapest stations by fuel type, and the same by filter key
+        """
+        cheapest: dict[str, dict[str, Any]] = {}
+        filtered: dict[str, dict[str, dict[str, Any]]] = {key: {} for key in station_sets}
+        stale = stale or {}
+
+        for station_id, station_data in stations.items():
+            targets = [cheapest]
+            targets.extend(
+                filtered[key]
+                for key, station_ids in station_sets.items()
+                if station_id in station_ids
+            )
+            stale_fuels = stale.get(station_id, ())
+            for fuel_type, price in station_data["prices"].items():
+                if not price or fuel_type in stale_fuels:
+                    continue
+                entry = None
+                for target in targets:
+                    if fuel_type in target and price >= target[fuel_type]["price"]:
+                        continue
+                    if entry is None:
+                        price_timestamp = station_data.get("price_timestamps", {}).get(fuel_type)
+                        entry = {
+                            "station_id": station_id,
+                            "price": price,
+                            "price_last_updated": (
+                                price_timestamp.isoformat() if price_timestamp else None
+                            ),
+                            **station_data["info"],
+                            "distance": station_data["distance"],
+                        }
+                    target[fuel_type] = entry
+
+        return cheapest, filtered
+
+    @staticmethod
+    def _rank_prices(
+        stations: dict[str, Any], stale: dict[str, frozenset[str]] | None = None
+    ) -> dict[str, dict[str, dict[str, int]]]:
+        """Rank nearby stations by price with one sort per fuel type.
+
+        Stations with the same price share the best rank. The percentile runs
+        from 0 for the cheapest station to 100 for the most expensive one.
+        Stale prices are not ranked.
+
+        Returns:
+            Rank, station count and percentile by station ID and fuel type
+        """
+        stale = stale or {}
+        by_fuel: dict[str, list[tuple[float, str]]] = {}
+        for station_id, station_data in stations.items():
+            stale_fuels = stale.get(station_id, ())
+            for fuel_type, price in station_data["prices"].items():
+                if price and fuel_type not in stale_fuels:
+                    by_fuel.setdefault(fuel_type, []).append((price, station_id))
+
+        ranks: dict[str, dict[str, dict[str, int]]] = {}
+        for fuel_type, entries in by_fuel.items():
+            entries.sort()
+            count = len(entries)
+            rank = 0
+            previous_price = None
+            for position, (price, station_id) in enumerate(entries, 1):
+                if price != previous_price:
+                    rank, previous_price = position, price
+                ranks.setdefault(station_id, {})[fuel_type] = {
+                    "rank": rank,
+                    "rank_of": count,
+                    "percentile": round(100 * (rank - 1) / (count - 1)) if count > 1 else 0,
                 }
 
-        return cheapest
+        return ranks
+
+    @property
+    def last_fetch(self) -> datetime | None:
+        """Return when the API was last fetched from, not counting coalesced refreshes."""
+        return self._last_fetch
+
+    def fetch_state(self) -> dict[str, Any]:
+        """Return fetch times, data ages, API backoff and worker pool state.
+
+        Times are ISO formatted and ages in seconds, ready for diagnostics.
+        """
+        return {
+            "last_fetch": self._last_fetch.isoformat() if self._last_fetch else None,
+            "component_updated": {
+                component: updated.isoformat()
+                for component, updated in self.component_updated.items()
+            },
+            "data_age_seconds": {
+                component: age.total_seconds() if (age := self.component_age(component)) else None
+                for component in (COMPONENT_STATIONS, COMPONENT_PRICES)
+            },
+            "stale_components": {
+                component: str(err) for component, err in self.stale_components.items()
+            },
+            "coalesced_refreshes": self.coalesced_refreshes,
+            "circuit_breaker": self.breaker.as_dict(),
+            "executor": self.executor.stats,
+        }
+
+    def component_age(self, component: str) -> timedelta | None:
+        """Return the age of the last good data for a component."""
+        updated = self.component_updated.get(component)
+        return dt_util.utcnow() - updated if updated else None
 
     async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from API."""
+        """Fetch data from API, coalescing overlapping and rapid refreshes.
+
+        Concurrent refreshes wait for the fetch already in flight, and any
+        refresh within MIN_REFRESH_SPACING of the last API hit is served the
+        result of that hit instead of downloading the national data again.
+        """
+        async with self._fetch_lock:
+            if self._last_result is not None and self._last_fetch is not None:
+                since_fetch = dt_util.utcnow() - self._last_fetch
+                if since_fetch < timedelta(seconds=MIN_REFRESH_SPACING):
+                    self.coalesced_refreshes += 1
+                    _LOGGER.debug(
+                        "Last fetch was %.0fs ago, reusing its result",
+                        since_fetch.total_seconds(),
+                    )
+                    return self._last_result
+
+            if not self.breaker.allow_request():
+                # Keep the schedule pointed at the end of the backoff window
+                self.update_interval = max(
+                    self.breaker.open_until - dt_util.utcnow(), timedelta(seconds=1)
+                )
+                raise UpdateFailed(
+                    f"API unavailable after {self.breaker.failures} failures, "
+                    f"next attempt at {self.breaker.open_until.isoformat()}"
+                )
+
+            try:
+                result = await self._async_fetch_data_with_token_retry()
+            except ConfigEntryAuthFailed:
+                raise
+            except UpdateFailed as err:
+                self._backoff(err.__cause__)
+                raise
+            except Exception as err:
+                # A bug or unexpected API data in processing, back off like a failed fetch
+                self._backoff(err)
+                raise UpdateFailed(f"Error processing data: {err}") from err
+
+            if self.stale_components:
+                # Partly served from last good data, the API is still failing
+                self._backoff(next(iter(self.stale_components.values())))
+            else:
+                self.breaker.record_success()
+                self.update_interval = self.base_update_interval
+                if self._phase_offset is not None:
+                    self.update_interval += self._phase_offset
+                    self._phase_offset = None
+
+            self._last_fetch = dt_util.utcnow()
+            self._last_result = result
+            return result
+
+    async def _async_fetch_data_with_token_retry(self) -> dict[str, Any]:
+        """Fetch data, retrying once with a new token if a restored token is rejected.
+
+        A cached token that expired or was revoked while Home Assistant was
+        down is normal, so it only fails authentication once a fresh token
+        exchange with the configured credentials fails too.
+        """
         try:
-            # Fetch nearby stations
-            nearby_stations = await self.hass.async_add_executor_job(
-                self.client.search_by_location,
-                self.entry_data[CONF_LATITUDE],
-                self.entry_data[CONF_LONGITUDE],
-                self.entry_data[CONF_RADIUS],
+            result = await self._async_fetch_data()
+        except ConfigEntryAuthFailed:
+            if not self._token_restored:
+                raise
+            _LOGGER.debug("Restored API token was rejected, requesting a new one")
+        else:
+            self._token_restored = False
+            return result
+
+        self._token_restored = False
+        TokenStore.reset(self.client)
+        return await self._async_fetch_data()
+
+    def _count_response_bytes(self, response: Any, *args: Any, **kwargs: Any) -> None:
+        """Add the body size of an API response, called on a worker thread."""
+        with self._response_bytes_lock:
+            self.response_bytes += len(response.content)
+
+    def _backoff(self, err: BaseException | None) -> None:
+        """Record a failed fetch and push the next poll out."""
+        delay = self.breaker.record_failure(getattr(err, "retry_after", None))
+        self.update_interval = delay
+        _LOGGER.debug(
+            "Fetch failed %d time(s), retrying in %.0fs",
+            self.breaker.failures,
+            delay.total_seconds(),
+        )
+
+    def _resolve_component(self, component: str, result: Any) -> Any:
+        """Return fresh data for a component, or its last good data if the fetch failed.
+
+        Raises:
+            ConfigEntryAuthFailed: If the fetch failed on authentication
+            UpdateFailed: If there is no last good data younger than the max data age
+        """
+        if not isinstance(result, BaseException):
+            self._last_good[component] = result
+            self.component_updated[component] = dt_util.utcnow()
+            return result
+
+        if not isinstance(result, Exception):
+            raise result
+
+        if "authentication" in str(result).lower() or "unauthorized" in str(result).lower():
+            if self.token_store:
+                self.token_store.forget(self.entry_data[CONF_CLIENT_ID])
+            raise ConfigEntryAuthFailed(f"Authentication failed: {result}") from result
+
+        age = self.component_age(component)
+        if component not in self._last_good or age is None or age > self.max_data_age:
+            raise UpdateFailed(f"Error fetching data: {result}") from result
+
+        _LOGGER.warning(
+            "Fetching %s failed, keeping data from %.0f minutes ago: %s",
+            component,
+            age.total_seconds() / 60,
+            result,
+        )
+        self.stale_components[component] = result
+        return self._last_good[component]
+
+    @staticmethod
+    def _index_prices(
+        all_pfs: list[Any],
+        station_ids: set[str],
+        index: dict[str, tuple[dict[str, float], dict[str, Any]]] | None = None,
+    ) -> dict[str, tuple[dict[str, float], dict[str, Any]]]:
+        """Extract prices and timestamps for the given stations in one pass."""
+        if index is None:
+            index = {}
+        for pfs in all_pfs:
+            if pfs.node_id not in station_ids:
+                continue
+            station_prices, station_price_timestamps = index.setdefault(pfs.node_id, ({}, {}))
+            for fuel_price in pfs.fuel_prices:
+                if fuel_price.price is not None:
+                    fuel_type = fuel_price.fuel_type.lower().replace(" ", "_")
+                    station_prices[fuel_type] = fuel_price.price
+                    station_price_timestamps[fuel_type] = fuel_price.price_last_updated
+        return index
+
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Fetch data from API.
+
+        Station search and the national price download are independent, so
+        they run concurrently. If one of them fails, its last good data is
+        used as long as it is younger than the configured max data age.
+        Prices are downloaded page by page and only nearby stations are kept,
+        so the national price list is never held in memory at once.
+        """
+        self.stale_components = {}
+        timer = PhaseTimer()
+        calls_before = self.executor.calls
+        bytes_before = self.response_bytes
+
+        # Get the token up front so it is timed separately from the downloads
+        auth_error: Exception | None = None
+        with timer.phase(PHASE_AUTH):
+            try:
+                await self.executor.async_run(self.client.authenticator.get_token)
+            except Exception as err:
+                auth_error = err
+
+        if auth_error is not None:
+            from ukfuelfinder.exceptions import InvalidCredentialsError
+
+            if isinstance(auth_error, InvalidCredentialsError):
+                if self.token_store:
+                    self.token_store.forget(self.entry_data[CONF_CLIENT_ID])
+                raise ConfigEntryAuthFailed(f"Authentication failed: {auth_error}") from auth_error
+            # The token endpoint is down, both halves fall back to last good data
+            search_result: Any = auth_error
+            prices_result: Any = auth_error
+        else:
+            search_task = asyncio.ensure_future(
+                self._async_timed(
+                    timer,
+                    PHASE_SEARCH,
+                    self.client.search_by_location,
+                    self.entry_data[CONF_LATITUDE],
+                    self.entry_data[CONF_LONGITUDE],
+                    self.entry_data[CONF_RADIUS],
+                )
+            )
+            search_result, prices_result = await asyncio.gather(
+                search_task,
+                self._async_fetch_prices(timer, search_task),
+                return_exceptions=True,
             )
 
-            # Fetch all prices
-            all_pfs = await self.hass.async_add_executor_job(self.client.get_all_pfs_prices)
-
-            # Build station data
-            stations = {}
-
-            for distance, station_info in nearby_stations:
-                station_id = station_info.node_id
-
-                # Get prices for this station from PFS objects
-                station_prices = {}
-                station_price_timestamps = {}
-                for pfs in all_pfs:
-                    if pfs.node_id == station_id:
-                        for fuel_price in pfs.fuel_prices:
-                            if fuel_price.price is not None:
-                                fuel_type = fuel_price.fuel_type.lower().replace(" ", "_")
-                                station_prices[fuel_type] = fuel_price.price
-                                station_price_timestamps[fuel_type] = fuel_price.price_last_updated
-
-                # Build address string from location
-                address_parts = []
-                if station_info.location:
-                    if station_info.location.address_line_1:
-                        address_parts.append(station_info.location.address_line_1)
-                    if station_info.location.city:
-                        address_parts.append(station_info.location.city)
-                    if station_info.location.postcode:
-                        address_parts.append(station_info.location.postcode)
-                address = ", ".join(address_parts) if address_parts else None
-
-                stations[station_id] = {
-                    "info": {
-                        "id": station_id,
-                        "trading_name": station_info.trading_name,
-                        "address": address,
-                        "brand": station_info.brand_name,
-                        "latitude": (
-                            station_info.location.latitude if station_info.location else None
-                        ),
-                        "longitude": (
-                            station_info.location.longitude if station_info.location else None
-                        ),
-                        "phone": station_info.public_phone_number,
-                        # Metadata fields
-                        "is_supermarket": station_info.is_supermarket_service_station,
-                        "is_motorway": station_info.is_motorway_service_station,
-                        "amenities": station_info.amenities or [],
-                        "opening_times": station_info.opening_times or {},
-                        "fuel_types_available": station_info.fuel_types or [],
-                        "organization_name": station_info.mft_organisation_name,
-                        "temporary_closure": station_info.temporary_closure,
-                        "permanent_closure": station_info.permanent_closure,
-                    },
-                    "distance": distance,
-                    "prices": station_prices,
-                    "price_timestamps": station_price_timestamps,
+            if self.token_store:
+                self.token_store.capture(
+                    self.client,
+                    self.entry_data[CONF_CLIENT_ID],
+                    self.entry_data[CONF_ENVIRONMENT],
+                )
+
+            if (
+                self.station_store
+                and not isinstance(search_result, BaseException)
+                and self.station_store.metadata_due()
+            ):
+                with timer.phase(PHASE_STORE):
+                    await self._async_sync_store_metadata(self.station_store)
+
+        price_records = None
+        if not isinstance(prices_result, BaseException):
+            prices_result, price_records = prices_result
+
+        with timer.phase(PHASE_JOIN):
+            stations = self._join_stations(search_result, prices_result)
+            # Rebuilt when station metadata arrives, kept while the search is failing
+            if not isinstance(search_result, BaseException) or (
+                set(stations) != self.station_index.stations
+            ):
+                self.station_index = StationIndex.build(stations)
+                self.opening_tables = {
+                    station_id: OpeningTable.compile(station["info"]["opening_times"])
+                    for station_id, station in stations.items()
                 }
+            price_changes = self.price_snapshot.update(stations)
+
+        # Timed apart from the join, publishing queues a recorder job per series
+        with timer.phase(PHASE_HISTORY):
+            price_stats = self.price_history.record(stations) if self.price_history else {}
+            if self.statistics_publisher:
+                self.statistics_publisher.publish(stations)
+
+        with timer.phase(PHASE_CHEAPEST):
+            now = dt_util.utcnow()
+            closed_now = self._closed_stations = self._closed_now(now)
+            station_sets = {
+                cheapest_filter.key: cheapest_filter.select(self.station_index, closed_now)
+                for cheapest_filter in self.cheapest_filters
+            }
+            # Prices older than the max price age neither win nor rank
+            stale_prices, freshness = price_freshness(stations, now, self.max_price_age)
+            cheapest, cheapest_filtered = self._find_cheapest_by_filter(
+                stations, station_sets, stale_prices
+            )
+            price_ranks = self._rank_prices(stations, stale_prices)
+            price_moves = self.price_moves.update(now, cheapest, price_changes)
+
+        regional: dict[str, Any] = {}
+        if self.station_store:
+            with timer.phase(PHASE_REGIONAL):
+                regional = await self._async_regional_indexes(
+                    self.station_store, stations, cheapest
+                )
+
+        with timer.phase(PHASE_CLEANUP):
+            self._remove_stale_devices(set(stations))
+
+        self.metrics.record(
+            {
+                "finished": dt_util.utcnow().isoformat(),
+                "duration": timer.total,
+                "phases": timer.phases,
+                "stations": len(stations),
+                "prices": sum(len(station["prices"]) for station in stations.values()),
+                "price_records": price_records,
+                "response_bytes": self.response_bytes - bytes_before,
+                "api_calls": self.executor.calls - calls_before,
+                "queue_wait_max": self._recent_queue_wait(self.executor.calls - calls_before),
+            }
+        )
+
+        if price_changes:
+            # One event per refresh instead of a state change per sensor
+            self.hass.bus.async_fire(
+                EVENT_PRICES_CHANGED,
+                {
+                    "entry_id": self.config_entry.entry_id if self.config_entry else None,
+                    "changes": price_changes,
+                },
+            )
+
+        return {
+            "stations": stations,
+            "cheapest": cheapest,
+            "cheapest_filtered": cheapest_filtered,
+            "price_changes": price_changes,
+            "price_moves": price_moves,
+            "price_stats": price_stats,
+            "price_ranks": price_ranks,
+            "stale_prices": stale_prices,
+            "freshness": freshness,
+            "station_index": self.station_index,
+            "opening_tables": self.opening_tables,
+            "regional": regional,
+            "component_updated": dict(self.component_updated),
+            "metrics": self.metrics.snapshot(),
+        }
+
+    def _closed_now(self, now: datetime) -> frozenset[str]:
+        """Return the IDs of stations outside their opening hours."""
+        return frozenset(
+            station_id
+            for station_id, table in self.opening_tables.items()
+            if table is not None and not table.is_open(now)
+        )
 
-            # Handle stale station removal with grace period
-            current_stations = set(stations.keys())
+    def _cancel_opening_change(self) -> None:
+        """Cancel the scheduled opening hours re-evaluation."""
+        if self._unsub_opening_change:
+            self._unsub_opening_change()
+            self._unsub_opening_change = None
 
-            # Increment counter for stations still missing
-            for station_id in list(self.missing_stations.keys()):
-                if station_id not in current_stations:
-                    self.missing_stations[station_id] += 1
+    def _schedule_opening_change(self, now: datetime) -> None:
+        """Schedule a re-evaluation at the next time any station opens or closes.
 
-            # Track newly disappeared stations
-            newly_disappeared = (
-                self.previous_stations - current_stations - set(self.missing_stations.keys())
+        Only the next boundary is tracked, there is no polling timer.
+        """
+        self._cancel_opening_change()
+        changes = [
+            change
+            for table in self.opening_tables.values()
+            if table is not None and (change := table.next_change(now)) is not None
+        ]
+        if changes:
+            self._unsub_opening_change = async_track_point_in_utc_time(
+                self.hass, self._async_opening_changed, min(changes)
             )
-            for station_id in newly_disappeared:
-                self.missing_stations[station_id] = 1
-
-            # Reset count for stations that reappeared
-            reappeared = current_stations & set(self.missing_stations.keys())
-            for station_id in reappeared:
-                del self.missing_stations[station_id]
-
-            # Remove devices after 2 update cycles (grace period)
-            if self.config_entry:
-                device_registry = dr.async_get(self.hass)
-                for station_id, missing_count in list(self.missing_stations.items()):
-                    if missing_count >= 2:
-                        device = device_registry.async_get_device(
-                            identifiers={(DOMAIN, station_id)}
+
+    @callback
+    def _async_opening_changed(self, now: datetime) -> None:
+        """Update open-now cheapest stations and entities when a station opens or closes.
+
+        Only listeners with the context of a station that opened or closed,
+        or of an open now cheapest filter, are called. Everything else only
+        changes on a refresh.
+        """
+        self._unsub_opening_change = None
+        if self.data and "stations" in self.data:
+            closed_now = self._closed_now(now)
+            contexts: set[Any] = set(closed_now ^ self._closed_stations)
+            self._closed_stations = closed_now
+            open_now_filters = [
+                cheapest_filter
+                for cheapest_filter in self.cheapest_filters
+                if cheapest_filter.open_now
+            ]
+            if open_now_filters and contexts:
+                station_sets = {
+                    cheapest_filter.key: cheapest_filter.select(self.station_index, closed_now)
+                    for cheapest_filter in open_now_filters
+                }
+                _, filtered = self._find_cheapest_by_filter(
+                    self.data["stations"], station_sets, self.data.get("stale_prices")
+                )
+                self.data = {
+                    **self.data,
+                    "cheapest_filtered": {**self.data["cheapest_filtered"], **filtered},
+                }
+                contexts.update(cheapest_filter.key for cheapest_filter in open_now_filters)
+            for update_callback, context in list(self._listeners.values()):
+                if context in contexts:
+                    update_callback()
+        if self._listeners:
+            self._schedule_opening_change(now)
+
+    async def _async_fetch_prices(
+        self, timer: PhaseTimer, search_task: asyncio.Future[Any]
+    ) -> tuple[dict[str, tuple[dict[str, float], dict[str, Any]]], int]:
+        """Download national prices page by page, keeping only nearby stations.
+
+        The first page downloads while the station search is still running,
+        after that each page is indexed and dropped before the next one is
+        requested. Returns the price index and the number of records read.
+        """
+        index: dict[str, tuple[dict[str, float], dict[str, Any]]] = {}
+        station_ids: set[str] | None = None
+        records = 0
+        page = 1
+        refreshed = time.time()
+        # Another entry of the same API environment may be filling the store already
+        claimed = self.station_store
+        if claimed and not claimed.claim_sync(SYNC_PRICES):
+            claimed = None
+        store = claimed
+
+        try:
+            with timer.phase(PHASE_PRICES):
+                while True:
+                    batch = await self.executor.async_run(
+                        partial(self.client.get_all_pfs_prices, page, use_cache=False)
+                    )
+                    if station_ids is None:
+                        station_ids = await self._async_nearby_ids(search_task)
+                    records += len(batch)
+                    self._index_prices(batch, station_ids, index)
+                    if store and not await self._async_write_store(
+                        store.upsert_prices, batch, refreshed
+                    ):
+                        store = None  # Keep the refresh going without the store
+                    if len(batch) < PRICE_PAGE_SIZE:
+                        break
+                    del batch  # Release the page before the next one downloads
+                    page += 1
+
+            if store:
+                await self._async_write_store(store.finish_price_sync, refreshed)
+        finally:
+            if claimed:
+                claimed.release_sync(SYNC_PRICES)
+        return index, records
+
+    async def _async_sync_store_metadata(self, store: StationStore) -> None:
+        """Copy national station metadata into the station store page by page.
+
+        Runs right after the station search, whose pages are still in the
+        client's response cache, so this normally makes no API requests.
+        """
+        if not store.claim_sync(SYNC_STATIONS):
+            _LOGGER.debug("Another entry is syncing station store metadata")
+            return
+        synced = time.time()
+        page = 1
+
+        try:
+            while True:
+                try:
+                    infos = await self.executor.async_run(self.client.get_all_pfs_info, page)
+                except Exception as err:
+                    _LOGGER.debug("Skipping station store metadata sync: %s", err)
+                    return
+                if not await self._async_write_store(store.upsert_stations, infos, synced):
+                    return
+                if len(infos) < PRICE_PAGE_SIZE:
+                    break
+                del infos
+                page += 1
+
+            await self._async_write_store(store.finish_metadata_sync, synced)
+        finally:
+            store.release_sync(SYNC_STATIONS)
+
+    async def _async_write_store(self, func: Any, *args: Any) -> bool:
+        """Run a station store write in the executor without failing the refresh."""
+        try:
+            await self.hass.async_add_executor_job(func, *args)
+        except sqlite3.Error as err:
+            _LOGGER.warning("Updating the local station store failed: %s", err)
+            return False
+        return True
+
+    async def _async_regional_indexes(
+        self, store: StationStore, stations: dict[str, Any], cheapest: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Index national prices for the postcode area, county and UK.
+
+        Uses the national prices the station store was just filled with, so
+        this makes no API requests. The region is that of the nearest station.
+        """
+        area, county = home_region(stations)
+        try:
+            distribution = await self.hass.async_add_executor_job(
+                store.price_distribution, area, county
+            )
+        except sqlite3.Error as err:
+            _LOGGER.warning("Reading regional prices from the local station store failed: %s", err)
+            return {}
+        names = {
+            REGION_AREA: area,
+            REGION_COUNTY: county,
+            REGION_NATIONAL: REGION_NAMES[REGION_NATIONAL],
+        }
+        return build_price_indexes(distribution, names, cheapest)
+
+    async def _async_nearby_ids(self, search_task: asyncio.Future[Any]) -> set[str]:
+        """Wait for the station search and return the IDs to keep prices for.
+
+        If the search failed, the last good station list is used. Whether
+        that list is recent enough is decided when the results are joined.
+        """
+        await asyncio.wait([search_task])
+        if search_task.exception() is None:
+            nearby_stations = search_task.result()
+        else:
+            nearby_stations = self._last_good.get(COMPONENT_STATIONS, [])
+        return {station_info.node_id for _, station_info in nearby_stations}
+
+    async def _async_timed(self, timer: PhaseTimer, phase: str, func: Any, *args: Any) -> Any:
+        """Run an API call on the worker pool, timed as the given phase."""
+        with timer.phase(phase):
+            return await self.executor.async_run(func, *args)
+
+    def _recent_queue_wait(self, calls: int) -> float | None:
+        """Return the longest worker pool queue wait of the last ``calls`` calls."""
+        waits = list(self.executor.queue_waits)[-calls:] if calls else []
+        return round(max(waits), 4) if waits else None
+
+    def _join_stations(self, search_result: Any, prices_result: Any) -> dict[str, Any]:
+        """Join nearby stations with their prices.
+
+        Raises:
+            ConfigEntryAuthFailed: If a fetch failed on authentication
+            UpdateFailed: If a fetch failed and there is no recent last good data
+        """
+        nearby_stations = self._resolve_component(COMPONENT_STATIONS, search_result)
+        price_index = self._resolve_component(COMPONENT_PRICES, prices_result)
+
+        # Build station data
+        stations = {}
+
+        for distance, station_info in nearby_stations:
+            station_id = station_info.node_id
+            station_prices, station_price_timestamps = price_index.get(station_id, ({}, {}))
+
+            # Build address string from location
+            address_parts = []
+            if station_info.location:
+                if station_info.location.address_line_1:
+                    address_parts.append(station_info.location.address_line_1)
+                if station_info.location.city:
+                    address_parts.append(station_info.location.city)
+                if station_info.location.postcode:
+                    address_parts.append(station_info.location.postcode)
+            address = ", ".join(address_parts) if address_parts else None
+
+            stations[station_id] = {
+                "info": {
+                    "id": station_id,
+                    "trading_name": station_info.trading_name,
+                    "address": address,
+                    "brand": station_info.brand_name,
+                    "latitude": (station_info.location.latitude if station_info.location else None),
+                    "longitude": (
+                        station_info.location.longitude if station_info.location else None
+                    ),
+                    "phone": station_info.public_phone_number,
+                    "postcode": (station_info.location.postcode if station_info.location else None),
+                    "county": station_info.location.county if station_info.location else None,
+                    # Metadata fields
+                    "is_supermarket": station_info.is_supermarket_service_station,
+                    "is_motorway": station_info.is_motorway_service_station,
+                    "amenities": station_info.amenities or [],
+                    "opening_times": station_info.opening_times or {},
+                    "fuel_types_available": station_info.fuel_types or [],
+                    "organization_name": station_info.mft_organisation_name,
+                    "temporary_closure": station_info.temporary_closure,
+                    "permanent_closure": station_info.permanent_closure,
+                },
+                "distance": distance,
+                "prices": station_prices,
+                "price_timestamps": station_price_timestamps,
+            }
+
+        return stations
+
+    def _remove_stale_devices(self, current_stations: set[str]) -> None:
+        """Remove devices of stations missing for 2 update cycles."""
+        # Handle stale station removal with grace period
+
+        # Increment counter for stations still missing
+        for station_id in list(self.missing_stations.keys()):
+            if station_id not in current_stations:
+                self.missing_stations[station_id] += 1
+
+        # Track newly disappeared stations
+        newly_disappeared = (
+            self.previous_stations - current_stations - set(self.missing_stations.keys())
+        )
+        for station_id in newly_disappeared:
+            self.missing_stations[station_id] = 1
+
+        # Reset count for stations that reappeared
+        reappeared = current_stations & set(self.missing_stations.keys())
+        for station_id in reappeared:
+            del self.missing_stations[station_id]
+
+        # Remove devices after 2 update cycles (grace period)
+        if self.config_entry:
+            device_registry = dr.async_get(self.hass)
+            for station_id, missing_count in list(self.missing_stations.items()):
+                if missing_count >= 2:
+                    device = device_registry.async_get_device(identifiers={(DOMAIN, station_id)})
+                    if device:
+                        device_registry.async_update_device(
+                            device_id=device.id,
+                            remove_config_entry_id=self.config_entry.entry_id,
                         )
-                        if device:
-                            device_registry.async_update_device(
-                                device_id=device.id,
-                                remove_config_entry_id=self.config_entry.entry_id,
-                            )
-                            _LOGGER.info(
-                                "Removed stale station %s after %d update cycles",
-                                station_id,
-                                missing_count,
-                            )
-                        del self.missing_stations[station_id]
-
-            self.previous_stations = current_stations
-
-            return {"stations": stations}
-
-        except Exception as err:
-            if "authentication" in str(err).lower() or "unauthorized" in str(err).lower():
-                raise ConfigEntryAuthFailed(f"Authentication failed: {err}") from err
-            raise UpdateFailed(f"Error fetching data: {err}") from err
+                        _LOGGER.info(
+                            "Removed stale station %s after %d update cycles",
+                            station_id,
+                            missing_count,
+                        )
+                    del self.missing_stations[station_id]
+
+        self.previous_stations = current_stations
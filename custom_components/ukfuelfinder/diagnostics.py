@@ -0,0 +1,129 @@
+"""Diagnostics support for UK Fuel Finder."""
+
+from __future__ import annotations
+
+import sys
+from collections import Counter
+from itertools import islice
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET, CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+
+from .const import DOMAIN
+from .coordinator import UKFuelFinderCoordinator
+
+TO_REDACT = {CONF_CLIENT_ID, CONF_CLIENT_SECRET, CONF_LATITUDE, CONF_LONGITUDE}
+
+# Keep the dump small however many stations and refreshes there are
+REFRESH_SAMPLES = 10
+MISSING_STATIONS_LIMIT = 50
+SIZE_SAMPLE_STATIONS = 20
+
+
+def _deep_size(obj: Any) -> int:
+    """Return the approximate memory footprint of an object and its contents."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(key) + _deep_size(value) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(item) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        # Slotted objects (station index, opening tables) report only their own size
+        size += sum(_deep_size(getattr(obj, slot, None)) for slot in obj.__slots__)
+    return size
+
+
+def _sampled_size(table: dict[str, Any]) -> tuple[int, int]:
+    """Measure a sample of a table's entries and scale it up.
+
+    Returns:
+        The estimated size of the table and of one entry
+    """
+    sample = dict(islice(table.items(), SIZE_SAMPLE_STATIONS))
+    if not sample:
+        return sys.getsizeof(table), 0
+    per_entry = (_deep_size(sample) - sys.getsizeof(sample)) // len(sample)
+    return sys.getsizeof(table) + per_entry * len(table), per_entry
+
+
+def _estimate_data_size(data: dict[str, Any] | None) -> dict[str, Any]:
+    """Estimate the memory footprint of the coordinator data.
+
+    Tables with more entries than the sample size, like the stations and
+    their ranks and statistics, are measured on a sample of entries and
+    scaled up, so the estimate stays cheap however many stations there are.
+    Everything else is measured whole.
+    """
+    if not data:
+        return {"stations": 0, "estimated_bytes": 0}
+
+    stations = data.get("stations", {})
+    total, per_station = _sampled_size(stations)
+    for key, value in data.items():
+        if key == "stations":
+            continue
+        if isinstance(value, dict) and len(value) > SIZE_SAMPLE_STATIONS:
+            total += _sampled_size(value)[0]
+        else:
+            total += _deep_size(value)
+
+    return {
+        "stations": len(stations),
+        "bytes_per_station": per_station,
+        "estimated_bytes": total,
+    }
+
+
+def _entity_counts(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Count the entry's entities and devices."""
+    entities = er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    devices = dr.async_entries_for_config_entry(dr.async_get(hass), entry.entry_id)
+    return {
+        "entities": len(entities),
+        "disabled_entities": sum(1 for entity in entities if entity.disabled),
+        "entities_by_domain": dict(Counter(entity.domain for entity in entities)),
+        "devices": len(devices),
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: UKFuelFinderCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    refreshes = list(coordinator.metrics.history)[-REFRESH_SAMPLES:]
+    fetch_state = coordinator.fetch_state()
+    executor = fetch_state.pop("executor")
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds(),
+            **fetch_state,
+            "missing_stations": dict(
+                islice(coordinator.missing_stations.items(), MISSING_STATIONS_LIMIT)
+            ),
+            "missing_stations_total": len(coordinator.missing_stations),
+        },
+        "refreshes": {
+            "recent": refreshes,
+            "summary": coordinator.metrics.summary(),
+            "histogram": coordinator.metrics.histogram(),
+        },
+        "api_cache": coordinator.client.get_cache_stats(),
+        "executor": executor,
+        "data_size": _estimate_data_size(coordinator.data),
+        "station_store": (
+            await hass.async_add_executor_job(coordinator.station_store.stats)
+            if coordinator.station_store
+            else None
+        ),
+        "registry": _entity_counts(hass, entry),
+    }
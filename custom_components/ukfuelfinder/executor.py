@@ -0,0 +1,117 @@
+"""Dedicated worker pool for blocking UK Fuel Finder API calls."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant
+
+from .const import API_CALL_TIMEOUT, API_MAX_WORKERS, DOMAIN
+
+_T = TypeVar("_T")
+
+# Number of queue wait samples kept for metrics
+QUEUE_WAIT_SAMPLES = 50
+
+
+class FuelFinderExecutor:
+    """Run blocking API client calls on a small bounded thread pool.
+
+    The ``ukfuelfinder`` client is synchronous. Running it on Home Assistant's
+    shared executor lets a slow national download starve other integrations,
+    so each config entry owns its own pool instead.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_workers: int = API_MAX_WORKERS,
+        timeout: float = API_CALL_TIMEOUT,
+    ) -> None:
+        """Initialize the worker pool."""
+        self.hass = hass
+        self.timeout = timeout
+        self.calls = 0
+        self.timeouts = 0
+        self.queue_waits: deque[float] = deque(maxlen=QUEUE_WAIT_SAMPLES)
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=DOMAIN)
+        self._pending: set[asyncio.Future[Any]] = set()
+        self._shutdown = False
+        self._unsub_stop: CALLBACK_TYPE | None = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_handle_stop
+        )
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return call counters and queue wait metrics in seconds."""
+        waits = list(self.queue_waits)
+        return {
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "pending": len(self._pending),
+            "queue_wait_last": waits[-1] if waits else None,
+            "queue_wait_max": max(waits) if waits else None,
+            "queue_wait_avg": sum(waits) / len(waits) if waits else None,
+        }
+
+    async def async_run(
+        self, func: Callable[..., _T], *args: Any, timeout: float | None = None
+    ) -> _T:
+        """Run a blocking function on the pool and wait for its result.
+
+        Raises:
+            RuntimeError: If the pool has been shut down
+            TimeoutError: If the call does not finish within the timeout
+        """
+        if self._shutdown:
+            raise RuntimeError("API worker pool is shut down")
+
+        timeout = self.timeout if timeout is None else timeout
+        self.calls += 1
+
+        future = asyncio.wrap_future(self._pool.submit(self._timed, time.monotonic(), func, *args))
+        self._pending.add(future)
+        try:
+            async with asyncio.timeout(timeout):
+                return await future
+        except TimeoutError as err:
+            # The worker thread cannot be interrupted, it finishes in the background
+            self.timeouts += 1
+            name = getattr(func, "__name__", repr(func))
+            raise TimeoutError(f"{name} timed out after {timeout}s") from err
+        finally:
+            self._pending.discard(future)
+
+    def _timed(self, submitted: float, func: Callable[..., _T], *args: Any) -> _T:
+        """Record how long the call queued before a worker picked it up."""
+        self.queue_waits.append(time.monotonic() - submitted)
+        return func(*args)
+
+    async def async_shutdown(self) -> None:
+        """Cancel queued calls and stop the workers without waiting for running calls."""
+        if self._shutdown:
+            return
+        self._shutdown = True
+
+        if self._unsub_stop:
+            self._unsub_stop()
+            self._unsub_stop = None
+
+        for future in list(self._pending):
+            future.cancel()
+        # The workers are not joined: a call stuck in I/O would hold the joining
+        # thread until it times out. Idle workers exit now, a running call
+        # finishes in the background and its result is dropped.
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _async_handle_stop(self, _event: Event) -> None:
+        """Shut down the pool when Home Assistant stops."""
+        self._unsub_stop = None
+        await self.async_shutdown()
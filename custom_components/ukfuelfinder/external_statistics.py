@@ -0,0 +1,109 @@
+"""Publish station prices as external long-term statistics."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+RECORDER_DOMAIN = "recorder"
+
+
+def statistic_id(station_id: str, fuel_type: str) -> str:
+    """Return the external statistic ID of a station's fuel price."""
+    return f"{DOMAIN}:{slugify(f'{station_id}_{fuel_type}')}"
+
+
+class _HourAccumulator:
+    """Min, max and mean of the prices seen in one hour."""
+
+    __slots__ = ("start", "low", "high", "total", "count")
+
+    def __init__(self, start: datetime, price: float) -> None:
+        """Start a new hour."""
+        self.start = start
+        self.low = self.high = price
+        self.total = 0.0
+        self.count = 0
+
+    def add(self, price: float) -> None:
+        """Add a price seen during the hour."""
+        self.low = min(self.low, price)
+        self.high = max(self.high, price)
+        self.total += price
+        self.count += 1
+
+
+class PriceStatisticsPublisher:
+    """Write hourly price statistics per station and fuel type to the recorder.
+
+    Each refresh updates the current hour of every series, all in one pass,
+    instead of the recorder compiling statistics from hundreds of sensor
+    states. Users can then disable most station sensors and still graph
+    prices with the statistics card. Prices are in GBP like the sensors.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the publisher."""
+        self.hass = hass
+        self._hours: dict[str, _HourAccumulator] = {}
+
+    def publish(self, stations: dict[str, Any]) -> int:
+        """Update the current hour's statistics for every station price.
+
+        Returns:
+            Number of series written
+        """
+        if RECORDER_DOMAIN not in self.hass.config.components:
+            return 0
+
+        from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+        from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+        hour = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        hours: dict[str, _HourAccumulator] = {}
+
+        for station_id, station in stations.items():
+            name = station["info"]["trading_name"]
+            for fuel_type, price_pence in station["prices"].items():
+                series_id = statistic_id(station_id, fuel_type)
+                price = round(price_pence / 100, 3)
+
+                accumulator = self._hours.get(series_id)
+                if accumulator is None or accumulator.start != hour:
+                    accumulator = _HourAccumulator(hour, price)
+                accumulator.add(price)
+                hours[series_id] = accumulator
+
+                async_add_external_statistics(
+                    self.hass,
+                    StatisticMetaData(
+                        has_mean=True,
+                        has_sum=False,
+                        name=f"{name} {fuel_type.replace('_', ' ').title()}",
+                        source=DOMAIN,
+                        statistic_id=series_id,
+                        unit_of_measurement="GBP",
+                    ),
+                    [
+                        StatisticData(
+                            start=hour,
+                            mean=round(accumulator.total / accumulator.count, 4),
+                            min=accumulator.low,
+                            max=accumulator.high,
+                        )
+                    ],
+                )
+
+        # Stations that left the search radius stop being tracked
+        self._hours = hours
+        _LOGGER.debug("Published price statistics for %d series", len(hours))
+        return len(hours)
@@ -0,0 +1,57 @@
+"""Price freshness for UK Fuel Finder."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from statistics import median
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+
+def price_freshness(
+    stations: dict[str, Any], now: datetime, max_age: timedelta | None
+) -> tuple[dict[str, frozenset[str]], dict[str, dict[str, Any]]]:
+    """Find stale prices and summarize price ages by fuel type in one pass.
+
+    A price is stale when it was last updated longer than the max age ago.
+    Prices without an update time are never stale and are not counted in
+    the age statistics. Update times without a timezone are taken as UTC.
+
+    Args:
+        stations: Coordinator station data
+        now: Time the ages are measured at
+        max_age: Age after which a price is stale, None to never mark prices stale
+
+    Returns:
+        The stale fuel types of each station with any, and the median, oldest
+        age in hours and stale count by fuel type
+    """
+    stale: dict[str, set[str]] = {}
+    ages: dict[str, list[float]] = {}
+    stale_counts: dict[str, int] = {}
+
+    for station_id, station in stations.items():
+        timestamps = station.get("price_timestamps", {})
+        for fuel_type, price in station["prices"].items():
+            updated = timestamps.get(fuel_type)
+            if not price or not isinstance(updated, datetime):
+                continue
+            if updated.tzinfo is None:
+                updated = updated.replace(tzinfo=dt_util.UTC)
+            age = now - updated
+            ages.setdefault(fuel_type, []).append(age.total_seconds() / 3600)
+            if max_age is not None and age > max_age:
+                stale.setdefault(station_id, set()).add(fuel_type)
+                stale_counts[fuel_type] = stale_counts.get(fuel_type, 0) + 1
+
+    freshness = {
+        fuel_type: {
+            "median_age_hours": round(median(fuel_ages), 1),
+            "oldest_age_hours": round(max(fuel_ages), 1),
+            "prices": len(fuel_ages),
+            "stale": stale_counts.get(fuel_type, 0),
+        }
+        for fuel_type, fuel_ages in ages.items()
+    }
+    return {station_id: frozenset(fuels) for station_id, fuels in stale.items()}, freshness
@@ -0,0 +1,246 @@
+"""Compact price history with incremental window statistics for UK Fuel Finder."""
+
+from __future__ import annotations
+
+import time
+from array import array
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.singleton import singleton
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+DATA_PRICE_HISTORY = f"{DOMAIN}_price_history"
+STORAGE_KEY = f"{DOMAIN}.price_history"
+STORAGE_VERSION = 1
+SAVE_DELAY = 60  # seconds
+
+# Statistics windows by attribute suffix, in seconds
+WINDOWS = {"24h": 24 * 3600, "7d": 7 * 24 * 3600, "30d": 30 * 24 * 3600}
+
+# Price changes kept per station and fuel type, far more than a month's worth
+HISTORY_CAPACITY = 128
+
+
+class _Window:
+    """Running statistics over the samples of a series inside a time window.
+
+    Samples enter in time order and leave oldest first, so the sum and count
+    are updated incrementally and min/max come from monotonic deques. The
+    last sample to leave is kept as ``carry``: it is the price that was in
+    effect when the window started.
+    """
+
+    __slots__ = ("span", "first", "total", "count", "mins", "maxes", "carry")
+
+    def __init__(self, span: float) -> None:
+        """Initialize an empty window."""
+        self.span = span
+        self.first = 0  # sequence number of the oldest sample in the window
+        self.total = 0.0
+        self.count = 0
+        self.mins: deque[tuple[int, float]] = deque()
+        self.maxes: deque[tuple[int, float]] = deque()
+        self.carry: tuple[float, float] | None = None
+
+    def push(self, seq: int, price: float) -> None:
+        """Add the newest sample."""
+        self.total += price
+        self.count += 1
+        while self.mins and self.mins[-1][1] >= price:
+            self.mins.pop()
+        self.mins.append((seq, price))
+        while self.maxes and self.maxes[-1][1] <= price:
+            self.maxes.pop()
+        self.maxes.append((seq, price))
+
+    def evict(self, timestamp: float, price: float) -> None:
+        """Remove the oldest sample, which becomes the carried-in price."""
+        self.total -= price
+        self.count -= 1
+        if self.mins[0][0] == self.first:
+            self.mins.popleft()
+        if self.maxes[0][0] == self.first:
+            self.maxes.popleft()
+        self.carry = (timestamp, price)
+        self.first += 1
+
+
+class PriceSeries:
+    """Ring buffer of (timestamp, price) samples for one station and fuel type."""
+
+    __slots__ = ("times", "prices", "next_seq", "size", "windows")
+
+    def __init__(self) -> None:
+        """Initialize an empty series."""
+        self.times = array("d", bytes(8 * HISTORY_CAPACITY))
+        self.prices = array("d", bytes(8 * HISTORY_CAPACITY))
+        self.next_seq = 0
+        self.size = 0
+        self.windows = {name: _Window(span) for name, span in WINDOWS.items()}
+
+    @property
+    def last_time(self) -> float | None:
+        """Return the timestamp of the newest sample."""
+        return self.times[(self.next_seq - 1) % HISTORY_CAPACITY] if self.size else None
+
+    def add(self, timestamp: float, price: float) -> bool:
+        """Append a sample newer than the last one.
+
+        Returns:
+            True if the sample was added
+        """
+        if self.size and timestamp <= self.times[(self.next_seq - 1) % HISTORY_CAPACITY]:
+            return False
+
+        if self.size == HISTORY_CAPACITY:
+            # The oldest sample is about to be overwritten, take it out of every window
+            oldest = self.next_seq - self.size
+            for window in self.windows.values():
+                if window.first == oldest:
+                    index = oldest % HISTORY_CAPACITY
+                    window.evict(self.times[index], self.prices[index])
+            self.size -= 1
+
+        index = self.next_seq % HISTORY_CAPACITY
+        self.times[index] = timestamp
+        self.prices[index] = price
+        for window in self.windows.values():
+            window.push(self.next_seq, price)
+        self.next_seq += 1
+        self.size += 1
+        return True
+
+    def expire(self, now: float) -> None:
+        """Move samples that have aged out of each window into its carry."""
+        for window in self.windows.values():
+            cutoff = now - window.span
+            while window.first < self.next_seq:
+                index = window.first % HISTORY_CAPACITY
+                if self.times[index] >= cutoff:
+                    break
+                window.evict(self.times[index], self.prices[index])
+
+    def stats(self, now: float) -> dict[str, float | None]:
+        """Return min, max, mean and trend (change in pence) per window."""
+        self.expire(now)
+        latest = self.prices[(self.next_seq - 1) % HISTORY_CAPACITY]
+        stats: dict[str, float | None] = {}
+
+        for name, window in self.windows.items():
+            values = [window.carry[1]] if window.carry else []
+            if window.count:
+                values += [window.mins[0][1], window.maxes[0][1]]
+            if not values:
+                stats.update(dict.fromkeys(_keys(name)))
+                continue
+
+            start = values[0] if window.carry else self.prices[window.first % HISTORY_CAPACITY]
+            total = window.total + (window.carry[1] if window.carry else 0.0)
+            stats[f"price_min_{name}"] = min(values)
+            stats[f"price_max_{name}"] = max(values)
+            stats[f"price_mean_{name}"] = round(total / (window.count + bool(window.carry)), 2)
+            stats[f"price_trend_{name}"] = round(latest - start, 2)
+
+        return stats
+
+    def samples(self) -> list[float]:
+        """Return the samples still in use as a flat [timestamp, price, ...] list.
+
+        The price carried into the longest window comes first so the window
+        statistics are the same after a reload.
+        """
+        longest = self.windows[next(reversed(WINDOWS))]
+        flat: list[float] = list(longest.carry or ())
+        for seq in range(longest.first, self.next_seq):
+            index = seq % HISTORY_CAPACITY
+            flat += [self.times[index], self.prices[index]]
+        return flat
+
+
+def _keys(name: str) -> list[str]:
+    """Return the attribute names of a statistics window."""
+    return [f"price_{stat}_{name}" for stat in ("min", "max", "mean", "trend")]
+
+
+class PriceHistory:
+    """Price series per station and fuel type, persisted in Home Assistant storage.
+
+    Fed from the price timestamps of each refresh: a sample is added only
+    when a station reports a newer price, so overlapping config entries
+    share series without duplicates. Statistics are read from the running
+    window aggregates and never scan the stored samples.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the price history."""
+        self._store: Store[dict[str, dict[str, list[float]]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self.series: dict[str, dict[str, PriceSeries]] = {}
+
+    async def async_load(self) -> None:
+        """Load persisted samples and rebuild the window statistics."""
+        data = await self._store.async_load() or {}
+        for station_id, fuels in data.items():
+            for fuel_type, flat in fuels.items():
+                series = self.series.setdefault(station_id, {}).setdefault(fuel_type, PriceSeries())
+                for index in range(0, len(flat), 2):
+                    series.add(flat[index], flat[index + 1])
+
+    def record(self, stations: dict[str, Any], now: float | None = None) -> dict[str, Any]:
+        """Add new prices from coordinator station data and return their statistics.
+
+        Returns:
+            Statistics attributes by station ID and fuel type
+        """
+        now = time.time() if now is None else now
+        changed = False
+        stats: dict[str, dict[str, dict[str, float | None]]] = {}
+
+        for station_id, station in stations.items():
+            station_series = self.series.setdefault(station_id, {})
+            station_stats = stats[station_id] = {}
+            for fuel_type, price in station["prices"].items():
+                series = station_series.get(fuel_type)
+                if series is None:
+                    series = station_series[fuel_type] = PriceSeries()
+                updated = station.get("price_timestamps", {}).get(fuel_type)
+                if isinstance(updated, datetime):
+                    if updated.tzinfo is None:
+                        # Naive update times are UTC, not local time
+                        updated = updated.replace(tzinfo=dt_util.UTC)
+                    changed |= series.add(updated.timestamp(), price)
+                if series.size:
+                    station_stats[fuel_type] = series.stats(now)
+
+        if changed:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return stats
+
+    def _data_to_save(self) -> dict[str, dict[str, list[float]]]:
+        """Return samples to persist, dropping series that have aged out entirely."""
+        cutoff = time.time() - max(WINDOWS.values())
+        data: dict[str, dict[str, list[float]]] = {}
+        for station_id, fuels in list(self.series.items()):
+            for fuel_type, series in list(fuels.items()):
+                if series.last_time is None or series.last_time < cutoff:
+                    del fuels[fuel_type]
+                    continue
+                data.setdefault(station_id, {})[fuel_type] = series.samples()
+            if not fuels:
+                del self.series[station_id]
+        return data
+
+
+@singleton(DATA_PRICE_HISTORY)
+async def async_get_price_history(hass: HomeAssistant) -> PriceHistory:
+    """Return the price history shared by all config entries."""
+    history = PriceHistory(hass)
+    await history.async_load()
+    return history
@@ -0,0 +1,128 @@
+"""Refresh timing, record count and payload size metrics for UK Fuel Finder."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+# Phases of a refresh, in the order they run
+PHASE_AUTH = "auth"
+PHASE_SEARCH = "search"
+PHASE_PRICES = "prices"
+PHASE_STORE = "store"
+PHASE_JOIN = "join"
+PHASE_HISTORY = "history"
+PHASE_CHEAPEST = "cheapest"
+PHASE_REGIONAL = "regional"
+PHASE_CLEANUP = "cleanup"
+PHASES = (
+    PHASE_AUTH,
+    PHASE_SEARCH,
+    PHASE_PRICES,
+    PHASE_STORE,
+    PHASE_JOIN,
+    PHASE_HISTORY,
+    PHASE_CHEAPEST,
+    PHASE_REGIONAL,
+    PHASE_CLEANUP,
+)
+
+# Number of refreshes kept in the rolling window
+METRICS_SAMPLES = 50
+
+# Upper bounds in seconds of the refresh duration histogram buckets
+HISTOGRAM_BUCKETS = (0.5, 1, 2, 5, 10, 30, 60, 120)
+
+
+class PhaseTimer:
+    """Time the phases of a single refresh."""
+
+    def __init__(self) -> None:
+        """Start timing."""
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block of code as the named phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round(time.perf_counter() - start, 4)
+
+    @property
+    def total(self) -> float:
+        """Return seconds since the timer started."""
+        return round(time.perf_counter() - self.started, 4)
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    """Return the nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = max(0, int(round(percentile / 100 * len(ordered))) - 1)
+    return ordered[index]
+
+
+class RefreshMetrics:
+    """Keep a rolling window of refresh samples in memory.
+
+    Each sample holds per-phase timings in seconds, station, price and
+    record counts, and the API response bytes downloaded for one API fetch. Refreshes served from the coalescing window are not
+    sampled, they did not touch the API.
+    """
+
+    def __init__(self, samples: int = METRICS_SAMPLES) -> None:
+        """Initialize the metrics window."""
+        self.history: deque[dict[str, Any]] = deque(maxlen=samples)
+
+    def record(self, sample: dict[str, Any]) -> None:
+        """Add the sample of a finished refresh."""
+        self.history.append(sample)
+
+    @property
+    def last(self) -> dict[str, Any] | None:
+        """Return the most recent sample."""
+        return self.history[-1] if self.history else None
+
+    def histogram(self) -> dict[str, int]:
+        """Return refresh durations in the window bucketed by upper bound."""
+        buckets = {f"le_{bound}s": 0 for bound in HISTOGRAM_BUCKETS}
+        buckets[f"gt_{HISTOGRAM_BUCKETS[-1]}s"] = 0
+        for sample in self.history:
+            for bound in HISTOGRAM_BUCKETS:
+                if sample["duration"] <= bound:
+                    buckets[f"le_{bound}s"] += 1
+                    break
+            else:
+                buckets[f"gt_{HISTOGRAM_BUCKETS[-1]}s"] += 1
+        return buckets
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Return average, p95 and max seconds for the total and each phase."""
+        summary = {}
+        for key in ("duration", *PHASES):
+            values = [
+                sample["duration"] if key == "duration" else sample["phases"][key]
+                for sample in self.history
+                if key == "duration" or key in sample["phases"]
+            ]
+            if values:
+                summary[key] = {
+                    "avg": round(sum(values) / len(values), 4),
+                    "p95": _percentile(values, 95),
+                    "max": max(values),
+                }
+        return summary
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the last sample with window statistics for sensors."""
+        return {
+            "last": self.last,
+            "samples": len(self.history),
+            "summary": self.summary(),
+            "histogram": self.histogram(),
+        }
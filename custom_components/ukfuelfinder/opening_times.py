@@ -0,0 +1,135 @@
+"""Compiled station opening times for UK Fuel Finder."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+# Opening times are local to the stations
+STATION_TIME_ZONE = dt_util.get_time_zone("Europe/London")
+
+DAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+def _minutes(value: Any) -> int | None:
+    """Parse "HH:MM" or "HH:MM:SS" as minutes since midnight."""
+    try:
+        hours, minutes = str(value).split(":")[:2]
+        total = int(hours) * 60 + int(minutes)
+    except (TypeError, ValueError):
+        return None
+    # A day that closes at 23:59 runs to midnight
+    return MINUTES_PER_DAY if total == MINUTES_PER_DAY - 1 else total
+
+
+class OpeningTable:
+    """Weekly opening hours of a station as sorted minute-of-week boundaries.
+
+    Even positions are opening times and odd positions closing times, so
+    whether a station is open is the parity of a bisect over at most 14
+    boundaries, and the next change is the boundary found by the same bisect.
+    """
+
+    __slots__ = ("boundaries",)
+
+    def __init__(self, boundaries: tuple[int, ...]) -> None:
+        """Initialize the table."""
+        self.boundaries = boundaries
+
+    @classmethod
+    def compile(cls, opening_times: dict[str, Any] | None) -> OpeningTable | None:
+        """Compile API opening times, or return None if they are unknown.
+
+        Accepts days keyed by name, either at the top level or under
+        ``usual_days``, each with "open" and "close" times and an optional
+        ``is_24_hours`` flag. A closing time before the opening time runs
+        past midnight, and days without valid times are closed.
+        """
+        if not opening_times:
+            return None
+        days = opening_times.get("usual_days", opening_times)
+
+        intervals: list[tuple[int, int]] = []
+        known = False
+        for day_index, day in enumerate(DAYS):
+            hours = days.get(day)
+            if not isinstance(hours, dict):
+                continue
+            known = True
+            if hours.get("is_24_hours"):
+                start, end = 0, MINUTES_PER_DAY
+            else:
+                start, end = _minutes(hours.get("open")), _minutes(hours.get("close"))
+                if start is None or end is None or start == end:
+                    continue
+                if end < start:
+                    end += MINUTES_PER_DAY
+            base = day_index * MINUTES_PER_DAY
+            start, end = base + start, base + end
+            if end > MINUTES_PER_WEEK:
+                # Sunday night into Monday morning
+                intervals.append((0, end - MINUTES_PER_WEEK))
+                end = MINUTES_PER_WEEK
+            intervals.append((start, end))
+
+        if not known:
+            return None
+
+        merged: list[list[int]] = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return cls(tuple(minute for interval in merged for minute in interval))
+
+    @staticmethod
+    def _week_minute(now: datetime) -> tuple[datetime, int]:
+        """Return station local time and its minute of the week."""
+        local = now.astimezone(STATION_TIME_ZONE)
+        return local, local.weekday() * MINUTES_PER_DAY + local.hour * 60 + local.minute
+
+    @property
+    def always_open(self) -> bool:
+        """Return True if the station never closes."""
+        return self.boundaries == (0, MINUTES_PER_WEEK)
+
+    def is_open(self, now: datetime) -> bool:
+        """Return True if the station is open at the given time."""
+        _, minute = self._week_minute(now)
+        return bisect_right(self.boundaries, minute) % 2 == 1
+
+    def next_change(self, now: datetime) -> datetime | None:
+        """Return when the station next opens or closes, None if it never does."""
+        if not self.boundaries or self.always_open:
+            return None
+        local, minute = self._week_minute(now)
+        position = bisect_right(self.boundaries, minute)
+        if position == len(self.boundaries):
+            boundary = self.boundaries[0] + MINUTES_PER_WEEK
+        elif self.boundaries[position] == MINUTES_PER_WEEK and self.boundaries[0] == 0:
+            # Open from Sunday night into Monday, the next change is Monday's closing
+            boundary = self.boundaries[1] + MINUTES_PER_WEEK
+        else:
+            boundary = self.boundaries[position]
+        start_of_minute = local.replace(second=0, microsecond=0)
+        return dt_util.as_utc(start_of_minute + timedelta(minutes=boundary - minute))
+
+
+def opening_state(table: OpeningTable | None, now: datetime) -> dict[str, Any]:
+    """Return open now, opens at and closes at attributes for a station."""
+    if table is None:
+        return {"open_now": None, "opens_at": None, "closes_at": None}
+    is_open = table.is_open(now)
+    change = table.next_change(now)
+    change_iso = change.isoformat() if change else None
+    return {
+        "open_now": is_open,
+        "opens_at": None if is_open else change_iso,
+        "closes_at": change_iso if is_open else None,
+    }
@@ -0,0 +1,170 @@
+"""Price changes between refreshes for UK Fuel Finder."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any
+
+
+class PriceSnapshot:
+    """Last seen price of every nearby station and fuel type.
+
+    Each refresh is compared against it in one pass over the new prices,
+    so only prices that moved are reported instead of every sensor state.
+    """
+
+    __slots__ = ("prices",)
+
+    def __init__(self) -> None:
+        """Initialize an empty snapshot."""
+        self.prices: dict[str, dict[str, float]] | None = None
+
+    def update(self, stations: dict[str, Any]) -> list[dict[str, Any]]:
+        """Store the prices of a refresh and return the ones that changed.
+
+        Nothing is reported on the first refresh or for stations that were
+        not nearby last time, so a restart or a new station is not a change.
+        """
+        previous = self.prices
+        self.prices = {
+            station_id: dict(station["prices"]) for station_id, station in stations.items()
+        }
+        if previous is None:
+            return []
+
+        changes = []
+        for station_id, station in stations.items():
+            old_prices = previous.get(station_id)
+            if old_prices is None:
+                continue
+            for fuel_type, price in station["prices"].items():
+                old_price = old_prices.get(fuel_type)
+                if price == old_price:
+                    continue
+                updated = station.get("price_timestamps", {}).get(fuel_type)
+                changes.append(
+                    {
+                        "station_id": station_id,
+                        "station_name": station["info"].get("trading_name"),
+                        "fuel_type": fuel_type,
+                        "old_price": old_price,
+                        "new_price": price,
+                        "price_last_updated": (
+                            updated.isoformat() if isinstance(updated, datetime) else updated
+                        ),
+                    }
+                )
+        return changes
+
+
+class CheapestWindow:
+    """Lowest and highest cheapest price of a fuel type over a sliding window.
+
+    Kept as two monotonic queues, so each refresh adds one sample and drops
+    expired ones in amortized constant time without rescanning the window.
+    """
+
+    __slots__ = ("window", "previous", "_lows", "_highs")
+
+    def __init__(self, window: timedelta) -> None:
+        """Initialize an empty window."""
+        self.window = window
+        self.previous: float | None = None
+        self._lows: deque[tuple[datetime, float]] = deque()
+        self._highs: deque[tuple[datetime, float]] = deque()
+
+    def add(self, now: datetime, price: float) -> None:
+        """Add the cheapest price of a refresh and expire old samples."""
+        while self._lows and self._lows[-1][1] >= price:
+            self._lows.pop()
+        self._lows.append((now, price))
+        while self._highs and self._highs[-1][1] <= price:
+            self._highs.pop()
+        self._highs.append((now, price))
+
+        start = now - self.window
+        while self._lows[0][0] < start:
+            self._lows.popleft()
+        while self._highs[0][0] < start:
+            self._highs.popleft()
+
+    @property
+    def low(self) -> float | None:
+        """Return the lowest cheapest price in the window."""
+        return self._lows[0][1] if self._lows else None
+
+    @property
+    def high(self) -> float | None:
+        """Return the highest cheapest price in the window."""
+        return self._highs[0][1] if self._highs else None
+
+
+class PriceMoveTracker:
+    """Price drops and spikes per fuel type, fed from the refresh diff."""
+
+    def __init__(self, threshold: float, window: timedelta) -> None:
+        """Initialize the tracker.
+
+        Args:
+            threshold: Smallest move in pence that counts as a drop or spike
+            window: How far back the cheapest price is compared
+        """
+        self.threshold = threshold
+        self.window = window
+        self.windows: dict[str, CheapestWindow] = {}
+
+    def update(
+        self,
+        now: datetime,
+        cheapest: dict[str, dict[str, Any]],
+        changes: list[dict[str, Any]],
+    ) -> dict[str, dict[str, Any]]:
+        """Return drop and spike state by fuel type for a refresh.
+
+        A fuel type has dropped if any nearby station's price fell by at
+        least the threshold since the last refresh, or the cheapest price
+        is at least the threshold below the last refresh or the highest
+        cheapest price in the window. Spikes are the same upwards.
+        """
+        dropped: dict[str, list[dict[str, Any]]] = {}
+        rose: dict[str, list[dict[str, Any]]] = {}
+        for change in changes:
+            if change["old_price"] is None:
+                continue
+            move = round(change["new_price"] - change["old_price"], 2)
+            if move <= -self.threshold:
+                dropped.setdefault(change["fuel_type"], []).append({**change, "change": move})
+            elif move >= self.threshold:
+                rose.setdefault(change["fuel_type"], []).append({**change, "change": move})
+
+        moves: dict[str, dict[str, Any]] = {}
+        for fuel_type in set(cheapest) | set(dropped) | set(rose):
+            price = cheapest.get(fuel_type, {}).get("price")
+            window = self.windows.get(fuel_type)
+            cheapest_change = None
+            if price is not None:
+                if window is None:
+                    window = self.windows[fuel_type] = CheapestWindow(self.window)
+                if window.previous is not None:
+                    cheapest_change = round(price - window.previous, 2)
+                window.previous = price
+                window.add(now, price)
+
+            from_high = round(price - window.high, 2) if price is not None else None
+            from_low = round(price - window.low, 2) if price is not None else None
+            moves[fuel_type] = {
+                "drop": bool(dropped.get(fuel_type))
+                or (cheapest_change is not None and cheapest_change <= -self.threshold)
+                or (from_high is not None and from_high <= -self.threshold),
+                "spike": bool(rose.get(fuel_type))
+                or (cheapest_change is not None and cheapest_change >= self.threshold)
+                or (from_low is not None and from_low >= self.threshold),
+                "dropped": dropped.get(fuel_type, []),
+                "rose": rose.get(fuel_type, []),
+                "cheapest_price": price,
+                "cheapest_change": cheapest_change,
+                "window_low": window.low if window else None,
+                "window_high": window.high if window else None,
+            }
+        return moves
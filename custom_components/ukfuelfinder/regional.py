@@ -0,0 +1,83 @@
+"""Regional price indexes for UK Fuel Finder."""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from collections.abc import Sequence
+from typing import Any
+
+# Regions prices are indexed over, from the smallest
+REGION_AREA = "area"
+REGION_COUNTY = "county"
+REGION_NATIONAL = "national"
+REGIONS = (REGION_AREA, REGION_COUNTY, REGION_NATIONAL)
+REGION_NAMES = {REGION_AREA: "Postcode Area", REGION_COUNTY: "County", REGION_NATIONAL: "UK"}
+
+# Leading letters of a postcode, e.g. "SW" for "SW1A 1AA"
+_POSTCODE_AREA = re.compile(r"\s*([A-Za-z]{1,2})\d")
+
+
+def postcode_area(postcode: str | None) -> str | None:
+    """Return the postcode area of a postcode."""
+    match = _POSTCODE_AREA.match(postcode) if postcode else None
+    return match.group(1).upper() if match else None
+
+
+def percentile(prices: Sequence[float], fraction: float) -> float:
+    """Return a percentile of sorted prices, interpolating between neighbours."""
+    position = (len(prices) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(prices) - 1)
+    return round(prices[low] + (prices[high] - prices[low]) * (position - low), 2)
+
+
+def price_index(prices: Sequence[float], local_price: float | None = None) -> dict[str, Any]:
+    """Summarize the sorted prices of a region.
+
+    Args:
+        prices: Prices of the region in pence, sorted
+        local_price: Cheapest nearby price, placed as the share of the region
+            at or below it
+    """
+    return {
+        "median": percentile(prices, 0.5),
+        "p10": percentile(prices, 0.1),
+        "p90": percentile(prices, 0.9),
+        "stations": len(prices),
+        "cheapest_nearby_percentile": (
+            round(100 * bisect_right(prices, local_price) / len(prices))
+            if local_price is not None
+            else None
+        ),
+    }
+
+
+def home_region(stations: dict[str, Any]) -> tuple[str | None, str | None]:
+    """Return the postcode area and county of the nearest station."""
+    for station in sorted(stations.values(), key=lambda station: station["distance"]):
+        area = postcode_area(station["info"].get("postcode"))
+        county = station["info"].get("county")
+        if area or county:
+            return area, county
+    return None, None
+
+
+def build_price_indexes(
+    distribution: dict[str, dict[str, list[float]]],
+    names: dict[str, str | None],
+    cheapest: dict[str, dict[str, Any]],
+) -> dict[str, dict[str, Any]]:
+    """Build the price index of every region from its sorted prices by fuel type."""
+    indexes: dict[str, dict[str, Any]] = {}
+    for region, fuels in distribution.items():
+        if not fuels:
+            continue
+        indexes[region] = {
+            "name": names[region],
+            "fuels": {
+                fuel_type: price_index(prices, cheapest.get(fuel_type, {}).get("price"))
+                for fuel_type, prices in fuels.items()
+            },
+        }
+    return indexes
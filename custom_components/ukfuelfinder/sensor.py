@@ -2,15 +2,36 @@
 
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-
-from .const import ATTRIBUTION, CONF_FUEL_TYPES, DOMAIN, FUEL_TYPES
+from homeassistant.util import dt as dt_util
+
+from .cheapest_filters import CheapestFilter, cheapest_filters
+from .const import (
+    ATTRIBUTION,
+    COMPONENT_PRICES,
+    COMPONENT_STATIONS,
+    CONF_FUEL_TYPES,
+    DOMAIN,
+    FUEL_TYPES,
+)
 from .coordinator import UKFuelFinderCoordinator
+from .opening_times import opening_state
+from .regional import REGION_NAMES, REGIONS
 
 
 async def async_setup_entry(
@@ -51,6 +72,14 @@ async def async_setup_entry(
                             station_data,
                         )
                     )
+                    new_entities.append(
+                        UKFuelFinderRankSensor(
+                            coordinator,
+                            station_id,
+                            fuel_type,
+                            station_data,
+                        )
+                    )
 
         # Create cheapest sensors (one per selected fuel type)
         for fuel_type in selected_fuel_types:
@@ -59,13 +88,130 @@ async def async_setup_entry(
                 known_sensors.add(sensor_key)
                 new_entities.append(UKFuelFinderCheapestSensor(coordinator, fuel_type))
 
+        # Create filtered cheapest sensors (one per configured filter and selected fuel type)
+        for cheapest_filter in cheapest_filters(entry.data):
+            for fuel_type in selected_fuel_types:
+                sensor_key = ("cheapest", cheapest_filter.key, fuel_type)
+                if sensor_key not in known_sensors:
+                    known_sensors.add(sensor_key)
+                    new_entities.append(
+                        UKFuelFinderFilteredCheapestSensor(coordinator, fuel_type, cheapest_filter)
+                    )
+
+        # Create regional price index sensors once the region has prices for a fuel type
+        regional = coordinator.data.get("regional", {})
+        for region in REGIONS:
+            for fuel_type in selected_fuel_types:
+                if fuel_type not in regional.get(region, {}).get("fuels", {}):
+                    continue
+                sensor_key = ("regional", region, fuel_type)
+                if sensor_key not in known_sensors:
+                    known_sensors.add(sensor_key)
+                    new_entities.append(UKFuelFinderRegionalSensor(coordinator, region, fuel_type))
+
+        # Create price freshness sensors once a fuel type has timestamped prices
+        freshness = coordinator.data.get("freshness", {})
+        for fuel_type in selected_fuel_types:
+            sensor_key = ("freshness", fuel_type)
+            if fuel_type in freshness and sensor_key not in known_sensors:
+                known_sensors.add(sensor_key)
+                new_entities.append(UKFuelFinderFreshnessSensor(coordinator, fuel_type))
+
         if new_entities:
             async_add_entities(new_entities)
 
+    async_add_entities(
+        UKFuelFinderDiagnosticSensor(coordinator, description) for description in DIAGNOSTIC_SENSORS
+    )
+
     _check_new_stations()
     entry.async_on_unload(coordinator.async_add_listener(_check_new_stations))
 
 
+@dataclass(frozen=True, kw_only=True)
+class UKFuelFinderDiagnosticDescription(SensorEntityDescription):
+    """Describe a refresh metrics sensor."""
+
+    value_fn: Callable[[dict[str, Any]], Any]
+    attributes_fn: Callable[[dict[str, Any]], dict[str, Any]] = lambda metrics: {}
+
+
+DIAGNOSTIC_SENSORS: tuple[UKFuelFinderDiagnosticDescription, ...] = (
+    UKFuelFinderDiagnosticDescription(
+        key="refresh_duration",
+        name="Refresh Duration",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=2,
+        value_fn=lambda metrics: metrics["last"]["duration"],
+        attributes_fn=lambda metrics: {
+            "phases": metrics["last"]["phases"],
+            "samples": metrics["samples"],
+            "summary": metrics["summary"],
+            "histogram": metrics["histogram"],
+        },
+    ),
+    UKFuelFinderDiagnosticDescription(
+        key="stations_tracked",
+        name="Stations Tracked",
+        icon="mdi:map-marker-multiple",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics["last"]["stations"],
+        attributes_fn=lambda metrics: {
+            "prices": metrics["last"]["prices"],
+            "price_records": metrics["last"]["price_records"],
+            "api_calls": metrics["last"]["api_calls"],
+        },
+    ),
+    UKFuelFinderDiagnosticDescription(
+        key="download_size",
+        name="API Download Size",
+        icon="mdi:download",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.MEGABYTES,
+        suggested_display_precision=2,
+        value_fn=lambda metrics: metrics["last"]["response_bytes"],
+    ),
+    UKFuelFinderDiagnosticDescription(
+        key="api_queue_wait",
+        name="API Queue Wait",
+        icon="mdi:timer-sand",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=3,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: metrics["last"]["queue_wait_max"],
+    ),
+)
+
+
+def _data_ages(data: dict | None) -> dict[str, int | None]:
+    """Return the age in minutes of the station and price data being served."""
+    updated = (data or {}).get("component_updated", {})
+    now = dt_util.utcnow()
+    return {
+        f"{component}_age_minutes": (
+            int((now - updated[component]).total_seconds() // 60) if component in updated else None
+        )
+        for component in (COMPONENT_STATIONS, COMPONENT_PRICES)
+    }
+
+
+def _price_rank(data: dict | None, station_id: str, fuel_type: str) -> dict[str, int | None]:
+    """Return the price rank of a station among nearby stations, ranked by the coordinator."""
+    rank = (data or {}).get("price_ranks", {}).get(station_id, {}).get(fuel_type, {})
+    return {
+        "price_rank": rank.get("rank"),
+        "price_rank_of": rank.get("rank_of"),
+        "price_percentile": rank.get("percentile"),
+    }
+
+
 class UKFuelFinderSensor(CoordinatorEntity[UKFuelFinderCoordinator], SensorEntity):
     """Representation of a UK Fuel Finder sensor."""
 
@@ -83,7 +229,8 @@ class UKFuelFinderSensor(CoordinatorEntity[UKFuelFinderCoordinator], SensorEntit
         station_data: dict,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        # The station ID context also updates the sensor when the station opens or closes
+        super().__init__(coordinator, context=station_id)
 
         self._station_id = station_id
         self._fuel_type = fuel_type
@@ -130,6 +277,12 @@ class UKFuelFinderSensor(CoordinatorEntity[UKFuelFinderCoordinator], SensorEntit
         info = station["info"]
         price_pence = station["prices"].get(self._fuel_type)
         price_timestamp = station.get("price_timestamps", {}).get(self._fuel_type)
+        # Min, max, mean and trend over 24h, 7d and 30d, kept up to date by the coordinator
+        price_stats = (
+            self.coordinator.data.get("price_stats", {})
+            .get(self._station_id, {})
+            .get(self._fuel_type, {})
+        )
 
         return {
             "station_name": info["trading_name"],
@@ -142,11 +295,21 @@ class UKFuelFinderSensor(CoordinatorEntity[UKFuelFinderCoordinator], SensorEntit
             "fuel_type": self._fuel_type,
             "price_pence": price_pence,
             "price_last_updated": price_timestamp.isoformat() if price_timestamp else None,
+            # Older than the max price age, so left out of cheapest and ranks
+            "price_stale": self._fuel_type
+            in self.coordinator.data.get("stale_prices", {}).get(self._station_id, ()),
+            **price_stats,
+            **_price_rank(self.coordinator.data, self._station_id, self._fuel_type),
             # Metadata fields
             "is_supermarket": info.get("is_supermarket"),
             "is_motorway": info.get("is_motorway"),
             "amenities": info.get("amenities", []),
             "opening_times": info.get("opening_times", {}),
+            # Looked up in the opening hours table compiled by the coordinator
+            **opening_state(
+                self.coordinator.data.get("opening_tables", {}).get(self._station_id),
+                dt_util.utcnow(),
+            ),
             "fuel_types_available": info.get("fuel_types_available", []),
             "organization_name": info.get("organization_name"),
             "temporary_closure": info.get("temporary_closure"),
@@ -167,6 +330,58 @@ class UKFuelFinderSensor(CoordinatorEntity[UKFuelFinderCoordinator], SensorEntit
         return station is not None and self._fuel_type in station.get("prices", {})
 
 
+class UKFuelFinderRankSensor(CoordinatorEntity[UKFuelFinderCoordinator], SensorEntity):
+    """Sensor showing how a station's price ranks among nearby stations, 1 being cheapest."""
+
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:podium"
+
+    def __init__(
+        self,
+        coordinator: UKFuelFinderCoordinator,
+        station_id: str,
+        fuel_type: str,
+        station_data: dict,
+    ) -> None:
+        """Initialize the rank sensor."""
+        super().__init__(coordinator)
+
+        self._station_id = station_id
+        self._fuel_type = fuel_type
+        self._attr_unique_id = f"{station_id}_{fuel_type}_rank"
+        self._attr_name = f"{fuel_type.replace('_', ' ').title()} Rank"
+
+        # Same device as the station's price sensors
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, station_id)},
+            name=station_data["info"]["trading_name"],
+            manufacturer=station_data["info"]["brand"],
+            model="Fuel Station",
+        )
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the price rank."""
+        return _price_rank(self.coordinator.data, self._station_id, self._fuel_type)["price_rank"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the number of stations ranked and the percentile."""
+        rank = _price_rank(self.coordinator.data, self._station_id, self._fuel_type)
+        return {
+            "rank_of": rank["price_rank_of"],
+            "percentile": rank["price_percentile"],
+            "fuel_type": self._fuel_type,
+        }
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return super().available and self.native_value is not None
+
+
 class UKFuelFinderCheapestSensor(CoordinatorEntity[UKFuelFinderCoordinator], SensorEntity):
     """Sensor showing the cheapest price for a fuel type."""
 
@@ -191,10 +406,14 @@ class UKFuelFinderCheapestSensor(CoordinatorEntity[UKFuelFinderCoordinator], Sen
             model="Aggregate Sensor",
         )
 
+    def _cheapest(self) -> dict[str, Any] | None:
+        """Return the cheapest station data for the fuel type."""
+        return self.coordinator.get_cheapest_fuel(self._fuel_type)
+
     @property
     def native_value(self) -> float | None:
         """Return the cheapest price in pounds."""
-        cheapest = self.coordinator.get_cheapest_fuel(self._fuel_type)
+        cheapest = self._cheapest()
         if not cheapest:
             return None
         return round(cheapest["price"] / 100, 3)
@@ -202,7 +421,7 @@ class UKFuelFinderCheapestSensor(CoordinatorEntity[UKFuelFinderCoordinator], Sen
     @property
     def extra_state_attributes(self) -> dict[str, any]:
         """Return station attributes for the cheapest price."""
-        cheapest = self.coordinator.get_cheapest_fuel(self._fuel_type)
+        cheapest = self._cheapest()
         if not cheapest:
             return {}
 
@@ -227,6 +446,8 @@ class UKFuelFinderCheapestSensor(CoordinatorEntity[UKFuelFinderCoordinator], Sen
             "organization_name": cheapest.get("organization_name"),
             "temporary_closure": cheapest.get("temporary_closure"),
             "permanent_closure": cheapest.get("permanent_closure"),
+            # Data freshness, older than usual while the API is partly failing
+            **_data_ages(self.coordinator.data),
             "attribution": ATTRIBUTION,
         }
 
@@ -237,5 +458,207 @@ class UKFuelFinderCheapestSensor(CoordinatorEntity[UKFuelFinderCoordinator], Sen
             return False
 
         # Sensor is available if we can find at least one station with this fuel type
-        cheapest = self.coordinator.get_cheapest_fuel(self._fuel_type)
+        cheapest = self._cheapest()
         return cheapest is not None
+
+
+class UKFuelFinderFilteredCheapestSensor(UKFuelFinderCheapestSensor):
+    """Sensor showing the cheapest price for a fuel type among filtered stations."""
+
+    def __init__(
+        self,
+        coordinator: UKFuelFinderCoordinator,
+        fuel_type: str,
+        cheapest_filter: CheapestFilter,
+    ) -> None:
+        """Initialize the filtered cheapest sensor."""
+        super().__init__(coordinator, fuel_type)
+        self._filter_key = cheapest_filter.key
+        # The filter key context also updates open now sensors when a station opens or closes
+        self.coordinator_context = cheapest_filter.key
+        entry_id = coordinator.config_entry.entry_id
+        self._attr_unique_id = f"{entry_id}_cheapest_{cheapest_filter.key}_{fuel_type}"
+        self._attr_name = f"Cheapest {fuel_type.replace('_', ' ').title()} {cheapest_filter.name}"
+
+    def _cheapest(self) -> dict[str, Any] | None:
+        """Return the cheapest station data for the fuel type among filtered stations."""
+        return self.coordinator.get_cheapest_fuel(self._fuel_type, self._filter_key)
+
+
+class UKFuelFinderRegionalSensor(CoordinatorEntity[UKFuelFinderCoordinator], SensorEntity):
+    """Sensor showing the median price of a fuel type in the postcode area, county or UK."""
+
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "GBP"
+    _attr_suggested_display_precision = 2
+    _attr_icon = "mdi:chart-bell-curve"
+
+    def __init__(self, coordinator: UKFuelFinderCoordinator, region: str, fuel_type: str) -> None:
+        """Initialize the regional sensor."""
+        super().__init__(coordinator)
+        self._region = region
+        self._fuel_type = fuel_type
+        entry_id = coordinator.config_entry.entry_id
+        self._attr_unique_id = f"{entry_id}_regional_{region}_{fuel_type}"
+        self._attr_name = f"{REGION_NAMES[region]} {fuel_type.replace('_', ' ').title()} Median"
+
+        # Device info for grouping
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"{entry_id}_regional")},
+            name="Regional Fuel Prices",
+            manufacturer="UK Fuel Finder",
+            model="Price Index",
+        )
+
+    @property
+    def _index(self) -> tuple[str | None, dict[str, Any]] | None:
+        """Return the region name and price index of the last refresh."""
+        region = (self.coordinator.data or {}).get("regional", {}).get(self._region)
+        if not region or self._fuel_type not in region["fuels"]:
+            return None
+        return region["name"], region["fuels"][self._fuel_type]
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the median price in pounds."""
+        index = self._index
+        return round(index[1]["median"] / 100, 3) if index else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the price spread of the region."""
+        index = self._index
+        if not index:
+            return {}
+
+        name, fuel_index = index
+        return {
+            "region": name,
+            "fuel_type": self._fuel_type,
+            "median_pence": fuel_index["median"],
+            "p10_pence": fuel_index["p10"],
+            "p90_pence": fuel_index["p90"],
+            "stations": fuel_index["stations"],
+            # Share of the region's stations at or below the cheapest nearby price
+            "cheapest_nearby_percentile": fuel_index["cheapest_nearby_percentile"],
+            "attribution": ATTRIBUTION,
+        }
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return super().available and self._index is not None
+
+
+class UKFuelFinderFreshnessSensor(CoordinatorEntity[UKFuelFinderCoordinator], SensorEntity):
+    """Sensor showing the median age of nearby prices for a fuel type."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_suggested_display_precision = 1
+    _attr_icon = "mdi:clock-alert-outline"
+
+    def __init__(self, coordinator: UKFuelFinderCoordinator, fuel_type: str) -> None:
+        """Initialize the freshness sensor."""
+        super().__init__(coordinator)
+        self._fuel_type = fuel_type
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_freshness_{fuel_type}"
+        self._attr_name = f"{fuel_type.replace('_', ' ').title()} Price Age"
+
+        # Same device as the cheapest sensors
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, "cheapest")},
+            name="Cheapest Fuel Prices",
+            manufacturer="UK Fuel Finder",
+            model="Aggregate Sensor",
+        )
+
+    @property
+    def _freshness(self) -> dict[str, Any] | None:
+        """Return the price age statistics of the last refresh."""
+        return (self.coordinator.data or {}).get("freshness", {}).get(self._fuel_type)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the median price age in hours."""
+        freshness = self._freshness
+        return freshness["median_age_hours"] if freshness else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the oldest price age and the number of stale prices."""
+        freshness = self._freshness
+        if not freshness:
+            return {}
+
+        max_price_age = self.coordinator.max_price_age
+        return {
+            "fuel_type": self._fuel_type,
+            "oldest_age_hours": freshness["oldest_age_hours"],
+            "prices": freshness["prices"],
+            "stale": freshness["stale"],
+            "max_price_age_days": max_price_age.days if max_price_age else None,
+        }
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return super().available and self._freshness is not None
+
+
+class UKFuelFinderDiagnosticSensor(CoordinatorEntity[UKFuelFinderCoordinator], SensorEntity):
+    """Sensor exposing timing, count and payload size metrics of the last refresh."""
+
+    entity_description: UKFuelFinderDiagnosticDescription
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: UKFuelFinderCoordinator,
+        description: UKFuelFinderDiagnosticDescription,
+    ) -> None:
+        """Initialize the diagnostic sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        entry_id = coordinator.config_entry.entry_id
+        self._attr_unique_id = f"{entry_id}_diagnostics_{description.key}"
+
+        # Device info for grouping
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"{entry_id}_diagnostics")},
+            name="UK Fuel Finder",
+            manufacturer="UK Fuel Finder",
+            model="API Client",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def _metrics(self) -> dict[str, Any] | None:
+        """Return the metrics snapshot of the last refresh that hit the API."""
+        metrics = (self.coordinator.data or {}).get("metrics")
+        if not metrics or not metrics.get("last"):
+            return None
+        return metrics
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the metric value."""
+        metrics = self._metrics
+        return self.entity_description.value_fn(metrics) if metrics else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return supporting metrics."""
+        metrics = self._metrics
+        return self.entity_description.attributes_fn(metrics) if metrics else {}
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return super().available and self._metrics is not None
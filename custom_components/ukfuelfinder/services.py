@@ -0,0 +1,196 @@
+"""Services for UK Fuel Finder."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_LATITUDE, ATTR_LONGITUDE, CONF_RADIUS
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_RADIUS, DOMAIN, FUEL_TYPES, MAX_RADIUS, MIN_RADIUS
+from .store import StationStore
+
+SERVICE_FIND_CHEAPEST = "find_cheapest"
+
+ATTR_FUEL_TYPE = "fuel_type"
+ATTR_BRAND = "brand"
+ATTR_AMENITY = "amenity"
+ATTR_LIMIT = "limit"
+
+DEFAULT_LIMIT = 5
+MAX_LIMIT = 50
+
+# Recent query results kept, they are dropped when the store is refreshed
+QUERY_CACHE_SIZE = 64
+
+FIND_CHEAPEST_SCHEMA = vol.All(
+    cv.has_at_most_one_key(ATTR_LATITUDE, ATTR_ENTITY_ID),
+    vol.Schema(
+        {
+            vol.Required(ATTR_FUEL_TYPE): vol.In(FUEL_TYPES),
+            vol.Inclusive(ATTR_LATITUDE, "coordinates"): cv.latitude,
+            vol.Inclusive(ATTR_LONGITUDE, "coordinates"): cv.longitude,
+            vol.Optional(ATTR_ENTITY_ID): cv.entity_id,
+            vol.Optional(CONF_RADIUS, default=DEFAULT_RADIUS): vol.All(
+                vol.Coerce(float), vol.Range(min=MIN_RADIUS, max=MAX_RADIUS)
+            ),
+            vol.Optional(ATTR_BRAND): cv.string,
+            vol.Optional(ATTR_AMENITY): cv.string,
+            vol.Optional(ATTR_LIMIT, default=DEFAULT_LIMIT): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=MAX_LIMIT)
+            ),
+        }
+    ),
+)
+
+
+class QueryCache:
+    """Least recently used cache of query results."""
+
+    def __init__(self, size: int) -> None:
+        """Initialize the cache."""
+        self.size = size
+        self._results: OrderedDict[tuple[Any, ...], Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple[Any, ...]) -> Any | None:
+        """Return a cached result and mark it as recently used."""
+        if key not in self._results:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._results.move_to_end(key)
+        return self._results[key]
+
+    def put(self, key: tuple[Any, ...], result: Any) -> None:
+        """Cache a result, evicting the least recently used one if full."""
+        self._results[key] = result
+        self._results.move_to_end(key)
+        if len(self._results) > self.size:
+            self._results.popitem(last=False)
+
+
+def _loaded_store(hass: HomeAssistant) -> tuple[StationStore, timedelta | None]:
+    """Return a station store that holds a completed price download.
+
+    Returns:
+        The store and the max price age of the config entry that fills it
+    """
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        store = coordinator.station_store
+        if store is not None and store.prices_refreshed is not None:
+            return store, coordinator.max_price_age
+    raise ServiceValidationError("No national price data has been downloaded yet")
+
+
+def _location(hass: HomeAssistant, call: ServiceCall) -> tuple[float, float]:
+    """Return the search centre from the call, an entity, or the home location."""
+    if ATTR_LATITUDE in call.data:
+        return call.data[ATTR_LATITUDE], call.data[ATTR_LONGITUDE]
+
+    if ATTR_ENTITY_ID in call.data:
+        entity_id = call.data[ATTR_ENTITY_ID]
+        state = hass.states.get(entity_id)
+        if state is None:
+            raise ServiceValidationError(f"Entity {entity_id} not found")
+        latitude = state.attributes.get(ATTR_LATITUDE)
+        longitude = state.attributes.get(ATTR_LONGITUDE)
+        if latitude is None or longitude is None:
+            raise ServiceValidationError(f"Entity {entity_id} has no location")
+        return float(latitude), float(longitude)
+
+    return hass.config.latitude, hass.config.longitude
+
+
+def _station_result(row: dict[str, Any]) -> dict[str, Any]:
+    """Convert a station store row to a service response entry."""
+    return {
+        "station_id": row["node_id"],
+        "station_name": row["trading_name"],
+        "brand": row["brand"],
+        "postcode": row["postcode"],
+        "latitude": row["latitude"],
+        "longitude": row["longitude"],
+        "distance_km": round(row["distance"], 2),
+        "price": round(row["price"] / 100, 3),
+        "price_pence": row["price"],
+        "price_last_updated": row["updated"],
+        "is_supermarket": bool(row["is_supermarket"]),
+        "is_motorway": bool(row["is_motorway"]),
+        "amenities": row["amenities"],
+    }
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the UK Fuel Finder services."""
+    cache = QueryCache(QUERY_CACHE_SIZE)
+
+    async def async_find_cheapest(call: ServiceCall) -> ServiceResponse:
+        """Find the cheapest stations around a location from the local station store."""
+        store, max_price_age = _loaded_store(hass)
+        latitude, longitude = _location(hass, call)
+        fuel_type = call.data[ATTR_FUEL_TYPE]
+        radius = call.data[CONF_RADIUS]
+        brand = call.data.get(ATTR_BRAND)
+        amenity = call.data.get(ATTR_AMENITY)
+        limit = call.data[ATTR_LIMIT]
+
+        # A store refresh changes the sync times and so misses old results
+        key = (
+            store.path,
+            store.prices_refreshed,
+            store.metadata_synced,
+            fuel_type,
+            round(latitude, 4),
+            round(longitude, 4),
+            radius,
+            brand.casefold() if brand else None,
+            amenity,
+            limit,
+            max_price_age,
+        )
+        stations = cache.get(key)
+        if stations is None:
+            # Like the cheapest sensors, stale prices are left out
+            updated_since = dt_util.utcnow() - max_price_age if max_price_age else None
+            rows = await hass.async_add_executor_job(
+                store.find_cheapest,
+                fuel_type,
+                latitude,
+                longitude,
+                radius,
+                brand,
+                amenity,
+                limit,
+                updated_since,
+            )
+            stations = [_station_result(row) for row in rows]
+            cache.put(key, stations)
+
+        return {
+            "fuel_type": fuel_type,
+            "latitude": latitude,
+            "longitude": longitude,
+            "radius": radius,
+            "stations": stations,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_CHEAPEST,
+        async_find_cheapest,
+        schema=FIND_CHEAPEST_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,95 @@
+"""Inverted indexes of nearby stations by brand, amenity and flag."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+# Station info flags that are indexed, by name
+FLAG_SUPERMARKET = "is_supermarket"
+FLAG_MOTORWAY = "is_motorway"
+FLAG_TEMPORARY_CLOSURE = "temporary_closure"
+FLAG_PERMANENT_CLOSURE = "permanent_closure"
+FLAGS = (FLAG_SUPERMARKET, FLAG_MOTORWAY, FLAG_TEMPORARY_CLOSURE, FLAG_PERMANENT_CLOSURE)
+
+
+class StationIndex:
+    """Sets of station IDs by brand, amenity and flag.
+
+    Built from coordinator station data when fresh station metadata
+    arrives, so filters are answered by intersecting sets instead of
+    walking every station's info.
+    """
+
+    __slots__ = ("stations", "brands", "amenities", "flags")
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self.stations: frozenset[str] = frozenset()
+        self.brands: dict[str, frozenset[str]] = {}
+        self.amenities: dict[str, frozenset[str]] = {}
+        self.flags: dict[str, frozenset[str]] = {flag: frozenset() for flag in FLAGS}
+
+    @classmethod
+    def build(cls, stations: dict[str, Any]) -> StationIndex:
+        """Index coordinator station data in one pass."""
+        brands: dict[str, set[str]] = {}
+        amenities: dict[str, set[str]] = {}
+        flags: dict[str, set[str]] = {flag: set() for flag in FLAGS}
+
+        for station_id, station in stations.items():
+            info = station["info"]
+            if info.get("brand"):
+                brands.setdefault(info["brand"].casefold(), set()).add(station_id)
+            for amenity in info.get("amenities") or ():
+                amenities.setdefault(amenity, set()).add(station_id)
+            for flag in FLAGS:
+                if info.get(flag):
+                    flags[flag].add(station_id)
+
+        index = cls()
+        index.stations = frozenset(stations)
+        index.brands = {brand: frozenset(ids) for brand, ids in brands.items()}
+        index.amenities = {amenity: frozenset(ids) for amenity, ids in amenities.items()}
+        index.flags = {flag: frozenset(ids) for flag, ids in flags.items()}
+        return index
+
+    def select(
+        self,
+        brands: Iterable[str] | None = None,
+        amenities: Iterable[str] | None = None,
+        is_supermarket: bool | None = None,
+        is_motorway: bool | None = None,
+        exclude_closed: bool = False,
+    ) -> frozenset[str]:
+        """Return the IDs of stations matching every given filter.
+
+        Args:
+            brands: Stations of any of these brands (case insensitive)
+            amenities: Stations with all of these amenities
+            is_supermarket: Only supermarket (True) or non-supermarket (False) stations
+            is_motorway: Only motorway (True) or non-motorway (False) stations
+            exclude_closed: Leave out temporarily or permanently closed stations
+        """
+        selected = self.stations
+
+        if brands is not None:
+            selected = selected & frozenset().union(
+                *(self.brands.get(brand.casefold(), frozenset()) for brand in brands)
+            )
+
+        for amenity in amenities or ():
+            selected = selected & self.amenities.get(amenity, frozenset())
+
+        for flag, wanted in ((FLAG_SUPERMARKET, is_supermarket), (FLAG_MOTORWAY, is_motorway)):
+            if wanted is True:
+                selected = selected & self.flags[flag]
+            elif wanted is False:
+                selected = selected - self.flags[flag]
+
+        if exclude_closed:
+            selected = (
+                selected - self.flags[FLAG_TEMPORARY_CLOSURE] - self.flags[FLAG_PERMANENT_CLOSURE]
+            )
+
+        return selected
@@ -0,0 +1,456 @@
+"""Local SQLite store of national station metadata and current prices."""
+
+from __future__ import annotations
+
+import json
+import math
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import closing, contextmanager
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .regional import REGION_AREA, REGION_COUNTY, REGION_NATIONAL, postcode_area
+
+DATA_STATION_STORES = f"{DOMAIN}_station_stores"
+STORE_FILENAME = "{domain}_{environment}.db"
+SCHEMA_VERSION = 1
+BUSY_TIMEOUT = 30  # seconds to wait for another config entry's write to finish
+
+# Station metadata changes rarely, the store re-syncs it at most this often
+METADATA_SYNC_INTERVAL = 24 * 3600  # seconds
+
+# Tables synced from a full national download, one config entry at a time
+SYNC_STATIONS = "stations"
+SYNC_PRICES = "prices"
+
+# Geohash cells of ~4.9 x 4.9 km index station locations
+GEOHASH_PRECISION = 5
+MAX_BOUNDS_CELLS = 256  # larger boxes are filtered on coordinates alone
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_KM = 6371.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stations (
+    node_id TEXT PRIMARY KEY,
+    trading_name TEXT,
+    brand TEXT,
+    latitude REAL,
+    longitude REAL,
+    cell TEXT,
+    postcode TEXT,
+    city TEXT,
+    county TEXT,
+    is_supermarket INTEGER,
+    is_motorway INTEGER,
+    temporary_closure INTEGER,
+    amenities TEXT,
+    synced REAL
+);
+CREATE TABLE IF NOT EXISTS prices (
+    node_id TEXT NOT NULL,
+    fuel_type TEXT NOT NULL,
+    price REAL NOT NULL,
+    updated TEXT,
+    refreshed REAL,
+    PRIMARY KEY (node_id, fuel_type)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_stations_cell ON stations (cell);
+CREATE INDEX IF NOT EXISTS idx_stations_brand ON stations (brand COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_prices_fuel_type ON prices (fuel_type, price);
+"""
+
+
+def geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Encode a location as a geohash cell."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    cell = []
+    bits = 0
+    value = 0
+    even = True
+
+    while len(cell) < precision:
+        coord_range, coord = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (coord_range[0] + coord_range[1]) / 2
+        value <<= 1
+        if coord >= middle:
+            value |= 1
+            coord_range[0] = middle
+        else:
+            coord_range[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            cell.append(_GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+
+    return "".join(cell)
+
+
+def geohash_cells(
+    bounds: tuple[float, float, float, float], precision: int = GEOHASH_PRECISION
+) -> set[str] | None:
+    """Return the geohash cells covering a (south, west, north, east) box.
+
+    Returns None if more than MAX_BOUNDS_CELLS cells would be needed.
+    """
+    south, west, north, east = bounds
+    lon_bits = (precision * 5 + 1) // 2
+    lat_step = 180.0 / 2 ** (precision * 5 - lon_bits)
+    lon_step = 360.0 / 2**lon_bits
+
+    rows = int((north - south) / lat_step) + 2
+    columns = int((east - west) / lon_step) + 2
+    if rows * columns > MAX_BOUNDS_CELLS:
+        return None
+
+    return {
+        geohash(min(south + row * lat_step, north), min(west + column * lon_step, east), precision)
+        for row in range(rows)
+        for column in range(columns)
+    }
+
+
+def distance_km(latitude: float, longitude: float, other_lat: float, other_lon: float) -> float:
+    """Return the great-circle distance between two points in km."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (latitude, longitude, other_lat, other_lon))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def radius_bounds(
+    latitude: float, longitude: float, radius_km: float
+) -> tuple[float, float, float, float]:
+    """Return the (south, west, north, east) box around a circle."""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    lon_delta = lat_delta / max(math.cos(math.radians(latitude)), 0.01)
+    return latitude - lat_delta, longitude - lon_delta, latitude + lat_delta, longitude + lon_delta
+
+
+def _station_row(info: Any, synced: float) -> tuple[Any, ...]:
+    """Convert a PFSInfo model to a stations row."""
+    location = info.location
+    latitude = location.latitude if location else None
+    longitude = location.longitude if location else None
+    return (
+        info.node_id,
+        info.trading_name,
+        info.brand_name,
+        latitude,
+        longitude,
+        geohash(latitude, longitude) if latitude is not None and longitude is not None else None,
+        location.postcode if location else None,
+        location.city if location else None,
+        location.county if location else None,
+        info.is_supermarket_service_station,
+        info.is_motorway_service_station,
+        info.temporary_closure,
+        json.dumps(info.amenities or []),
+        synced,
+    )
+
+
+def _price_rows(all_pfs: Iterable[Any], refreshed: float) -> Iterator[tuple[Any, ...]]:
+    """Convert PFS models to prices rows, normalizing fuel types like the coordinator."""
+    for pfs in all_pfs:
+        for fuel_price in pfs.fuel_prices:
+            if fuel_price.price is None:
+                continue
+            updated = fuel_price.price_last_updated
+            yield (
+                pfs.node_id,
+                fuel_price.fuel_type.lower().replace(" ", "_"),
+                fuel_price.price,
+                updated.isoformat() if hasattr(updated, "isoformat") else updated,
+                refreshed,
+            )
+
+
+class StationStore:
+    """National station metadata and current prices in a local SQLite database.
+
+    The coordinator writes every price page and, at most once per
+    METADATA_SYNC_INTERVAL, every station page it downloads anyway, so the
+    store costs no extra API calls. Queries are answered from indexes on
+    node ID, fuel type, geohash cell and brand, and the data survives
+    restarts. All methods except claiming and releasing a sync block and
+    must run in the executor.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the store."""
+        self.path = path
+        self.metadata_synced: float | None = None
+        self.prices_refreshed: float | None = None  # set once a price download completes
+        self._syncing: set[str] = set()
+
+    def claim_sync(self, table: str) -> bool:
+        """Claim a table for a sync, run in the event loop.
+
+        Config entries of the same API environment share the store. A sync
+        ends by deleting rows older than its start, so a second sync running
+        alongside would delete rows the first one had just written as current.
+        The entry that cannot claim the table skips writing it this refresh,
+        the other entry's download is just as recent.
+
+        Returns:
+            True if no other sync of the table is running
+        """
+        if table in self._syncing:
+            return False
+        self._syncing.add(table)
+        return True
+
+    def release_sync(self, table: str) -> None:
+        """Release a table claimed for a sync, run in the event loop."""
+        self._syncing.discard(table)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one operation and commit it if it succeeds."""
+        with closing(sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)) as connection:
+            connection.row_factory = sqlite3.Row
+            with connection:
+                yield connection
+
+    def setup(self) -> None:
+        """Create the schema and load the last metadata sync time."""
+        with self._connect() as connection:
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                connection.executescript(
+                    "DROP TABLE IF EXISTS stations; DROP TABLE IF EXISTS prices; "
+                    "DROP TABLE IF EXISTS meta;"
+                )
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.executescript(SCHEMA)
+            row = connection.execute(
+                "SELECT value FROM meta WHERE key = 'metadata_synced'"
+            ).fetchone()
+        self.metadata_synced = float(row["value"]) if row else None
+
+    def metadata_due(self) -> bool:
+        """Return True if station metadata should be synced again."""
+        return (
+            self.metadata_synced is None
+            or time.time() - self.metadata_synced >= METADATA_SYNC_INTERVAL
+        )
+
+    def upsert_stations(self, infos: list[Any], synced: float) -> None:
+        """Insert or update a page of station metadata."""
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO stations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [_station_row(info, synced) for info in infos],
+            )
+
+    def finish_metadata_sync(self, synced: float) -> None:
+        """Drop stations missing from a completed sync and record its time."""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM stations WHERE synced < ?", (synced,))
+            connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('metadata_synced', ?)", (str(synced),)
+            )
+        self.metadata_synced = synced
+
+    def upsert_prices(self, all_pfs: list[Any], refreshed: float) -> None:
+        """Insert or update a page of current prices."""
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?, ?)",
+                _price_rows(all_pfs, refreshed),
+            )
+
+    def finish_price_sync(self, refreshed: float) -> None:
+        """Drop prices missing from a completed download."""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM prices WHERE refreshed < ?", (refreshed,))
+        self.prices_refreshed = refreshed
+
+    def cheapest(
+        self,
+        fuel_type: str,
+        brand: str | None = None,
+        bounds: tuple[float, float, float, float] | None = None,
+        limit: int = 10,
+    ) -> list[dict[str, Any]]:
+        """Return the cheapest stations for a fuel type, cheapest first.
+
+        Args:
+            fuel_type: Normalized fuel type, e.g. "e10"
+            brand: Only stations of this brand (case insensitive)
+            bounds: Only stations inside this (south, west, north, east) box
+            limit: Maximum number of stations
+        """
+        query = [
+            "SELECT s.node_id, s.trading_name, s.brand, s.latitude, s.longitude, s.postcode,",
+            "p.price, p.updated FROM prices p JOIN stations s ON s.node_id = p.node_id",
+            "WHERE p.fuel_type = ?",
+        ]
+        params: list[Any] = [fuel_type]
+
+        if brand is not None:
+            query.append("AND s.brand = ? COLLATE NOCASE")
+            params.append(brand)
+
+        if bounds is not None:
+            south, west, north, east = bounds
+            cells = geohash_cells(bounds)
+            if cells is not None:
+                query.append(f"AND s.cell IN ({', '.join('?' * len(cells))})")
+                params.extend(sorted(cells))
+            query.append("AND s.latitude BETWEEN ? AND ? AND s.longitude BETWEEN ? AND ?")
+            params.extend((south, north, west, east))
+
+        query.append("ORDER BY p.price LIMIT ?")
+        params.append(limit)
+
+        with self._connect() as connection:
+            rows = connection.execute(" ".join(query), params).fetchall()
+        return [dict(row) for row in rows]
+
+    def find_cheapest(
+        self,
+        fuel_type: str,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        brand: str | None = None,
+        amenity: str | None = None,
+        limit: int = 10,
+        updated_since: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return the cheapest stations within a radius, cheapest first.
+
+        Candidates come from the geohash cells covering the circle, and are
+        read in price order until ``limit`` of them lie inside it.
+
+        Args:
+            fuel_type: Normalized fuel type, e.g. "e10"
+            latitude: Latitude of the centre
+            longitude: Longitude of the centre
+            radius_km: Search radius in km
+            brand: Only stations of this brand (case insensitive)
+            amenity: Only stations offering this amenity
+            limit: Maximum number of stations
+            updated_since: Leave out prices last updated before this time,
+                prices without an update time are kept
+        """
+        bounds = radius_bounds(latitude, longitude, radius_km)
+        south, west, north, east = bounds
+        query = [
+            "SELECT s.node_id, s.trading_name, s.brand, s.latitude, s.longitude, s.postcode,",
+            "s.is_supermarket, s.is_motorway, s.amenities, p.price, p.updated",
+            "FROM prices p JOIN stations s ON s.node_id = p.node_id",
+            "WHERE p.fuel_type = ?",
+            "AND s.latitude BETWEEN ? AND ? AND s.longitude BETWEEN ? AND ?",
+        ]
+        params: list[Any] = [fuel_type, south, north, west, east]
+
+        cells = geohash_cells(bounds)
+        if cells is not None:
+            query.append(f"AND s.cell IN ({', '.join('?' * len(cells))})")
+            params.extend(sorted(cells))
+
+        if brand is not None:
+            query.append("AND s.brand = ? COLLATE NOCASE")
+            params.append(brand)
+
+        if amenity is not None:
+            query.append("AND EXISTS (SELECT 1 FROM json_each(s.amenities) WHERE value = ?)")
+            params.append(amenity)
+
+        if updated_since is not None:
+            query.append("AND (p.updated IS NULL OR julianday(p.updated) >= julianday(?))")
+            params.append(updated_since.isoformat())
+
+        query.append("ORDER BY p.price")
+
+        results: list[dict[str, Any]] = []
+        with self._connect() as connection:
+            for row in connection.execute(" ".join(query), params):
+                distance = distance_km(latitude, longitude, row["latitude"], row["longitude"])
+                if distance > radius_km:
+                    continue
+                station = dict(row)
+                station["amenities"] = json.loads(station["amenities"] or "[]")
+                station["distance"] = distance
+                results.append(station)
+                if len(results) == limit:
+                    break
+        return results
+
+    def price_distribution(
+        self, area: str | None, county: str | None
+    ) -> dict[str, dict[str, list[float]]]:
+        """Return sorted prices by region and fuel type in one scan of the prices table.
+
+        Args:
+            area: Postcode area to collect, e.g. "SW"
+            county: County to collect (case insensitive)
+
+        Returns:
+            Sorted prices by region and fuel type, national prices include
+            stations without synced metadata
+        """
+        distribution: dict[str, dict[str, list[float]]] = {
+            REGION_AREA: {},
+            REGION_COUNTY: {},
+            REGION_NATIONAL: {},
+        }
+        county = county.casefold() if county else None
+
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT p.fuel_type, p.price, s.postcode, s.county FROM prices p "
+                "LEFT JOIN stations s ON s.node_id = p.node_id ORDER BY p.fuel_type, p.price"
+            )
+            for fuel_type, price, station_postcode, station_county in rows:
+                distribution[REGION_NATIONAL].setdefault(fuel_type, []).append(price)
+                if county and station_county and station_county.casefold() == county:
+                    distribution[REGION_COUNTY].setdefault(fuel_type, []).append(price)
+                if area and postcode_area(station_postcode) == area:
+                    distribution[REGION_AREA].setdefault(fuel_type, []).append(price)
+
+        return distribution
+
+    def stats(self) -> dict[str, Any]:
+        """Return row counts and the last metadata sync time."""
+        with self._connect() as connection:
+            stations = connection.execute("SELECT COUNT(*) FROM stations").fetchone()[0]
+            prices = connection.execute("SELECT COUNT(*) FROM prices").fetchone()[0]
+        return {
+            "stations": stations,
+            "prices": prices,
+            "metadata_synced": self.metadata_synced,
+        }
+
+
+def store_path(hass: HomeAssistant, environment: str) -> str:
+    """Return the database path for an API environment."""
+    return hass.config.path(STORE_FILENAME.format(domain=DOMAIN, environment=environment))
+
+
+async def async_get_station_store(hass: HomeAssistant, environment: str) -> StationStore:
+    """Return the station store shared by all config entries of an API environment."""
+    stores: dict[str, StationStore] = hass.data.setdefault(DATA_STATION_STORES, {})
+    if environment not in stores:
+        store = StationStore(store_path(hass, environment))
+        await hass.async_add_executor_job(store.setup)
+        # Another entry may have set up the same store while this one waited
+        stores.setdefault(environment, store)
+    return stores[environment]
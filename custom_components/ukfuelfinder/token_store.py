@@ -0,0 +1,109 @@
+"""Persistent OAuth token cache for UK Fuel Finder API clients."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.singleton import singleton
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_TOKEN_STORE = f"{DOMAIN}_token_store"
+STORAGE_KEY = f"{DOMAIN}.tokens"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10  # seconds
+
+
+class TokenStore:
+    """Keep OAuth tokens per client ID in Home Assistant storage.
+
+    Every ``FuelFinderClient`` starts without a token, so each restart,
+    reload and config flow validation would otherwise cost a token request.
+    Tokens are copied out of a client's authenticator after it has been used
+    and copied into new clients for the same client ID. The client itself
+    decides whether the restored token is still valid or needs refreshing.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the token store."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY, private=True
+        )
+        self._tokens: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load persisted tokens."""
+        self._tokens = await self._store.async_load() or {}
+
+    def restore(self, client: Any, client_id: str, environment: str) -> bool:
+        """Seed a client with the cached token for its client ID.
+
+        Returns:
+            True if a token was restored
+        """
+        token = self._tokens.get(client_id)
+        if not token or token.get("environment") != environment:
+            return False
+
+        # Nothing worth restoring once the access token is expired and
+        # there is no refresh token to renew it with
+        if token["expiry"] <= time.time() and not token.get("refresh_token"):
+            return False
+
+        authenticator = client.authenticator
+        authenticator._access_token = token["access_token"]
+        authenticator._refresh_token = token.get("refresh_token")
+        authenticator._token_expiry = token["expiry"]
+        _LOGGER.debug("Restored API token for %s", client_id)
+        return True
+
+    def capture(self, client: Any, client_id: str, environment: str) -> None:
+        """Save the client's current token if it changed."""
+        authenticator = client.authenticator
+        access_token = getattr(authenticator, "_access_token", None)
+        if not isinstance(access_token, str):
+            return
+
+        refresh_token = getattr(authenticator, "_refresh_token", None)
+        token = {
+            "environment": environment,
+            "access_token": access_token,
+            "refresh_token": refresh_token if isinstance(refresh_token, str) else None,
+            "expiry": float(authenticator._token_expiry),
+        }
+        if self._tokens.get(client_id) == token:
+            return
+
+        self._tokens[client_id] = token
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def forget(self, client_id: str) -> None:
+        """Drop the cached token, e.g. after the API rejected it."""
+        if self._tokens.pop(client_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @staticmethod
+    def reset(client: Any) -> None:
+        """Clear a client's token so its next request exchanges the credentials again."""
+        authenticator = client.authenticator
+        authenticator._access_token = None
+        authenticator._refresh_token = None
+        authenticator._token_expiry = 0
+
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        """Return data to persist."""
+        return self._tokens
+
+
+@singleton(DATA_TOKEN_STORE)
+async def async_get_token_store(hass: HomeAssistant) -> TokenStore:
+    """Return the token store shared by all config entries and flows."""
+    store = TokenStore(hass)
+    await store.async_load()
+    return store
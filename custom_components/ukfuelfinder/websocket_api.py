@@ -0,0 +1,217 @@
+"""WebSocket API for UK Fuel Finder."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import CONF_FUEL_TYPES, DOMAIN, FUEL_TYPES, SIGNAL_ENTRY_UNLOADED
+from .coordinator import UKFuelFinderCoordinator
+
+SORT_DISTANCE = "distance"
+SORT_PRICE = "price"
+SORT_NAME = "name"
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Station columns, followed by a price and a rank column per fuel type
+STATION_COLUMNS = ("station_id", "name", "brand", "latitude", "longitude", "distance_km")
+
+Row = tuple[Any, ...]
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the UK Fuel Finder WebSocket commands."""
+    websocket_api.async_register_command(hass, ws_stations)
+    websocket_api.async_register_command(hass, ws_subscribe_stations)
+
+
+def _coordinator(hass: HomeAssistant, entry_id: str | None) -> UKFuelFinderCoordinator | None:
+    """Return the coordinator of a config entry, or the first one loaded."""
+    coordinators = hass.data.get(DOMAIN, {})
+    if entry_id is not None:
+        return coordinators.get(entry_id)
+    return next(iter(coordinators.values()), None)
+
+
+def _columns(fuel_types: list[str]) -> list[str]:
+    """Return the table column names."""
+    return [
+        *STATION_COLUMNS,
+        *(f"price_{fuel_type}" for fuel_type in fuel_types),
+        *(f"rank_{fuel_type}" for fuel_type in fuel_types),
+    ]
+
+
+def _rows(coordinator: UKFuelFinderCoordinator, fuel_types: list[str]) -> dict[str, Row]:
+    """Build a table row per nearby station from the coordinator data."""
+    data = coordinator.data or {}
+    price_ranks = data.get("price_ranks", {})
+    rows = {}
+    for station_id, station in data.get("stations", {}).items():
+        info = station["info"]
+        ranks = price_ranks.get(station_id, {})
+        rows[station_id] = (
+            station_id,
+            info.get("trading_name"),
+            info.get("brand"),
+            info.get("latitude"),
+            info.get("longitude"),
+            round(station["distance"], 2),
+            *(station["prices"].get(fuel_type) for fuel_type in fuel_types),
+            *(ranks.get(fuel_type, {}).get("rank") for fuel_type in fuel_types),
+        )
+    return rows
+
+
+def _table(columns: list[str], rows: Iterable[Row]) -> dict[str, list[Any]]:
+    """Transpose rows into one list per column."""
+    values = list(zip(*rows))
+    return {
+        column: list(values[position]) if values else [] for position, column in enumerate(columns)
+    }
+
+
+def _fuel_types(coordinator: UKFuelFinderCoordinator) -> list[str]:
+    """Return the fuel types selected for the config entry."""
+    return list(coordinator.entry_data.get(CONF_FUEL_TYPES, FUEL_TYPES))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ukfuelfinder/stations",
+        vol.Optional("entry_id"): str,
+        vol.Optional("sort_by", default=SORT_DISTANCE): vol.In(
+            [SORT_DISTANCE, SORT_PRICE, SORT_NAME]
+        ),
+        vol.Optional("fuel_type"): vol.In(FUEL_TYPES),
+        vol.Optional("descending", default=False): bool,
+        vol.Optional("offset", default=0): vol.All(int, vol.Range(min=0)),
+        vol.Optional("limit", default=DEFAULT_PAGE_SIZE): vol.All(
+            int, vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
+    }
+)
+@callback
+def ws_stations(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return a page of the nearby station table, one list per column."""
+    coordinator = _coordinator(hass, msg.get("entry_id"))
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not found")
+        return
+
+    fuel_types = _fuel_types(coordinator)
+    columns = _columns(fuel_types)
+    sort_by = msg["sort_by"]
+    if sort_by == SORT_PRICE:
+        if msg.get("fuel_type") not in fuel_types:
+            connection.send_error(
+                msg["id"],
+                websocket_api.ERR_INVALID_FORMAT,
+                "Sorting by price needs one of the entry's fuel types",
+            )
+            return
+        position = columns.index(f"price_{msg['fuel_type']}")
+    else:
+        position = columns.index("distance_km" if sort_by == SORT_DISTANCE else "name")
+
+    rows = list(_rows(coordinator, fuel_types).values())
+    # Stations without a value go last in either direction
+    present = [row for row in rows if row[position] is not None]
+    missing = [row for row in rows if row[position] is None]
+    present.sort(key=lambda row: row[position], reverse=msg["descending"])
+    page = (present + missing)[msg["offset"] : msg["offset"] + msg["limit"]]
+
+    connection.send_result(
+        msg["id"],
+        {
+            "total": len(rows),
+            "offset": msg["offset"],
+            "fuel_types": fuel_types,
+            "columns": _table(columns, page),
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ukfuelfinder/subscribe_stations",
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def ws_subscribe_stations(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Send the full station table, then only changed and removed stations after each refresh.
+
+    The subscription ends with an error when the config entry unloads, so the
+    frontend can subscribe again to the reloaded entry.
+    """
+    coordinator = _coordinator(hass, msg.get("entry_id"))
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not found")
+        return
+
+    fuel_types = _fuel_types(coordinator)
+    columns = _columns(fuel_types)
+    sent = _rows(coordinator, fuel_types)
+
+    @callback
+    def _async_send_changes() -> None:
+        """Send the stations that changed since the last message."""
+        nonlocal sent
+        rows = _rows(coordinator, fuel_types)
+        changed = [row for station_id, row in rows.items() if sent.get(station_id) != row]
+        removed = [station_id for station_id in sent if station_id not in rows]
+        sent = rows
+        if changed or removed:
+            connection.send_message(
+                websocket_api.event_message(
+                    msg["id"], {"upserted": _table(columns, changed), "removed": removed}
+                )
+            )
+
+    @callback
+    def _async_entry_unloaded() -> None:
+        """End the subscription, the coordinator will not update again."""
+        if unsubscribe := connection.subscriptions.pop(msg["id"], None):
+            unsubscribe()
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry unloaded")
+
+    unsubs = [
+        coordinator.async_add_listener(_async_send_changes),
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_ENTRY_UNLOADED.format(coordinator.config_entry.entry_id),
+            _async_entry_unloaded,
+        ),
+    ]
+
+    @callback
+    def _async_unsubscribe() -> None:
+        """Stop listening to the coordinator and the entry."""
+        for unsub in unsubs:
+            unsub()
+
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"],
+            {
+                "fuel_types": fuel_types,
+                "upserted": _table(columns, sent.values()),
+                "removed": [],
+            },
+        )
+    )
@@ -1,7 +1,11 @@
 """Fixtures for UK Fuel Finder tests."""
 
+from unittest.mock import patch
+
 import pytest
 
+from tests.fake_api import FakeFuelFinderAPI
+
 pytest_plugins = "pytest_homeassistant_custom_component"
 
 
@@ -9,3 +13,36 @@ pytest_plugins = "pytest_homeassistant_custom_component"
 def auto_enable_custom_integrations(enable_custom_integrations):
     """Enable custom integrations."""
     return
+
+
+@pytest.fixture(autouse=True)
+def station_store_dir(tmp_path):
+    """Keep local station databases out of the shared test config directory."""
+    with patch(
+        "custom_components.ukfuelfinder.store.store_path",
+        side_effect=lambda hass, environment: str(tmp_path / f"{environment}.db"),
+    ):
+        yield tmp_path
+
+
+@pytest.fixture
+async def fake_api(socket_enabled):
+    """Run a local stand-in for the Fuel Finder API."""
+    api = FakeFuelFinderAPI()
+    await api.start()
+    yield api
+    await api.close()
+
+
+@pytest.fixture
+def fake_client(fake_api):
+    """Point every FuelFinderClient created by the integration at the API stand-in."""
+    from ukfuelfinder import FuelFinderClient
+
+    def client_factory(**kwargs):
+        client = FuelFinderClient(**kwargs)
+        fake_api.configure_client(client)
+        return client
+
+    with patch("ukfuelfinder.FuelFinderClient", side_effect=client_factory):
+        yield
@@ -0,0 +1,202 @@
+"""Local stand-in for the UK Fuel Finder API used by offline tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+API_PREFIX = "/api/v1"
+PAGE_SIZE = 500
+
+CLIENT_ID = "test_id"
+CLIENT_SECRET = "test_secret"
+
+
+def make_station(
+    node_id: str,
+    latitude: float,
+    longitude: float,
+    prices: dict[str, float],
+    updated: str | None = None,
+    **info: Any,
+) -> dict[str, Any]:
+    """Build a station as the API returns it from /pfs and /pfs/fuel-prices.
+
+    Prices are last updated an hour ago unless an update time is given.
+    """
+    if updated is None:
+        updated = (datetime.now(timezone.utc) - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    station_info = {
+        "node_id": node_id,
+        "mft_organisation_name": None,
+        "trading_name": f"Station {node_id}",
+        "public_phone_number": "01234567890",
+        "brand_name": "TestBrand",
+        "temporary_closure": False,
+        "permanent_closure": False,
+        "is_motorway_service_station": False,
+        "is_supermarket_service_station": False,
+        "location": {
+            "latitude": latitude,
+            "longitude": longitude,
+            "address_line_1": f"{node_id} High Street",
+            "city": "London",
+            "country": "England",
+            "county": "Greater London",
+            "postcode": "SW1A 1AA",
+        },
+        "amenities": [],
+        "opening_times": {},
+        "fuel_types": [fuel_type.upper() for fuel_type in prices],
+    }
+    station_info.update(info)
+    return {
+        "info": station_info,
+        "prices": {
+            "node_id": node_id,
+            "mft_organisation_name": None,
+            "trading_name": station_info["trading_name"],
+            "public_phone_number": station_info["public_phone_number"],
+            "fuel_prices": [
+                {
+                    "fuel_type": fuel_type.upper(),
+                    "price": f"{price:09.4f}",
+                    "price_last_updated": updated,
+                }
+                for fuel_type, price in prices.items()
+            ],
+        },
+    }
+
+
+class FakeFuelFinderAPI:
+    """aiohttp server speaking the subset of the Fuel Finder API the client uses.
+
+    Faults queued with ``inject_fault`` are served, in order, instead of the
+    next real responses, which lets tests exercise error handling offline.
+    ``latency`` delays every response, and the dataset can be any size (see
+    ``tests.synthetic`` for a national one), for load and soak tests.
+    """
+
+    def __init__(
+        self,
+        stations: list[dict[str, Any]] | None = None,
+        credentials: dict[str, str] | None = None,
+        latency: float = 0,
+    ) -> None:
+        """Initialize the stand-in server."""
+        self.stations = stations or []
+        self.credentials = credentials or {CLIENT_ID: CLIENT_SECRET}
+        self.latency = latency
+        self.faults: deque[tuple[str | None, int, dict[str, str]]] = deque()
+        self.requests: Counter[str] = Counter()
+        self.tokens_issued = 0
+        self.valid_tokens: set[str] = set()
+        self.server: TestServer | None = None
+
+        app = web.Application(middlewares=[self._fault_middleware])
+        app.router.add_post(f"{API_PREFIX}/oauth/generate_access_token", self._handle_token)
+        app.router.add_post(f"{API_PREFIX}/oauth/regenerate_access_token", self._handle_token)
+        app.router.add_get(f"{API_PREFIX}/pfs", self._handle_pfs)
+        app.router.add_get(f"{API_PREFIX}/pfs/fuel-prices", self._handle_prices)
+        self.app = app
+
+    @property
+    def base_url(self) -> str:
+        """Return the API base URL of the running server."""
+        assert self.server is not None
+        return str(self.server.make_url(API_PREFIX))
+
+    async def start(self) -> None:
+        """Start serving on a random local port."""
+        self.server = TestServer(self.app)
+        await self.server.start_server()
+
+    async def close(self) -> None:
+        """Stop the server."""
+        if self.server:
+            await self.server.close()
+
+    def inject_fault(
+        self,
+        status: int,
+        count: int = 1,
+        retry_after: int | None = None,
+        path: str | None = None,
+    ) -> None:
+        """Serve ``status`` for the next ``count`` requests, optionally only to ``path``."""
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+        self.faults.extend([(path, status, headers)] * count)
+
+    def configure_client(self, client: Any) -> None:
+        """Point a FuelFinderClient at this server instead of the real API."""
+        client.http_client.base_url = self.base_url
+        client.authenticator.token_url = f"{self.base_url}/oauth/generate_access_token"
+        client.authenticator.refresh_url = f"{self.base_url}/oauth/regenerate_access_token"
+        client.clear_cache()
+
+    @web.middleware
+    async def _fault_middleware(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        """Count requests, add latency and serve queued faults."""
+        path = request.path.removeprefix(API_PREFIX)
+        self.requests[path] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        for fault in self.faults:
+            fault_path, status, headers = fault
+            if fault_path in (None, path):
+                self.faults.remove(fault)
+                return web.json_response(
+                    {"error": "injected fault"}, status=status, headers=headers
+                )
+        return await handler(request)
+
+    async def _handle_token(self, request: web.Request) -> web.Response:
+        """Issue an access token for valid client credentials."""
+        body = await request.json()
+        if "refresh_token" not in body and (
+            self.credentials.get(body.get("client_id")) != body.get("client_secret")
+            or body.get("client_secret") is None
+        ):
+            return web.json_response({"error": "invalid_client"}, status=401)
+
+        self.tokens_issued += 1
+        self.valid_tokens.add(f"token-{self.tokens_issued}")
+        return web.json_response(
+            {
+                "data": {
+                    "access_token": f"token-{self.tokens_issued}",
+                    "refresh_token": f"refresh-{self.tokens_issued}",
+                    "expires_in": 3600,
+                }
+            }
+        )
+
+    def _authorized(self, request: web.Request) -> bool:
+        """Return True if the request carries a token issued by this server."""
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        return token in self.valid_tokens
+
+    def _page(self, request: web.Request, key: str) -> list[dict[str, Any]]:
+        """Return one page of station records."""
+        batch = int(request.query.get("batch-number", 1))
+        start = (batch - 1) * PAGE_SIZE
+        return [station[key] for station in self.stations[start : start + PAGE_SIZE]]
+
+    async def _handle_pfs(self, request: web.Request) -> web.Response:
+        """Serve a page of station information."""
+        if not self._authorized(request):
+            return web.json_response({"error": "unauthorized"}, status=401)
+        return web.json_response({"data": self._page(request, "info")})
+
+    async def _handle_prices(self, request: web.Request) -> web.Response:
+        """Serve a page of station prices."""
+        if not self._authorized(request):
+            return web.json_response({"error": "unauthorized"}, status=401)
+        return web.json_response({"data": self._page(request, "prices")})
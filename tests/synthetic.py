@@ -0,0 +1,140 @@
+"""Synthetic national Fuel Finder dataset for benchmarks and load tests."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from tests.fake_api import PAGE_SIZE, make_station
+
+# Roughly the number of forecourts reporting to Fuel Finder
+NATIONAL_STATIONS = 8500
+
+# Fuel type -> (share of stations selling it, low price, high price) in pence
+SYNTHETIC_FUEL_TYPES = {
+    "e10": (0.98, 128.9, 149.9),
+    "e5": (0.70, 138.9, 164.9),
+    "b7": (0.97, 134.9, 156.9),
+    "b7_standard": (0.30, 134.9, 154.9),
+    "b7_premium": (0.40, 146.9, 172.9),
+    "lpg": (0.10, 74.9, 89.9),
+}
+
+# Towns stations cluster around: (latitude, longitude, share of clustered stations)
+TOWNS = [
+    (51.5074, -0.1278, 0.15),  # London
+    (52.4862, -1.8904, 0.10),  # Birmingham
+    (53.4808, -2.2426, 0.10),  # Manchester
+    (53.8008, -1.5491, 0.07),  # Leeds
+    (55.8642, -4.2518, 0.07),  # Glasgow
+    (53.4084, -2.9916, 0.06),  # Liverpool
+    (51.4545, -2.5879, 0.06),  # Bristol
+    (55.9533, -3.1883, 0.06),  # Edinburgh
+    (51.4816, -3.1791, 0.05),  # Cardiff
+    (54.9783, -1.6178, 0.05),  # Newcastle
+    (52.9548, -1.1581, 0.04),  # Nottingham
+    (50.9097, -1.4044, 0.04),  # Southampton
+]
+
+# Share of stations clustered around towns, the rest are spread over Great Britain
+CLUSTERED_SHARE = 0.6
+TOWN_SPREAD = 0.12  # degrees, standard deviation around a town centre
+BOUNDS = ((50.0, 58.6), (-5.7, 1.7))  # (latitude range, longitude range)
+
+BRANDS = [
+    "Esso",
+    "Shell",
+    "BP",
+    "Texaco",
+    "Jet",
+    "Gulf",
+    "Tesco",
+    "Asda",
+    "Sainsbury's",
+    "Morrisons",
+]
+SUPERMARKETS = {"Tesco", "Asda", "Sainsbury's", "Morrisons"}
+AMENITIES = ["car_wash", "shop", "toilets", "air_and_water", "ev_charging", "atm"]
+
+
+def _location(rng: random.Random) -> tuple[float, float]:
+    """Pick a station location, clustered around towns like the real network."""
+    if rng.random() < CLUSTERED_SHARE:
+        latitude, longitude, _ = rng.choices(TOWNS, weights=[town[2] for town in TOWNS])[0]
+        return rng.gauss(latitude, TOWN_SPREAD), rng.gauss(longitude, TOWN_SPREAD * 1.6)
+    (lat_low, lat_high), (lon_low, lon_high) = BOUNDS
+    return rng.uniform(lat_low, lat_high), rng.uniform(lon_low, lon_high)
+
+
+def synthetic_stations(count: int = NATIONAL_STATIONS, seed: int = 1) -> list[dict[str, Any]]:
+    """Build a reproducible national dataset in the API's /pfs and /pfs/fuel-prices shape."""
+    rng = random.Random(seed)
+    # Prices updated over the last four weeks, within the default max price age
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    stations = []
+
+    for index in range(count):
+        latitude, longitude = _location(rng)
+        prices = {
+            fuel_type: round(rng.uniform(low, high), 1)
+            for fuel_type, (share, low, high) in SYNTHETIC_FUEL_TYPES.items()
+            if rng.random() < share
+        }
+        brand = rng.choice(BRANDS)
+        stations.append(
+            make_station(
+                f"{index:08d}",
+                round(latitude, 6),
+                round(longitude, 6),
+                prices,
+                updated=(
+                    now - timedelta(days=rng.randint(0, 27), hours=rng.randint(0, 23))
+                ).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                brand_name=brand,
+                trading_name=f"{brand} {index}",
+                is_supermarket_service_station=brand in SUPERMARKETS,
+                is_motorway_service_station=rng.random() < 0.05,
+                amenities=rng.sample(AMENITIES, rng.randint(0, len(AMENITIES))),
+            )
+        )
+
+    return stations
+
+
+def synthetic_models(stations: list[dict[str, Any]]) -> tuple[list[Any], list[Any]]:
+    """Parse a synthetic dataset into the client's PFSInfo and PFS models."""
+    from ukfuelfinder.models import PFS, PFSInfo
+
+    infos = [PFSInfo.from_dict(station["info"]) for station in stations]
+    prices = [PFS.from_dict(station["prices"]) for station in stations]
+    return infos, prices
+
+
+def search(
+    infos: list[Any], latitude: float, longitude: float, radius_km: float
+) -> list[tuple[float, Any]]:
+    """Filter stations by distance the way ``FuelFinderClient.search_by_location`` does."""
+    from ukfuelfinder import FuelFinderClient
+
+    nearby = []
+    for info in infos:
+        distance = FuelFinderClient._haversine(
+            longitude, latitude, info.location.longitude, info.location.latitude
+        )
+        if distance <= radius_km:
+            nearby.append((distance, info))
+    nearby.sort(key=lambda result: result[0])
+    return nearby
+
+
+def paged(records: list[Any]) -> Callable[..., list[Any]]:
+    """Serve records a page at a time like ``FuelFinderClient.get_all_pfs_prices``."""
+
+    def get_page(batch_number: int | None = None, *args: Any, **kwargs: Any) -> list[Any]:
+        if batch_number is None:
+            return records
+        start = (batch_number - 1) * PAGE_SIZE
+        return records[start : start + PAGE_SIZE]
+
+    return get_page
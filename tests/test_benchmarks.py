@@ -0,0 +1,159 @@
+"""Benchmarks against a synthetic national dataset.
+
+Each benchmark fails if its mean exceeds a budget in BUDGETS. Budgets are
+deliberately generous so slow CI runners pass; scale them with the
+UKFUELFINDER_BENCHMARK_SCALE environment variable (e.g. 0.5 to tighten)
+or compare against a saved run with ``--benchmark-compare-fail``.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ukfuelfinder.const import DOMAIN, FUEL_TYPES
+from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
+from custom_components.ukfuelfinder.sensor import async_setup_entry
+from tests.synthetic import paged, search, synthetic_models, synthetic_stations
+
+pytest.importorskip("pytest_benchmark")
+
+LATITUDE = 51.5074
+LONGITUDE = -0.1278
+RADII = [1, 5, 25, 50]
+ROUNDS = 5
+
+# Budget for the mean of each benchmark in seconds
+BUDGETS = {
+    "update_data": 1.0,
+    "get_cheapest_fuel": 0.001,
+    "check_new_stations": 0.05,
+    "attributes": 0.5,
+}
+BUDGET_SCALE = float(os.environ.get("UKFUELFINDER_BENCHMARK_SCALE", "1.0"))
+
+
+@pytest.fixture(scope="module")
+def national_dataset():
+    """Parse the synthetic national dataset once for all benchmarks."""
+    return synthetic_models(synthetic_stations())
+
+
+def _entry_data(radius):
+    """Return config entry data for a search radius."""
+    return {
+        "client_id": "test_id",
+        "client_secret": "test_secret",
+        "environment": "test",
+        "latitude": LATITUDE,
+        "longitude": LONGITUDE,
+        "radius": radius,
+        "update_interval": 30,
+    }
+
+
+def _assert_within_budget(benchmark, name):
+    """Fail if the benchmark mean exceeds its budget."""
+    if benchmark.stats is None:
+        return  # --benchmark-disable runs the code once without timing
+    budget = BUDGETS[name] * BUDGET_SCALE
+    mean = benchmark.stats.stats.mean
+    assert mean <= budget, f"{name} took {mean:.4f}s on average, budget is {budget:.4f}s"
+
+
+@pytest.fixture
+def coordinator_factory(hass, national_dataset):
+    """Create coordinators whose client serves the synthetic dataset."""
+    infos, prices = national_dataset
+    coordinators = []
+
+    def factory(radius):
+        nearby = search(infos, LATITUDE, LONGITUDE, radius)
+        with patch("ukfuelfinder.FuelFinderClient") as mock_client:
+            mock_instance = mock_client.return_value
+            mock_instance.authenticator.get_token = lambda: "token"
+            mock_instance.search_by_location = lambda *args, **kwargs: nearby
+            mock_instance.get_all_pfs_prices = paged(prices)
+            coordinator = UKFuelFinderCoordinator(hass, _entry_data(radius))
+        coordinator.data = hass.loop.run_until_complete(coordinator._async_update_data())
+        coordinators.append(coordinator)
+        return coordinator
+
+    yield factory
+
+    for coordinator in coordinators:
+        hass.loop.run_until_complete(coordinator.async_shutdown())
+
+
+def _setup_sensors(hass, coordinator):
+    """Set up the sensor platform and return its entities and update listener."""
+    entry = MockConfigEntry(domain=DOMAIN, data=coordinator.entry_data)
+    entry.add_to_hass(hass)
+    coordinator.config_entry = entry
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+    entities = []
+    listeners = []
+    with patch.object(coordinator, "async_add_listener", side_effect=listeners.append):
+        hass.loop.run_until_complete(async_setup_entry(hass, entry, entities.extend))
+    return entities, listeners[0]
+
+
+@pytest.mark.parametrize("radius", RADII)
+def test_benchmark_update_data(hass, benchmark, coordinator_factory, radius):
+    """Benchmark a full refresh: download, join, cheapest and device cleanup."""
+    coordinator = coordinator_factory(radius)
+
+    def reset():
+        # Defeat refresh coalescing so every round hits the (mocked) API
+        coordinator._last_fetch = None
+
+    data = benchmark.pedantic(
+        lambda: hass.loop.run_until_complete(coordinator._async_update_data()),
+        setup=reset,
+        rounds=ROUNDS,
+        warmup_rounds=1,
+    )
+
+    assert len(data["stations"]) == len(coordinator.client.search_by_location())
+    _assert_within_budget(benchmark, "update_data")
+
+
+@pytest.mark.parametrize("radius", RADII)
+def test_benchmark_get_cheapest_fuel(benchmark, coordinator_factory, radius):
+    """Benchmark cheapest price lookups for every fuel type."""
+    coordinator = coordinator_factory(radius)
+
+    cheapest = benchmark(lambda: [coordinator.get_cheapest_fuel(fuel) for fuel in FUEL_TYPES])
+
+    assert cheapest[0] is not None
+    _assert_within_budget(benchmark, "get_cheapest_fuel")
+
+
+@pytest.mark.parametrize("radius", RADII)
+def test_benchmark_check_new_stations(hass, benchmark, coordinator_factory, radius):
+    """Benchmark the per-refresh check for new stations once sensors exist."""
+    coordinator = coordinator_factory(radius)
+    entities, check_new_stations = _setup_sensors(hass, coordinator)
+    created = len(entities)
+
+    benchmark.pedantic(check_new_stations, rounds=ROUNDS * 4, warmup_rounds=1)
+
+    assert len(entities) == created
+    _assert_within_budget(benchmark, "check_new_stations")
+
+
+@pytest.mark.parametrize("radius", RADII)
+def test_benchmark_attributes(hass, benchmark, coordinator_factory, radius):
+    """Benchmark state and attribute generation for every sensor after a refresh."""
+    coordinator = coordinator_factory(radius)
+    entities, _ = _setup_sensors(hass, coordinator)
+
+    def render():
+        return [(entity.native_value, entity.extra_state_attributes) for entity in entities]
+
+    states = benchmark.pedantic(render, rounds=ROUNDS, warmup_rounds=1)
+
+    assert len(states) == len(entities)
+    _assert_within_budget(benchmark, "attributes")
@@ -0,0 +1,108 @@
+"""Test the price drop and spike binary sensors."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from custom_components.ukfuelfinder.binary_sensor import (
+    PRICE_MOVE_SENSORS,
+    UKFuelFinderPriceMoveSensor,
+)
+from custom_components.ukfuelfinder.price_changes import CheapestWindow, PriceMoveTracker
+
+START = datetime(2026, 2, 8, 12, 0, tzinfo=timezone.utc)
+
+
+def _change(station_id, fuel_type, old_price, new_price):
+    """Build a price change as reported by the price snapshot."""
+    return {
+        "station_id": station_id,
+        "station_name": f"Station {station_id}",
+        "fuel_type": fuel_type,
+        "old_price": old_price,
+        "new_price": new_price,
+        "price_last_updated": None,
+    }
+
+
+def test_cheapest_window_expires_samples():
+    """Test the window low and high follow samples in and out of the window."""
+    window = CheapestWindow(timedelta(hours=2))
+
+    window.add(START, 140.0)
+    window.add(START + timedelta(hours=1), 145.0)
+    window.add(START + timedelta(hours=2), 142.0)
+    assert (window.low, window.high) == (140.0, 145.0)
+
+    window.add(START + timedelta(hours=3), 143.0)
+    assert (window.low, window.high) == (142.0, 145.0)
+
+    window.add(START + timedelta(hours=4), 141.0)
+    assert (window.low, window.high) == (141.0, 143.0)
+
+
+def test_tracker_flags_drops_and_spikes():
+    """Test station moves and cheapest price moves against the threshold."""
+    tracker = PriceMoveTracker(3.0, timedelta(hours=24))
+
+    moves = tracker.update(START, {"e10": {"price": 140.0}}, [])
+    assert moves["e10"]["drop"] is False
+    assert moves["e10"]["spike"] is False
+    assert moves["e10"]["cheapest_change"] is None
+
+    # One station drops 4p, another rises 1p, cheapest is unchanged
+    moves = tracker.update(
+        START + timedelta(minutes=30),
+        {"e10": {"price": 140.0}, "b7": {"price": 150.0}},
+        [_change("1", "e10", 149.9, 145.9), _change("2", "e10", 146.9, 147.9)],
+    )
+    assert moves["e10"]["drop"] is True
+    assert moves["e10"]["spike"] is False
+    assert [change["station_id"] for change in moves["e10"]["dropped"]] == ["1"]
+    assert moves["e10"]["dropped"][0]["change"] == -4.0
+    assert moves["b7"]["drop"] is False
+
+    # The cheapest creeps up by 2p twice, a spike against the window low
+    tracker.update(START + timedelta(hours=1), {"e10": {"price": 142.0}}, [])
+    moves = tracker.update(START + timedelta(hours=2), {"e10": {"price": 144.0}}, [])
+    assert moves["e10"]["cheapest_change"] == 2.0
+    assert moves["e10"]["spike"] is True
+    assert (moves["e10"]["window_low"], moves["e10"]["window_high"]) == (140.0, 144.0)
+
+    # A day later the low has left the window
+    moves = tracker.update(START + timedelta(hours=26), {"e10": {"price": 144.0}}, [])
+    assert moves["e10"]["spike"] is False
+    assert moves["e10"]["window_low"] == 144.0
+
+
+async def test_price_move_sensor(hass):
+    """Test the sensor state and attributes come from the coordinator's price moves."""
+    coordinator = MagicMock(spec=DataUpdateCoordinator)
+    coordinator.last_update_success = True
+    coordinator.config_entry = MagicMock(entry_id="entry")
+    coordinator.price_moves = PriceMoveTracker(3.0, timedelta(hours=24))
+    coordinator.data = {
+        "price_moves": {
+            "e10": coordinator.price_moves.update(
+                START, {"e10": {"price": 140.0}}, [_change("1", "e10", 149.9, 145.9)]
+            )["e10"]
+        }
+    }
+
+    drop, spike = (
+        UKFuelFinderPriceMoveSensor(coordinator, "e10", description)
+        for description in PRICE_MOVE_SENSORS
+    )
+    assert drop.unique_id == "entry_price_drop_e10"
+    assert drop.name == "E10 Price Drop"
+    assert drop.is_on is True
+    assert drop.extra_state_attributes["stations"][0]["station_id"] == "1"
+    assert drop.extra_state_attributes["threshold"] == 3.0
+    assert drop.extra_state_attributes["window_hours"] == 24
+    assert spike.is_on is False
+    assert spike.extra_state_attributes["stations"] == []
+
+    b7_drop = UKFuelFinderPriceMoveSensor(coordinator, "b7", PRICE_MOVE_SENSORS[0])
+    assert b7_drop.is_on is False
+    assert b7_drop.extra_state_attributes["cheapest_price"] is None
@@ -279,3 +279,88 @@ async def test_cheapest_sensor_includes_timestamp(hass, mock_coordinator_with_pr
 
     assert "price_last_updated" in attrs
     assert attrs["price_last_updated"] == test_timestamp.isoformat()
+
+
+async def test_filtered_cheapest_in_one_pass(hass, mock_coordinator_with_prices):
+    """Test configured filters pick the cheapest among their stations alongside the overall one."""
+    from custom_components.ukfuelfinder.cheapest_filters import brands_key, cheapest_filters
+    from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
+    from custom_components.ukfuelfinder.station_index import StationIndex
+
+    stations = mock_coordinator_with_prices.data["stations"]
+    filters = cheapest_filters(
+        {
+            "cheapest_filters": ["supermarket", "no_motorway", "open"],
+            "cheapest_brands": " TestBrand2 , ",
+            "cheapest_amenity": "adblue_at_pump",
+        }
+    )
+    assert [cheapest_filter.key for cheapest_filter in filters] == [
+        "supermarket",
+        "no_motorway",
+        "open",
+        brands_key(("TestBrand2",)),
+        "amenity_adblue_at_pump",
+    ]
+    assert filters[3].name == "TestBrand2"
+    assert filters[4].name == "With Adblue At Pump"
+
+    index = StationIndex.build(stations)
+    station_sets = {
+        cheapest_filter.key: cheapest_filter.select(index) for cheapest_filter in filters
+    }
+    cheapest, filtered = UKFuelFinderCoordinator._find_cheapest_by_filter(stations, station_sets)
+
+    assert cheapest == UKFuelFinderCoordinator._find_cheapest(stations)
+    assert cheapest["e10"]["station_id"] == "station1"
+    assert filtered["supermarket"]["e10"]["station_id"] == "station1"
+    assert "e5" not in filtered["supermarket"]
+    assert set(filtered["no_motorway"]) == {"e10", "b7"}
+    assert filtered["open"]["e10"]["station_id"] == "station1"
+    # Only the more expensive station matches the brand and amenity filters
+    assert filtered[filters[3].key]["e10"]["station_id"] == "station2"
+    assert filtered["amenity_adblue_at_pump"]["e5"]["price"] == 160.9
+
+
+def test_brand_filter_key_follows_brand_list():
+    """Test the brand filter key, and so the sensor unique ID, changes with the brands."""
+    from custom_components.ukfuelfinder.cheapest_filters import cheapest_filters
+
+    def key(brands):
+        return cheapest_filters({"cheapest_brands": brands})[0].key
+
+    assert key("Tesco, Asda") == key("asda,TESCO, Tesco")
+    assert key("Tesco, Asda") != key("Tesco")
+    assert key("Tesco").startswith("brands_")
+
+
+async def test_filtered_cheapest_sensor(hass, mock_coordinator_with_prices):
+    """Test the filtered sensor asks the coordinator for its filter's cheapest station."""
+    from custom_components.ukfuelfinder.cheapest_filters import PRESET_FILTERS
+    from custom_components.ukfuelfinder.sensor import UKFuelFinderFilteredCheapestSensor
+
+    stations = mock_coordinator_with_prices.data["stations"]
+    requested = []
+
+    def get_cheapest_fuel(fuel_type, filter_key=None):
+        requested.append((fuel_type, filter_key))
+        return {
+            "station_id": "station1",
+            "price": 145.9,
+            **stations["station1"]["info"],
+            "distance": 2.5,
+        }
+
+    mock_coordinator_with_prices.get_cheapest_fuel = get_cheapest_fuel
+
+    mock_coordinator_with_prices.config_entry = MagicMock(entry_id="entry")
+
+    sensor = UKFuelFinderFilteredCheapestSensor(
+        mock_coordinator_with_prices, "e10", PRESET_FILTERS["no_motorway"]
+    )
+    assert sensor.unique_id == "entry_cheapest_no_motorway_e10"
+    assert sensor.coordinator_context == "no_motorway"
+    assert sensor.name == "Cheapest E10 Off Motorway"
+    assert sensor.native_value == 1.459
+    assert sensor.extra_state_attributes["station_id"] == "station1"
+    assert set(requested) == {("e10", "no_motorway")}
@@ -0,0 +1,158 @@
+"""Test the circuit breaker and backoff against a fault-injecting API stand-in."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.ukfuelfinder.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+from custom_components.ukfuelfinder.const import MAX_POLL_PHASE_OFFSET
+from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
+from tests.fake_api import CLIENT_ID, CLIENT_SECRET, make_station
+
+ENTRY_DATA = {
+    "client_id": CLIENT_ID,
+    "client_secret": CLIENT_SECRET,
+    "environment": "test",
+    "latitude": 51.5074,
+    "longitude": -0.1278,
+    "radius": 5.0,
+    "update_interval": 30,
+}
+
+
+@pytest.fixture
+async def coordinator(hass, fake_api):
+    """Coordinator with a real client talking to the stand-in API."""
+    fake_api.stations = [
+        make_station("1001", 51.5080, -0.1280, {"e10": 139.9, "b7": 149.9}),
+        make_station("1002", 51.5200, -0.1000, {"e10": 137.9}),
+    ]
+    coordinator = UKFuelFinderCoordinator(hass, ENTRY_DATA)
+    fake_api.configure_client(coordinator.client)
+    yield coordinator
+    await coordinator.async_shutdown()
+
+
+def test_backoff_grows_with_jitter():
+    """Test delays double per failure, stay within jitter bounds and are capped."""
+    breaker = CircuitBreaker(timedelta(minutes=30), max_delay=timedelta(hours=2))
+
+    for failures, floor in enumerate([30, 60, 120, 120], start=1):
+        delay = breaker.record_failure()
+        assert breaker.failures == failures
+        assert (
+            timedelta(minutes=floor)
+            <= delay
+            <= min(timedelta(minutes=floor * 2), timedelta(hours=2))
+        )
+
+
+def test_first_retry_not_sooner_than_update_interval():
+    """Test jitter only ever pushes the first retry past the normal poll."""
+    for jitter in (0.0, 0.5, 0.999):
+        breaker = CircuitBreaker(timedelta(minutes=30))
+        with patch(
+            "custom_components.ukfuelfinder.circuit_breaker.random.random", return_value=jitter
+        ):
+            delay = breaker.record_failure()
+        assert delay >= timedelta(minutes=30)
+
+
+def test_breaker_opens_after_threshold(freezer):
+    """Test the breaker opens after consecutive failures and probes after backoff."""
+    breaker = CircuitBreaker(timedelta(minutes=30), threshold=2)
+
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow_request()
+
+    delay = breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow_request()
+
+    freezer.tick(delay + timedelta(seconds=1))
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.failures == 0
+
+
+def test_retry_after_opens_immediately():
+    """Test a Retry-After opens the breaker for at least that long."""
+    breaker = CircuitBreaker(timedelta(minutes=5))
+
+    delay = breaker.record_failure(retry_after=3600)
+
+    assert delay == timedelta(seconds=3600)
+    assert breaker.state == STATE_OPEN
+
+
+async def test_server_errors_open_breaker(hass, fake_api, coordinator, freezer):
+    """Test repeated server errors back off and stop hitting the API."""
+    # Station search and price download run concurrently, fail both of them
+    fake_api.inject_fault(500, count=20)
+
+    for _ in range(3):
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+    fake_api.faults.clear()
+
+    assert coordinator.breaker.state == STATE_OPEN
+    assert coordinator.update_interval > coordinator.base_update_interval
+
+    # While open, refreshes are rejected without touching the API
+    requests_before = sum(fake_api.requests.values())
+    with pytest.raises(UpdateFailed, match="API unavailable"):
+        await coordinator._async_update_data()
+    assert sum(fake_api.requests.values()) == requests_before
+
+    # Once the backoff has elapsed a probe goes through and closes the breaker
+    freezer.move_to(coordinator.breaker.open_until + timedelta(seconds=1))
+    data = await coordinator._async_update_data()
+
+    assert set(data["stations"]) == {"1001", "1002"}
+    assert coordinator.breaker.state == STATE_CLOSED
+    assert (
+        coordinator.base_update_interval
+        <= coordinator.update_interval
+        <= coordinator.base_update_interval + timedelta(seconds=MAX_POLL_PHASE_OFFSET)
+    )
+
+
+async def test_rate_limit_honours_retry_after(hass, fake_api, coordinator):
+    """Test a 429 with Retry-After holds off the next attempt for that long."""
+    await hass.async_add_executor_job(coordinator.client.authenticator.get_token)
+    fake_api.inject_fault(429, count=6, retry_after=900)
+
+    # The client retries 429s itself, skip its sleeps
+    with patch("ukfuelfinder.rate_limiter.RateLimiter.handle_rate_limit_error"):
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+
+    assert coordinator.breaker.state == STATE_OPEN
+    assert coordinator.update_interval >= timedelta(seconds=900)
+
+
+async def test_first_poll_has_phase_offset(hass, fake_api, coordinator):
+    """Test only the first scheduled poll is shifted by the random phase offset."""
+    with patch("custom_components.ukfuelfinder.coordinator.random.uniform", return_value=120.0):
+        coordinator = UKFuelFinderCoordinator(hass, ENTRY_DATA)
+    fake_api.configure_client(coordinator.client)
+
+    await coordinator._async_update_data()
+    assert coordinator.update_interval == coordinator.base_update_interval + timedelta(seconds=120)
+
+    coordinator._last_fetch = None
+    await coordinator._async_update_data()
+    assert coordinator.update_interval == coordinator.base_update_interval
+
+    await coordinator.async_shutdown()
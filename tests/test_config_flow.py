@@ -44,3 +44,52 @@ async def test_user_flow_success(hass):
 
         assert result["type"] == FlowResultType.CREATE_ENTRY
         assert result["title"] == "UK Fuel Finder"
+
+
+USER_INPUT = {
+    CONF_CLIENT_ID: "test_id",
+    CONF_CLIENT_SECRET: "test_secret",
+    "environment": "test",
+    CONF_LATITUDE: 51.5074,
+    CONF_LONGITUDE: -0.1278,
+    "radius": 5.0,
+    "update_interval": 30,
+}
+
+
+async def test_user_flow_validates_with_token_only(hass, fake_api, fake_client):
+    """Test validation requests a token without downloading station data."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    with patch("custom_components.ukfuelfinder.async_setup_entry", return_value=True):
+        result = await hass.config_entries.flow.async_configure(result["flow_id"], USER_INPUT)
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert fake_api.tokens_issued == 1
+    assert set(fake_api.requests) == {"/oauth/generate_access_token"}
+
+
+@pytest.mark.parametrize(
+    ("client_secret", "status", "error"),
+    [
+        ("wrong_secret", None, "invalid_auth"),
+        ("test_secret", 500, "cannot_connect"),
+    ],
+)
+async def test_user_flow_validation_errors(
+    hass, fake_api, fake_client, client_secret, status, error
+):
+    """Test bad credentials and API errors are reported separately."""
+    if status:
+        fake_api.inject_fault(status)
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {**USER_INPUT, CONF_CLIENT_SECRET: client_secret}
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": error}
@@ -1,5 +1,6 @@
 """Test UK Fuel Finder coordinator."""
 
+import asyncio
 from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
@@ -8,7 +9,7 @@ from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import UpdateFailed
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.ukfuelfinder.const import DOMAIN
+from custom_components.ukfuelfinder.const import DOMAIN, MIN_REFRESH_SPACING, PRICE_PAGE_SIZE
 from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
 
 
@@ -61,7 +62,7 @@ async def test_coordinator_update_success(hass, mock_station_data):
     with patch("ukfuelfinder.FuelFinderClient") as mock_client:
         mock_instance = mock_client.return_value
         mock_instance.search_by_location = lambda *args, **kwargs: nearby_stations
-        mock_instance.get_all_pfs_prices = lambda: prices
+        mock_instance.get_all_pfs_prices = lambda *args, **kwargs: prices
 
         coordinator = UKFuelFinderCoordinator(hass, entry_data)
 
@@ -139,3 +140,272 @@ async def test_coordinator_network_error(hass):
 
         with pytest.raises(UpdateFailed):
             await coordinator._async_update_data()
+
+
+async def test_coordinator_processing_error_backs_off(hass, mock_station_data):
+    """Test an unexpected error after the fetch fails the update and backs off."""
+    nearby_stations, prices = mock_station_data
+
+    entry_data = {
+        "client_id": "test_id",
+        "client_secret": "test_secret",
+        "environment": "test",
+        "latitude": 51.5074,
+        "longitude": -0.1278,
+        "radius": 5.0,
+        "update_interval": 30,
+    }
+
+    with patch("ukfuelfinder.FuelFinderClient") as mock_client:
+        mock_instance = mock_client.return_value
+        mock_instance.search_by_location = lambda *args, **kwargs: nearby_stations
+        mock_instance.get_all_pfs_prices = lambda *args, **kwargs: prices
+
+        coordinator = UKFuelFinderCoordinator(hass, entry_data)
+
+        with (
+            patch(
+                "custom_components.ukfuelfinder.coordinator.price_freshness",
+                side_effect=TypeError("can't subtract offset-naive and offset-aware datetimes"),
+            ),
+            pytest.raises(UpdateFailed, match="Error processing data"),
+        ):
+            await coordinator._async_update_data()
+
+        assert coordinator.breaker.failures == 1
+        assert coordinator.update_interval >= coordinator.base_update_interval
+
+
+async def test_coordinator_coalesces_concurrent_refreshes(hass, mock_station_data):
+    """Test overlapping refreshes share a single API fetch."""
+    nearby_stations, prices = mock_station_data
+
+    entry_data = {
+        "client_id": "test_id",
+        "client_secret": "test_secret",
+        "environment": "test",
+        "latitude": 51.5074,
+        "longitude": -0.1278,
+        "radius": 5.0,
+        "update_interval": 30,
+    }
+
+    with patch("ukfuelfinder.FuelFinderClient") as mock_client:
+        mock_instance = mock_client.return_value
+        mock_instance.search_by_location = MagicMock(return_value=nearby_stations)
+        mock_instance.get_all_pfs_prices = MagicMock(return_value=prices)
+
+        coordinator = UKFuelFinderCoordinator(hass, entry_data)
+
+        results = await asyncio.gather(
+            coordinator._async_update_data(),
+            coordinator._async_update_data(),
+            coordinator._async_update_data(),
+        )
+
+        assert mock_instance.search_by_location.call_count == 1
+        assert mock_instance.get_all_pfs_prices.call_count == 1
+        assert results[0] is results[1] is results[2]
+        assert coordinator.coalesced_refreshes == 2
+
+
+async def test_coordinator_pages_through_prices(hass, mock_station_data):
+    """Test prices are downloaded page by page and only nearby stations are kept."""
+    nearby_stations, prices = mock_station_data
+
+    entry_data = {
+        "client_id": "test_id",
+        "client_secret": "test_secret",
+        "environment": "test",
+        "latitude": 51.5074,
+        "longitude": -0.1278,
+        "radius": 5.0,
+        "update_interval": 30,
+    }
+
+    far_away = []
+    for index in range(PRICE_PAGE_SIZE + 10):
+        pfs = MagicMock()
+        pfs.node_id = f"far_{index}"
+        pfs.fuel_prices = prices[0].fuel_prices
+        far_away.append(pfs)
+    # The nearby station is on the last, short page
+    pages = [far_away[:PRICE_PAGE_SIZE], far_away[PRICE_PAGE_SIZE:] + prices]
+
+    with patch("ukfuelfinder.FuelFinderClient") as mock_client:
+        mock_instance = mock_client.return_value
+        mock_instance.search_by_location = MagicMock(return_value=nearby_stations)
+        mock_instance.get_all_pfs_prices = MagicMock(side_effect=pages)
+
+        coordinator = UKFuelFinderCoordinator(hass, entry_data)
+        data = await coordinator._async_update_data()
+
+        assert [call.args for call in mock_instance.get_all_pfs_prices.call_args_list] == [
+            (1,),
+            (2,),
+        ]
+        assert list(data["stations"]) == ["12345"]
+        assert data["stations"]["12345"]["prices"] == {"unleaded": 145.9}
+        assert coordinator._last_good["prices"].keys() == {"12345"}
+        assert coordinator.metrics.last["price_records"] == len(far_away) + 1
+
+
+async def test_coordinator_enforces_minimum_refresh_spacing(hass, mock_station_data, freezer):
+    """Test refreshes inside the minimum spacing reuse the last fetch."""
+    nearby_stations, prices = mock_station_data
+
+    entry_data = {
+        "client_id": "test_id",
+        "client_secret": "test_secret",
+        "environment": "test",
+        "latitude": 51.5074,
+        "longitude": -0.1278,
+        "radius": 5.0,
+        "update_interval": 30,
+    }
+
+    with patch("ukfuelfinder.FuelFinderClient") as mock_client:
+        mock_instance = mock_client.return_value
+        mock_instance.search_by_location = MagicMock(return_value=nearby_stations)
+        mock_instance.get_all_pfs_prices = MagicMock(return_value=prices)
+
+        coordinator = UKFuelFinderCoordinator(hass, entry_data)
+
+        first = await coordinator._async_update_data()
+        freezer.tick(timedelta(seconds=MIN_REFRESH_SPACING - 1))
+        second = await coordinator._async_update_data()
+
+        assert second is first
+        assert mock_instance.get_all_pfs_prices.call_count == 1
+
+        freezer.tick(timedelta(seconds=2))
+        third = await coordinator._async_update_data()
+
+        assert third is not first
+        assert mock_instance.get_all_pfs_prices.call_count == 2
+
+
+async def test_coordinator_keeps_prices_when_price_download_fails(hass, mock_station_data, freezer):
+    """Test a failed price download keeps the last good prices."""
+    nearby_stations, prices = mock_station_data
+
+    entry_data = {
+        "client_id": "test_id",
+        "client_secret": "test_secret",
+        "environment": "test",
+        "latitude": 51.5074,
+        "longitude": -0.1278,
+        "radius": 5.0,
+        "update_interval": 30,
+    }
+
+    with patch("ukfuelfinder.FuelFinderClient") as mock_client:
+        mock_instance = mock_client.return_value
+        mock_instance.search_by_location = MagicMock(return_value=nearby_stations)
+        mock_instance.get_all_pfs_prices = MagicMock(return_value=prices)
+
+        coordinator = UKFuelFinderCoordinator(hass, entry_data)
+        await coordinator._async_update_data()
+
+        freezer.tick(timedelta(minutes=30))
+        mock_instance.get_all_pfs_prices.side_effect = Exception("Server error")
+        nearby_stations[0][1].trading_name = "Renamed Station"
+
+        data = await coordinator._async_update_data()
+
+        station = data["stations"]["12345"]
+        assert station["info"]["trading_name"] == "Renamed Station"
+        assert station["prices"]["unleaded"] == 145.9
+        assert set(coordinator.stale_components) == {"prices"}
+        assert coordinator.component_age("prices") == timedelta(minutes=30)
+        assert coordinator.component_age("stations") == timedelta(0)
+        assert coordinator.breaker.failures == 1
+
+
+async def test_coordinator_keeps_stations_when_search_fails(hass, mock_station_data, freezer):
+    """Test a failed station search keeps the last good stations with fresh prices."""
+    nearby_stations, prices = mock_station_data
+
+    entry_data = {
+        "client_id": "test_id",
+        "client_secret": "test_secret",
+        "environment": "test",
+        "latitude": 51.5074,
+        "longitude": -0.1278,
+        "radius": 5.0,
+        "update_interval": 30,
+    }
+
+    with patch("ukfuelfinder.FuelFinderClient") as mock_client:
+        mock_instance = mock_client.return_value
+        mock_instance.search_by_location = MagicMock(return_value=nearby_stations)
+        mock_instance.get_all_pfs_prices = MagicMock(return_value=prices)
+
+        coordinator = UKFuelFinderCoordinator(hass, entry_data)
+        first = await coordinator._async_update_data()
+
+        freezer.tick(timedelta(minutes=30))
+        mock_instance.search_by_location.side_effect = Exception("Network error")
+        prices[0].fuel_prices[0].price = 139.9
+
+        data = await coordinator._async_update_data()
+
+        assert data["stations"]["12345"]["prices"]["unleaded"] == 139.9
+        assert set(coordinator.stale_components) == {"stations"}
+        # No fresh station metadata, so the station index is not rebuilt
+        assert data["station_index"] is first["station_index"]
+
+
+async def test_coordinator_fails_when_last_good_data_too_old(hass, mock_station_data, freezer):
+    """Test last good data is only served up to the max data age."""
+    nearby_stations, prices = mock_station_data
+
+    entry_data = {
+        "client_id": "test_id",
+        "client_secret": "test_secret",
+        "environment": "test",
+        "latitude": 51.5074,
+        "longitude": -0.1278,
+        "radius": 5.0,
+        "update_interval": 30,
+        "max_data_age": 60,
+    }
+
+    with patch("ukfuelfinder.FuelFinderClient") as mock_client:
+        mock_instance = mock_client.return_value
+        mock_instance.search_by_location = MagicMock(return_value=nearby_stations)
+        mock_instance.get_all_pfs_prices = MagicMock(return_value=prices)
+
+        coordinator = UKFuelFinderCoordinator(hass, entry_data)
+        await coordinator._async_update_data()
+
+        mock_instance.get_all_pfs_prices.side_effect = Exception("Server error")
+
+        # Both halves failing is served from last good data while young enough
+        mock_instance.search_by_location.side_effect = Exception("Server error")
+        freezer.tick(timedelta(minutes=30))
+        data = await coordinator._async_update_data()
+        assert "12345" in data["stations"]
+
+        freezer.tick(timedelta(minutes=31))
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+
+
+def test_coordinator_ranks_prices():
+    """Test stations are ranked per fuel type, with ties sharing the best rank."""
+    stations = {
+        "a": {"prices": {"e10": 139.9, "b7": 149.9}},
+        "b": {"prices": {"e10": 135.9}},
+        "c": {"prices": {"e10": 139.9}},
+        "d": {"prices": {"e10": 142.9, "b7": None}},
+    }
+
+    ranks = UKFuelFinderCoordinator._rank_prices(stations)
+
+    assert ranks["b"]["e10"] == {"rank": 1, "rank_of": 4, "percentile": 0}
+    assert ranks["a"]["e10"] == ranks["c"]["e10"] == {"rank": 2, "rank_of": 4, "percentile": 33}
+    assert ranks["d"]["e10"] == {"rank": 4, "rank_of": 4, "percentile": 100}
+    # A single station is the cheapest, stations without a price are not ranked
+    assert ranks["a"]["b7"] == {"rank": 1, "rank_of": 1, "percentile": 0}
+    assert "b7" not in ranks["d"]
@@ -0,0 +1,136 @@
+"""Test UK Fuel Finder diagnostics."""
+
+import sys
+from unittest.mock import patch
+
+from homeassistant.components.diagnostics import REDACTED
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ukfuelfinder.const import DOMAIN
+from custom_components.ukfuelfinder.diagnostics import (
+    MISSING_STATIONS_LIMIT,
+    REFRESH_SAMPLES,
+    SIZE_SAMPLE_STATIONS,
+    _deep_size,
+    _estimate_data_size,
+    async_get_config_entry_diagnostics,
+)
+from custom_components.ukfuelfinder.station_index import StationIndex
+from tests.fake_api import CLIENT_ID, CLIENT_SECRET, make_station
+
+ENTRY_DATA = {
+    "client_id": CLIENT_ID,
+    "client_secret": CLIENT_SECRET,
+    "environment": "test",
+    "latitude": 51.5074,
+    "longitude": -0.1278,
+    "radius": 5.0,
+    "update_interval": 30,
+}
+
+
+async def _setup_entry(hass, fake_api):
+    """Set up a config entry against the local API stand-in."""
+    from ukfuelfinder import FuelFinderClient
+
+    def client_factory(**kwargs):
+        client = FuelFinderClient(**kwargs)
+        fake_api.configure_client(client)
+        return client
+
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA)
+    entry.add_to_hass(hass)
+
+    with patch("ukfuelfinder.FuelFinderClient", side_effect=client_factory):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    return entry
+
+
+async def test_diagnostics(hass, fake_api):
+    """Test diagnostics report refresh, cache and registry state with secrets redacted."""
+    fake_api.stations = [
+        make_station("1001", 51.5080, -0.1280, {"e10": 139.9, "b7": 149.9}),
+        make_station("1002", 51.5090, -0.1290, {"e10": 137.9}),
+    ]
+    entry = await _setup_entry(hass, fake_api)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    entry_data = diagnostics["entry"]["data"]
+    assert entry_data["client_id"] == REDACTED
+    assert entry_data["client_secret"] == REDACTED
+    assert entry_data["latitude"] == REDACTED
+    assert entry_data["radius"] == 5.0
+
+    coordinator = diagnostics["coordinator"]
+    assert coordinator["last_update_success"] is True
+    assert coordinator["circuit_breaker"]["state"] == "closed"
+    assert coordinator["data_age_seconds"]["prices"] >= 0
+    assert coordinator["last_fetch"] is not None
+    assert set(coordinator["component_updated"]) == {"stations", "prices"}
+    assert coordinator["missing_stations"] == {}
+
+    assert len(diagnostics["refreshes"]["recent"]) == 1
+    assert diagnostics["refreshes"]["recent"][0]["stations"] == 2
+    assert "hit_rate" in diagnostics["api_cache"]
+    # Token, search, one price page and one station store metadata page
+    assert diagnostics["executor"]["calls"] == 4
+    assert diagnostics["data_size"]["stations"] == 2
+    assert diagnostics["data_size"]["estimated_bytes"] > 0
+    assert diagnostics["station_store"]["stations"] == 2
+
+    # 3 station sensors, 3 rank sensors, 6 cheapest sensors, 6 regional sensors
+    # (e10 and b7 in the postcode area, county and UK), 4 diagnostic sensors,
+    # 2 price age sensors (e10 and b7) and 12 price drop and spike binary sensors
+    assert diagnostics["registry"]["entities"] == 36
+    # API queue wait and the rank sensors are disabled by default
+    assert diagnostics["registry"]["disabled_entities"] == 4
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_diagnostics_bounded(hass, fake_api):
+    """Test long histories are truncated in the dump."""
+    entry = await _setup_entry(hass, fake_api)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    for _ in range(REFRESH_SAMPLES * 2):
+        coordinator.metrics.record(coordinator.metrics.last)
+    coordinator.missing_stations = {str(i): 1 for i in range(MISSING_STATIONS_LIMIT * 2)}
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert len(diagnostics["refreshes"]["recent"]) == REFRESH_SAMPLES
+    assert len(diagnostics["coordinator"]["missing_stations"]) == MISSING_STATIONS_LIMIT
+    assert diagnostics["coordinator"]["missing_stations_total"] == MISSING_STATIONS_LIMIT * 2
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+def test_data_size_samples_large_tables():
+    """Test station-keyed tables are sampled and slotted objects are measured deeply."""
+    stations = {
+        str(i): {"info": {"brand": f"Brand {i % 5}"}, "distance": 1.0, "prices": {"e10": 139.9}}
+        for i in range(SIZE_SAMPLE_STATIONS * 10)
+    }
+    ranks = {station_id: {"e10": {"rank": 1, "rank_of": 1}} for station_id in stations}
+    index = StationIndex.build(stations)
+    assert _deep_size(index) > sys.getsizeof(index) + sys.getsizeof(index.stations)
+
+    with patch(
+        "custom_components.ukfuelfinder.diagnostics._deep_size", wraps=_deep_size
+    ) as deep_size:
+        size = _estimate_data_size(
+            {"stations": stations, "price_ranks": ranks, "station_index": index}
+        )
+
+    # Only sampled station and rank entries were walked, plus the whole index
+    measured = {id(call.args[0]) for call in deep_size.call_args_list}
+    assert id(stations["199"]) not in measured
+    assert id(ranks["199"]) not in measured
+    assert size["stations"] == len(stations)
+    # Uniform entries scale up to close to the exact size
+    exact = _deep_size(stations) + _deep_size(ranks) + _deep_size(index)
+    assert abs(size["estimated_bytes"] - exact) < exact * 0.05
@@ -0,0 +1,105 @@
+"""Test the dedicated API worker pool."""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ukfuelfinder.const import DOMAIN
+from custom_components.ukfuelfinder.executor import FuelFinderExecutor
+
+
+async def test_run_returns_result_and_records_wait(hass):
+    """Test calls run on the pool and record queue wait time."""
+    executor = FuelFinderExecutor(hass)
+
+    result = await executor.async_run(lambda a, b: (threading.current_thread().name, a + b), 1, 2)
+
+    thread_name, total = result
+    assert total == 3
+    assert thread_name.startswith(DOMAIN)
+    assert executor.stats["calls"] == 1
+    assert executor.stats["queue_wait_last"] is not None
+    assert executor.stats["queue_wait_last"] >= 0
+
+    await executor.async_shutdown()
+
+
+async def test_run_timeout(hass):
+    """Test a call that exceeds its timeout raises TimeoutError."""
+    executor = FuelFinderExecutor(hass)
+    release = threading.Event()
+
+    def slow_call():
+        release.wait(5)
+
+    with pytest.raises(TimeoutError, match="slow_call timed out"):
+        await executor.async_run(slow_call, timeout=0.05)
+
+    assert executor.stats["timeouts"] == 1
+
+    release.set()
+    await executor.async_shutdown()
+
+
+async def test_shutdown_cancels_pending_calls(hass):
+    """Test shutdown cancels queued and running calls without waiting, and rejects new ones."""
+    executor = FuelFinderExecutor(hass, max_workers=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking_call():
+        started.set()
+        release.wait(5)
+
+    running = hass.async_create_task(executor.async_run(blocking_call))
+    queued = hass.async_create_task(executor.async_run(lambda: "never"))
+    await hass.async_add_executor_job(started.wait, 5)
+
+    # Shutdown does not wait for the running call
+    async with asyncio.timeout(1):
+        await executor.async_shutdown()
+    release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await running
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+
+    with pytest.raises(RuntimeError):
+        await executor.async_run(lambda: None)
+
+
+async def test_unload_shuts_down_executor(hass):
+    """Test unloading the entry stops the coordinator's worker pool."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "client_id": "test_id",
+            "client_secret": "test_secret",
+            "environment": "test",
+            "latitude": 51.5074,
+            "longitude": -0.1278,
+            "radius": 5.0,
+            "update_interval": 30,
+        },
+    )
+    entry.add_to_hass(hass)
+
+    with patch("ukfuelfinder.FuelFinderClient"):
+        with patch(
+            "custom_components.ukfuelfinder.coordinator.UKFuelFinderCoordinator._async_update_data",
+            return_value={"stations": {}},
+        ):
+            await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+
+    executor = hass.data[DOMAIN][entry.entry_id].executor
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    with pytest.raises(RuntimeError):
+        await executor.async_run(lambda: None)
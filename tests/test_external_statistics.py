@@ -0,0 +1,89 @@
+"""Test publishing prices as external long-term statistics."""
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.components.recorder.statistics import get_last_statistics
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
+from custom_components.ukfuelfinder.external_statistics import (
+    PriceStatisticsPublisher,
+    statistic_id,
+)
+from tests.fake_api import CLIENT_ID, CLIENT_SECRET, make_station
+
+ENTRY_DATA = {
+    "client_id": CLIENT_ID,
+    "client_secret": CLIENT_SECRET,
+    "environment": "test",
+    "latitude": 51.5074,
+    "longitude": -0.1278,
+    "radius": 5.0,
+    "update_interval": 30,
+    "external_statistics": True,
+}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(recorder_mock, enable_custom_integrations):
+    """Set up the recorder before Home Assistant starts, then enable custom integrations."""
+    return
+
+
+def _station(prices):
+    """Build coordinator station data."""
+    return {"info": {"trading_name": "Test Station"}, "prices": prices}
+
+
+async def _last_statistic(hass, series_id):
+    """Return the newest statistics row of a series."""
+    await async_wait_recording_done(hass)
+    rows = await hass.async_add_executor_job(
+        get_last_statistics, hass, 1, series_id, True, {"mean", "min", "max"}
+    )
+    return rows[series_id][0] if rows else None
+
+
+async def test_publisher_aggregates_refreshes_per_hour(hass, freezer):
+    """Test refreshes within an hour update one row and a new hour starts a new one."""
+    freezer.move_to("2026-03-01 10:05:00+00:00")
+    publisher = PriceStatisticsPublisher(hass)
+    series_id = statistic_id("1001", "e10")
+
+    assert publisher.publish({"1001": _station({"e10": 139.9, "b7": 149.9})}) == 2
+    freezer.tick(timedelta(minutes=30))
+    publisher.publish({"1001": _station({"e10": 137.9})})
+
+    row = await _last_statistic(hass, series_id)
+    assert dt_util.utc_from_timestamp(row["start"]).hour == 10
+    assert row["min"] == 1.379
+    assert row["max"] == 1.399
+    assert row["mean"] == 1.389
+
+    freezer.tick(timedelta(hours=1))
+    publisher.publish({"1001": _station({"e10": 137.9})})
+
+    row = await _last_statistic(hass, series_id)
+    assert dt_util.utc_from_timestamp(row["start"]).hour == 11
+    assert row["min"] == row["max"] == row["mean"] == 1.379
+
+
+async def test_coordinator_publishes_when_enabled(hass, fake_api):
+    """Test the option makes every refresh publish its station prices."""
+    fake_api.stations = [make_station("1001", 51.5080, -0.1280, {"e10": 139.9})]
+
+    coordinator = UKFuelFinderCoordinator(hass, ENTRY_DATA)
+    fake_api.configure_client(coordinator.client)
+    await coordinator._async_update_data()
+    await coordinator.async_shutdown()
+
+    row = await _last_statistic(hass, statistic_id("1001", "e10"))
+    assert row["mean"] == 1.399
+
+    disabled = UKFuelFinderCoordinator(hass, {**ENTRY_DATA, "external_statistics": False})
+    assert disabled.statistics_publisher is None
+    await disabled.async_shutdown()
@@ -0,0 +1,105 @@
+"""Test stale price detection and price freshness."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
+from custom_components.ukfuelfinder.freshness import price_freshness
+from custom_components.ukfuelfinder.sensor import UKFuelFinderFreshnessSensor
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _station(name, prices, ages):
+    """Build coordinator station data with prices updated the given hours ago."""
+    return {
+        "info": {"trading_name": name},
+        "distance": 1.0,
+        "prices": prices,
+        "price_timestamps": {
+            fuel_type: NOW - timedelta(hours=age) if age is not None else None
+            for fuel_type, age in ages.items()
+        },
+    }
+
+
+STATIONS = {
+    # Cheapest e10, but not updated for six weeks
+    "old": _station("Old", {"e10": 129.9, "b7": 149.9}, {"e10": 24 * 42, "b7": 2}),
+    "new": _station("New", {"e10": 139.9}, {"e10": 1}),
+    "mid": _station("Mid", {"e10": 141.9}, {"e10": 48}),
+    "unknown": _station("Unknown", {"e10": 145.9}, {"e10": None}),
+}
+
+
+def test_price_freshness():
+    """Test stale prices and age statistics by fuel type in one pass."""
+    stale, freshness = price_freshness(STATIONS, NOW, timedelta(days=30))
+
+    assert stale == {"old": {"e10"}}
+    assert freshness["e10"] == {
+        "median_age_hours": 48.0,
+        "oldest_age_hours": 1008.0,
+        "prices": 3,
+        "stale": 1,
+    }
+    assert freshness["b7"]["stale"] == 0
+
+    # Without a max age nothing is stale, the statistics are still kept
+    stale, freshness = price_freshness(STATIONS, NOW, None)
+    assert stale == {}
+    assert freshness["e10"]["stale"] == 0
+
+
+def test_naive_timestamps_are_utc():
+    """Test update times without a timezone are measured as UTC."""
+    naive = {"naive": _station("Naive", {"e10": 139.9}, {"e10": 2})}
+    naive["naive"]["price_timestamps"]["e10"] = naive["naive"]["price_timestamps"]["e10"].replace(
+        tzinfo=None
+    )
+
+    _, freshness = price_freshness(naive, NOW, timedelta(days=30))
+
+    assert freshness["e10"]["median_age_hours"] == 2.0
+
+
+def test_stale_prices_do_not_win_or_rank():
+    """Test stale prices are left out of cheapest and ranks, fresh ones of the station stay."""
+    stale, _ = price_freshness(STATIONS, NOW, timedelta(days=30))
+
+    cheapest, filtered = UKFuelFinderCoordinator._find_cheapest_by_filter(
+        STATIONS, {"all": frozenset(STATIONS)}, stale
+    )
+    assert cheapest["e10"]["station_id"] == "new"
+    assert filtered["all"]["e10"]["station_id"] == "new"
+    assert cheapest["b7"]["station_id"] == "old"
+    assert UKFuelFinderCoordinator._find_cheapest(STATIONS)["e10"]["station_id"] == "old"
+
+    ranks = UKFuelFinderCoordinator._rank_prices(STATIONS, stale)
+    assert "e10" not in ranks["old"]
+    assert ranks["new"]["e10"] == {"rank": 1, "rank_of": 3, "percentile": 0}
+    assert ranks["old"]["b7"]["rank"] == 1
+
+
+async def test_freshness_sensor(hass):
+    """Test the price age sensor shows the median age and stale count."""
+    coordinator = MagicMock(spec=DataUpdateCoordinator)
+    coordinator.last_update_success = True
+    coordinator.config_entry = MagicMock(entry_id="entry")
+    coordinator.max_price_age = timedelta(days=30)
+    _, freshness = price_freshness(STATIONS, NOW, coordinator.max_price_age)
+    coordinator.data = {"freshness": freshness}
+
+    sensor = UKFuelFinderFreshnessSensor(coordinator, "e10")
+    assert sensor.unique_id == "entry_freshness_e10"
+    assert sensor.name == "E10 Price Age"
+    assert sensor.native_value == 48.0
+    assert sensor.available is True
+    assert sensor.extra_state_attributes["stale"] == 1
+    assert sensor.extra_state_attributes["max_price_age_days"] == 30
+
+    lpg = UKFuelFinderFreshnessSensor(coordinator, "lpg")
+    assert lpg.native_value is None
+    assert lpg.available is False
@@ -0,0 +1,113 @@
+"""Test the price history ring buffer and window statistics."""
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.ukfuelfinder.history import (
+    HISTORY_CAPACITY,
+    STORAGE_KEY,
+    PriceSeries,
+    async_get_price_history,
+)
+
+HOUR = 3600
+DAY = 24 * HOUR
+NOW = 100 * DAY
+
+
+def test_series_window_statistics():
+    """Test min, max, mean and trend per window, including the price carried in."""
+    series = PriceSeries()
+    for timestamp, price in [
+        (NOW - 40 * DAY, 130.0),
+        (NOW - 20 * DAY, 140.0),
+        (NOW - 3 * DAY, 135.0),
+        (NOW - 10 * HOUR, 138.0),
+        (NOW - HOUR, 132.0),
+    ]:
+        assert series.add(timestamp, price)
+
+    # Older or repeated timestamps are ignored
+    assert not series.add(NOW - HOUR, 150.0)
+
+    stats = series.stats(NOW)
+    # 135.0 was in effect when the 24h window started
+    assert stats["price_min_24h"] == 132.0
+    assert stats["price_max_24h"] == 138.0
+    assert stats["price_mean_24h"] == 135.0
+    assert stats["price_trend_24h"] == -3.0
+    assert stats["price_max_7d"] == 140.0
+    assert stats["price_trend_7d"] == -8.0
+    assert stats["price_min_30d"] == 130.0
+    assert stats["price_trend_30d"] == 2.0
+
+    # Once the last change is a day old, the window holds just the current price
+    stats = series.stats(NOW + 2 * DAY)
+    assert stats["price_min_24h"] == stats["price_max_24h"] == 132.0
+    assert stats["price_trend_24h"] == 0.0
+
+
+def test_series_ring_buffer_wraps():
+    """Test the ring buffer overwrites its oldest samples and keeps statistics right."""
+    series = PriceSeries()
+    count = HISTORY_CAPACITY + 20
+    for index in range(count):
+        series.add(NOW - (count - index) * 60, 100.0 + index)
+
+    assert series.size == HISTORY_CAPACITY
+    stats = series.stats(NOW)
+    # The last overwritten sample is carried in, everything older is gone
+    assert stats["price_min_24h"] == 100.0 + count - HISTORY_CAPACITY - 1
+    assert stats["price_max_24h"] == 100.0 + count - 1
+
+    # Stored samples rebuild the same statistics
+    reloaded = PriceSeries()
+    flat = series.samples()
+    for index in range(0, len(flat), 2):
+        reloaded.add(flat[index], flat[index + 1])
+    assert reloaded.stats(NOW) == stats
+
+
+async def test_price_history_records_and_persists(hass, hass_storage):
+    """Test refresh data feeds the history once per price change and is saved."""
+    history = await async_get_price_history(hass)
+    updated = datetime.now(timezone.utc) - timedelta(hours=2)
+    stations = {
+        "1001": {
+            "prices": {"e10": 139.9, "b7": 149.9},
+            "price_timestamps": {"e10": updated, "b7": None},
+        }
+    }
+
+    stats = history.record(stations)
+    assert stats["1001"]["e10"]["price_mean_24h"] == 139.9
+    # No timestamp, no sample
+    assert "b7" not in stats["1001"]
+
+    # The same price report again is not a new sample
+    history.record(stations)
+    assert history.series["1001"]["e10"].size == 1
+
+    stations["1001"]["prices"]["e10"] = 137.9
+    stations["1001"]["price_timestamps"]["e10"] = updated + timedelta(hours=1)
+    stats = history.record(stations)
+    assert stats["1001"]["e10"]["price_trend_24h"] == -2.0
+
+    await hass.async_stop(force=True)
+    saved = hass_storage[STORAGE_KEY]["data"]
+    assert saved["1001"]["e10"][1::2] == [139.9, 137.9]
+
+
+async def test_price_history_naive_timestamps_are_utc(hass, hass_storage):
+    """Test update times without a timezone are recorded as UTC, not local time."""
+    history = await async_get_price_history(hass)
+    updated = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(hours=2)
+    stations = {
+        "1001": {
+            "prices": {"e10": 139.9},
+            "price_timestamps": {"e10": updated.replace(tzinfo=None)},
+        }
+    }
+
+    history.record(stations)
+
+    assert history.series["1001"]["e10"].last_time == updated.timestamp()
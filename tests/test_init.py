@@ -3,6 +3,8 @@
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.ukfuelfinder import async_setup_entry, async_unload_entry
@@ -65,3 +67,36 @@ async def test_unload_entry(hass):
     await hass.async_block_till_done()
 
     assert entry.entry_id not in hass.data[DOMAIN]
+
+
+async def test_failed_setup_stops_worker_pool(hass):
+    """Test a failed first refresh does not leak a worker pool and stop listener."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "client_id": "test_id",
+            "client_secret": "test_secret",
+            "environment": "test",
+            "latitude": 51.5074,
+            "longitude": -0.1278,
+            "radius": 5.0,
+            "update_interval": 30,
+        },
+    )
+    entry.add_to_hass(hass)
+    stop_listeners = hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_STOP, 0)
+
+    # Called directly the coordinator is not bound to the entry, so nothing
+    # else shuts it down when setup fails
+    with (
+        patch("ukfuelfinder.FuelFinderClient"),
+        patch(
+            "custom_components.ukfuelfinder.coordinator.UKFuelFinderCoordinator._async_update_data",
+            side_effect=ConfigEntryAuthFailed("Invalid credentials"),
+        ),
+        pytest.raises(ConfigEntryAuthFailed),
+    ):
+        await async_setup_entry(hass, entry)
+
+    assert entry.entry_id not in hass.data[DOMAIN]
+    assert hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_STOP, 0) == stop_listeners
@@ -0,0 +1,211 @@
+"""End-to-end load and soak tests against the local Fuel Finder API stand-in."""
+
+import asyncio
+import os
+import time
+from datetime import timedelta
+
+import pytest
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ukfuelfinder.const import DOMAIN
+from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
+from custom_components.ukfuelfinder.metrics import RefreshMetrics
+from custom_components.ukfuelfinder.store import async_get_station_store
+from tests.fake_api import CLIENT_ID, CLIENT_SECRET, PAGE_SIZE
+from tests.synthetic import synthetic_stations
+
+# Large enough to page through the API, small enough to keep the suite quick
+DATASET_SIZE = 1800
+
+# Soak refreshes run against a smaller feed; raise the cycle count for a long soak
+SOAK_DATASET_SIZE = 400
+SOAK_CYCLES = int(os.environ.get("UKFUELFINDER_SOAK_CYCLES", "30"))
+
+LONDON = (51.5074, -0.1278)
+MANCHESTER = (53.4808, -2.2426)
+
+
+def _entry_data(location=LONDON, client_id=CLIENT_ID, client_secret=CLIENT_SECRET):
+    """Return config entry data for a location."""
+    return {
+        "client_id": client_id,
+        "client_secret": client_secret,
+        "environment": "test",
+        "latitude": location[0],
+        "longitude": location[1],
+        "radius": 10.0,
+        "update_interval": 30,
+    }
+
+
+@pytest.fixture
+def national_api(fake_api):
+    """Serve a synthetic national dataset from the API stand-in."""
+    fake_api.stations = synthetic_stations(DATASET_SIZE)
+    return fake_api
+
+
+def _cheapest_nearby(stations, fuel_type):
+    """Return the cheapest price of a fuel type among the given coordinator stations."""
+    return min(
+        station["prices"][fuel_type]
+        for station in stations.values()
+        if fuel_type in station["prices"]
+    )
+
+
+async def test_setup_pages_through_national_dataset(hass, national_api, fake_client):
+    """Test a config entry loads every page and creates entities from it."""
+    entry = MockConfigEntry(domain=DOMAIN, data=_entry_data())
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    pages = -(-DATASET_SIZE // PAGE_SIZE)
+    assert national_api.tokens_issued == 1
+    assert national_api.requests["/pfs"] == pages
+    assert national_api.requests["/pfs/fuel-prices"] == pages
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    stations = coordinator.data["stations"]
+    assert stations
+
+    state = hass.states.get("sensor.cheapest_fuel_prices_cheapest_e10")
+    assert float(state.state) == round(_cheapest_nearby(stations, "e10") / 100, 3)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_multiple_entries_refresh_independently(hass, national_api, fake_client):
+    """Test two accounts at different locations keep separate clients, tokens and data."""
+    national_api.credentials = {CLIENT_ID: CLIENT_SECRET, "second_id": "second_secret"}
+    entries = [
+        MockConfigEntry(domain=DOMAIN, data=_entry_data(LONDON), unique_id=CLIENT_ID),
+        MockConfigEntry(
+            domain=DOMAIN,
+            data=_entry_data(MANCHESTER, "second_id", "second_secret"),
+            unique_id="second_id",
+        ),
+    ]
+    for entry in entries:
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    london, manchester = (hass.data[DOMAIN][entry.entry_id] for entry in entries)
+    assert national_api.tokens_issued == 2
+    assert london.executor is not manchester.executor
+    assert london.data["stations"]
+    assert manchester.data["stations"]
+    assert not set(london.data["stations"]) & set(manchester.data["stations"])
+
+    # Each entry has its own diagnostics sensors and device
+    entity_registry = er.async_get(hass)
+    for entry in entries:
+        unique_id = f"{entry.entry_id}_diagnostics_refresh_duration"
+        assert entity_registry.async_get_entity_id("sensor", DOMAIN, unique_id)
+    device_registry = dr.async_get(hass)
+    for entry in entries:
+        device = device_registry.async_get_device(
+            identifiers={(DOMAIN, f"{entry.entry_id}_diagnostics")}
+        )
+        assert device.config_entries == {entry.entry_id}
+
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_entries_refreshing_together_keep_store_complete(hass, national_api):
+    """Test two entries refreshing at once, as at startup, leave every national price stored."""
+    national_api.credentials = {CLIENT_ID: CLIENT_SECRET, "second_id": "second_secret"}
+    store = await async_get_station_store(hass, "test")
+    first = UKFuelFinderCoordinator(hass, _entry_data(LONDON), station_store=store)
+    second = UKFuelFinderCoordinator(
+        hass, _entry_data(MANCHESTER, "second_id", "second_secret"), station_store=store
+    )
+
+    # The first entry starts first but is overtaken: the second writes the first
+    # price page before it and only finishes after the first has written it too
+    delays = {first: {1: 0.3}, second: {4: 0.6}}
+    for coordinator in (first, second):
+        national_api.configure_client(coordinator.client)
+        get_prices = coordinator.client.get_all_pfs_prices
+
+        def slow_prices(page, *args, _get=get_prices, _delays=delays[coordinator], **kwargs):
+            time.sleep(_delays.get(page, 0))
+            return _get(page, *args, **kwargs)
+
+        coordinator.client.get_all_pfs_prices = slow_prices
+
+    first_refresh = asyncio.ensure_future(first._async_update_data())
+    await asyncio.sleep(0.1)
+    await asyncio.gather(first_refresh, second._async_update_data())
+
+    national_prices = sum(
+        len(station["prices"]["fuel_prices"]) for station in national_api.stations
+    )
+    stats = await hass.async_add_executor_job(store.stats)
+    assert stats["prices"] == national_prices
+    assert stats["stations"] == DATASET_SIZE
+
+    for coordinator in (first, second):
+        await coordinator.async_shutdown()
+
+
+async def test_slow_api_times_out_and_recovers(hass, national_api):
+    """Test calls slower than the timeout fail the refresh without blocking recovery."""
+    coordinator = UKFuelFinderCoordinator(hass, _entry_data())
+    national_api.configure_client(coordinator.client)
+    coordinator.executor.timeout = 0.1
+    national_api.latency = 0.3
+
+    with pytest.raises(UpdateFailed, match="timed out"):
+        await coordinator._async_update_data()
+    assert coordinator.executor.stats["timeouts"] == 1
+
+    # One failure does not open the breaker, so the next refresh goes straight out
+    national_api.latency = 0
+    coordinator.executor.timeout = 30
+
+    data = await coordinator._async_update_data()
+    assert data["stations"]
+    assert coordinator.breaker.failures == 0
+
+    await coordinator.async_shutdown()
+
+
+async def test_soak_many_refresh_cycles(hass, fake_api, freezer):
+    """Test many refreshes with faults and station churn stay bounded and consistent."""
+    all_stations = synthetic_stations(SOAK_DATASET_SIZE)
+    coordinator = UKFuelFinderCoordinator(hass, _entry_data())
+    coordinator.metrics = RefreshMetrics(samples=SOAK_CYCLES // 2)
+    fake_api.configure_client(coordinator.client)
+
+    stale_refreshes = 0
+    for cycle in range(SOAK_CYCLES):
+        # A slice of stations drops out of the feed now and then
+        fake_api.stations = all_stations[:-100] if cycle % 7 == 3 else all_stations
+        if cycle % 5 == 4:
+            fake_api.inject_fault(500, path="/pfs/fuel-prices")
+
+        data = await coordinator._async_update_data()
+        stale_refreshes += bool(coordinator.stale_components)
+        assert data["stations"]
+        assert data["cheapest"]
+
+        freezer.tick(timedelta(minutes=30))
+
+    assert stale_refreshes == SOAK_CYCLES // 5
+    # Expired tokens are refreshed, never re-issued from the client secret
+    assert fake_api.requests["/oauth/generate_access_token"] == 1
+    assert not fake_api.faults
+    assert len(coordinator.metrics.history) == SOAK_CYCLES // 2
+    assert coordinator.executor.stats["pending"] == 0
+    assert len(coordinator.missing_stations) <= 100
+
+    await coordinator.async_shutdown()
@@ -0,0 +1,182 @@
+"""Memory budgets for refreshes and entities, measured with tracemalloc.
+
+Budgets are per station or per entity so they hold for any radius. They are
+set with headroom over current usage; a new metadata field that copies data
+per station or per sensor should still trip them. Scale all budgets with the
+UKFUELFINDER_MEMORY_SCALE environment variable.
+"""
+
+import asyncio
+import gc
+import json
+import os
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ukfuelfinder.const import DOMAIN
+from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
+from custom_components.ukfuelfinder.sensor import async_setup_entry
+from tests.fake_api import PAGE_SIZE
+from tests.synthetic import search, synthetic_models, synthetic_stations
+
+DATASET_SIZE = 1500  # three pages of prices
+LATITUDE = 51.5074
+LONGITUDE = -0.1278
+RADIUS = 25
+STEADY_STATE_CYCLES = 4
+
+SCALE = float(os.environ.get("UKFUELFINDER_MEMORY_SCALE", "1.0"))
+
+# Budgets in bytes
+REFRESH_PEAK_PER_PAGE_RECORD = 8_000  # one page of decoded JSON and models at a time
+DATA_PER_STATION = 10_000  # retained coordinator data per nearby station
+STEADY_STATE_GROWTH = 100_000  # total growth over STEADY_STATE_CYCLES refreshes
+ENTITY_CREATION_PER_ENTITY = 2_500
+ATTRIBUTES_PEAK_PER_ENTITY = 1_500
+
+
+@dataclass
+class MemoryUsage:
+    """Traced memory of a block of code in bytes."""
+
+    retained: int = 0
+    peak: int = 0
+
+
+@contextmanager
+def traced():
+    """Measure memory allocated and still held by a block of code."""
+    gc.collect()
+    tracemalloc.start()
+    usage = MemoryUsage()
+    start, _ = tracemalloc.get_traced_memory()
+    try:
+        yield usage
+    finally:
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        usage.retained = current - start
+        usage.peak = peak - start
+
+
+def _assert_budget(name, used, budget):
+    """Fail if usage exceeds its scaled budget."""
+    budget *= SCALE
+    assert used <= budget, f"{name} used {used:,.0f} bytes, budget is {budget:,.0f}"
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    """Build the synthetic dataset once for all memory tests."""
+    stations = synthetic_stations(DATASET_SIZE)
+    infos, _ = synthetic_models(stations)
+    return [station["prices"] for station in stations], search(infos, LATITUDE, LONGITUDE, RADIUS)
+
+
+@pytest.fixture
+async def coordinator(hass, dataset):
+    """Create a coordinator whose real client downloads a fresh price page per request.
+
+    Only the HTTP layer is mocked, so the client's price parsing and response
+    cache count towards the budgets.
+    """
+    raw_prices, nearby = dataset
+
+    def http_get(endpoint, params=None):
+        assert endpoint == "/pfs/fuel-prices"
+        # Like a real response, every page is newly decoded JSON
+        start = (params["batch-number"] - 1) * PAGE_SIZE
+        return json.loads(json.dumps(raw_prices[start : start + PAGE_SIZE]))
+
+    coordinator = UKFuelFinderCoordinator(
+        hass,
+        {
+            "client_id": "test_id",
+            "client_secret": "test_secret",
+            "environment": "test",
+            "latitude": LATITUDE,
+            "longitude": LONGITUDE,
+            "radius": RADIUS,
+            "update_interval": 30,
+        },
+    )
+    client = coordinator.client
+    client.authenticator.get_token = lambda: "token"
+    client.search_by_location = lambda *args, **kwargs: nearby
+    client.http_client.get = http_get
+    yield coordinator
+    await coordinator.async_shutdown()
+
+
+async def _refresh(coordinator):
+    """Run a refresh that hits the (mocked) API."""
+    coordinator._last_fetch = None  # Defeat refresh coalescing
+    coordinator.data = await coordinator._async_update_data()
+    # Let go of the loop handle that resumed us, it still references the download
+    await asyncio.sleep(0)
+
+
+async def test_refresh_memory(coordinator):
+    """Test refresh peak memory tracks a price page, not the national dataset."""
+    with traced() as usage:
+        await _refresh(coordinator)
+
+    stations = len(coordinator.data["stations"])
+    assert stations
+    _assert_budget(
+        "Refresh peak per page record", usage.peak / PAGE_SIZE, REFRESH_PEAK_PER_PAGE_RECORD
+    )
+    # The national download, including the client's response cache, is released
+    # once a refresh finishes
+    _assert_budget("Retained data per station", usage.retained / stations, DATA_PER_STATION)
+
+
+async def test_steady_state_memory(coordinator):
+    """Test repeated refreshes do not accumulate memory."""
+    await _refresh(coordinator)
+
+    with traced():
+        # Replacing untraced data with traced data is not growth, so start after a refresh
+        await _refresh(coordinator)
+        gc.collect()
+        start, _ = tracemalloc.get_traced_memory()
+
+        for _ in range(STEADY_STATE_CYCLES):
+            await _refresh(coordinator)
+
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+
+    _assert_budget("Steady state growth", current - start, STEADY_STATE_GROWTH)
+
+
+async def test_entity_memory(hass, coordinator):
+    """Test memory per sensor entity and per attribute render."""
+    await _refresh(coordinator)
+
+    entry = MockConfigEntry(domain=DOMAIN, data=coordinator.entry_data)
+    entry.add_to_hass(hass)
+    coordinator.config_entry = entry
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    entities = []
+    with traced() as creation:
+        await async_setup_entry(hass, entry, entities.extend)
+
+    assert entities
+    _assert_budget(
+        "Entity creation per entity", creation.retained / len(entities), ENTITY_CREATION_PER_ENTITY
+    )
+
+    with traced() as render:
+        states = [(entity.native_value, entity.extra_state_attributes) for entity in entities]
+
+    assert len(states) == len(entities)
+    _assert_budget(
+        "Attributes peak per entity", render.peak / len(entities), ATTRIBUTES_PEAK_PER_ENTITY
+    )
@@ -0,0 +1,105 @@
+"""Test refresh timing, count and payload size metrics."""
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ukfuelfinder.const import DOMAIN
+from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
+from custom_components.ukfuelfinder.metrics import (
+    PHASE_REGIONAL,
+    PHASE_STORE,
+    PHASES,
+    PhaseTimer,
+    RefreshMetrics,
+)
+from custom_components.ukfuelfinder.sensor import (
+    DIAGNOSTIC_SENSORS,
+    UKFuelFinderDiagnosticSensor,
+)
+from tests.fake_api import CLIENT_ID, CLIENT_SECRET, make_station
+
+ENTRY_DATA = {
+    "client_id": CLIENT_ID,
+    "client_secret": CLIENT_SECRET,
+    "environment": "test",
+    "latitude": 51.5074,
+    "longitude": -0.1278,
+    "radius": 5.0,
+    "update_interval": 30,
+}
+
+
+def _sample(duration, **phases):
+    """Build a refresh sample."""
+    return {"duration": duration, "phases": phases, "stations": 1}
+
+
+def test_phase_timer_records_phases():
+    """Test phases are timed and the total covers them."""
+    timer = PhaseTimer()
+    with timer.phase("auth"):
+        pass
+
+    assert set(timer.phases) == {"auth"}
+    assert 0 <= timer.phases["auth"] <= timer.total
+
+
+def test_histogram_and_summary_over_rolling_window():
+    """Test durations are bucketed and only the last samples are kept."""
+    metrics = RefreshMetrics(samples=3)
+    metrics.record(_sample(500, search=400))
+    for duration in (0.2, 3, 150):
+        metrics.record(_sample(duration, search=duration / 2))
+
+    assert len(metrics.history) == 3
+    histogram = metrics.histogram()
+    assert histogram["le_0.5s"] == 1
+    assert histogram["le_5s"] == 1
+    assert histogram["gt_120s"] == 1
+    assert sum(histogram.values()) == 3
+
+    summary = metrics.summary()
+    assert summary["duration"]["max"] == 150
+    assert summary["search"]["max"] == 75
+    assert "auth" not in summary
+
+
+async def test_coordinator_records_refresh_metrics(hass, fake_api):
+    """Test a refresh records every phase and feeds the diagnostic sensors."""
+    fake_api.stations = [
+        make_station("1001", 51.5080, -0.1280, {"e10": 139.9, "b7": 149.9}),
+        make_station("1002", 51.5090, -0.1290, {"e10": 137.9}),
+        make_station("2001", 53.4808, -2.2426, {"e10": 129.9}),  # Manchester, not nearby
+    ]
+
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA)
+    coordinator = UKFuelFinderCoordinator(hass, ENTRY_DATA)
+    coordinator.config_entry = entry
+    fake_api.configure_client(coordinator.client)
+    coordinator.data = await coordinator._async_update_data()
+    await coordinator.async_shutdown()
+
+    last = coordinator.data["metrics"]["last"]
+    # Without a station store there is nothing to sync or index
+    assert set(last["phases"]) == set(PHASES) - {PHASE_STORE, PHASE_REGIONAL}
+    assert last["stations"] == 2
+    assert last["prices"] == 3
+    assert last["price_records"] == 3
+    assert last["api_calls"] == 3
+    # Response bodies of the station search and price pages, the token is not counted
+    assert last["response_bytes"] == coordinator.response_bytes > 0
+    assert last["queue_wait_max"] >= 0
+
+    # Cheapest prices are computed once per refresh
+    assert coordinator.data["cheapest"]["e10"]["station_id"] == "1002"
+    assert coordinator.get_cheapest_fuel("b7")["station_id"] == "1001"
+
+    sensors = {
+        description.key: UKFuelFinderDiagnosticSensor(coordinator, description)
+        for description in DIAGNOSTIC_SENSORS
+    }
+    assert sensors["refresh_duration"].unique_id == f"{entry.entry_id}_diagnostics_refresh_duration"
+    assert sensors["refresh_duration"].native_value == last["duration"]
+    assert sensors["refresh_duration"].extra_state_attributes["samples"] == 1
+    assert sensors["stations_tracked"].native_value == 2
+    assert sensors["api_queue_wait"].native_value == last["queue_wait_max"]
+    assert sensors["download_size"].native_value == last["response_bytes"]
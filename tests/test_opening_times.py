@@ -0,0 +1,164 @@
+"""Test compiled station opening times."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
+from custom_components.ukfuelfinder.opening_times import OpeningTable, opening_state
+from custom_components.ukfuelfinder.station_index import StationIndex
+
+# Monday 5 January 2026, when London time is UTC
+MONDAY = datetime(2026, 1, 5, tzinfo=timezone.utc)
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+
+def _at(days=0, hours=0, minutes=0):
+    """Return a time in the test week."""
+    return MONDAY + timedelta(days=days, hours=hours, minutes=minutes)
+
+
+def test_compile_opening_times():
+    """Test day formats compile to sorted minute-of-week boundaries."""
+    assert OpeningTable.compile(None) is None
+    assert OpeningTable.compile({}) is None
+    assert OpeningTable.compile({"bank_holiday": {"type": "standard"}}) is None
+
+    table = OpeningTable.compile({"monday": {"open": "06:00", "close": "22:00"}})
+    assert table.boundaries == (360, 1320)
+
+    # Nested under usual_days with seconds, 23:59 runs to midnight
+    table = OpeningTable.compile(
+        {
+            "usual_days": {
+                "monday": {"open": "06:00:00", "close": "23:59:00"},
+                "tuesday": {"open": "00:00:00", "close": "12:00:00"},
+                "wednesday": {"open": "00:00", "close": "00:00"},
+            }
+        }
+    )
+    assert table.boundaries == (360, 1440 + 720)
+
+    always = OpeningTable.compile({day: {"is_24_hours": True} for day in WEEKDAYS})
+    assert always.always_open
+    assert always.next_change(_at(hours=12)) is None
+
+    # Sunday night past midnight wraps into Monday morning
+    table = OpeningTable.compile({"sunday": {"open": "20:00", "close": "02:00"}})
+    assert table.boundaries == (0, 120, 6 * 1440 + 1200, 7 * 1440)
+
+
+def test_open_and_next_change():
+    """Test open state and the next boundary, including the week wrap."""
+    table = OpeningTable.compile(
+        {
+            "monday": {"open": "06:00", "close": "22:00"},
+            "sunday": {"open": "20:00", "close": "02:00"},
+        }
+    )
+
+    assert table.is_open(_at(hours=1))
+    assert table.next_change(_at(hours=1)) == _at(hours=2)
+    assert not table.is_open(_at(hours=2))
+    assert table.next_change(_at(hours=2, minutes=30)) == _at(hours=6)
+    assert table.is_open(_at(hours=21, minutes=59))
+    assert table.next_change(_at(hours=21, minutes=30)) == _at(hours=22)
+    assert table.next_change(_at(days=2)) == _at(days=6, hours=20)
+
+    # Open across Sunday midnight, the next change is Monday's closing
+    assert table.is_open(_at(days=6, hours=23))
+    assert table.next_change(_at(days=6, hours=23)) == _at(days=7, hours=2)
+
+    # Station hours are London time, an hour ahead of UTC in summer
+    summer = datetime(2026, 7, 6, 5, 30, tzinfo=timezone.utc)
+    assert table.is_open(summer)
+    assert table.next_change(summer) == datetime(2026, 7, 6, 21, tzinfo=timezone.utc)
+
+
+def test_opening_state():
+    """Test the open now, opens at and closes at attributes."""
+    table = OpeningTable.compile({"monday": {"open": "06:00", "close": "22:00"}})
+
+    assert opening_state(None, _at()) == {"open_now": None, "opens_at": None, "closes_at": None}
+    assert opening_state(table, _at(hours=12)) == {
+        "open_now": True,
+        "opens_at": None,
+        "closes_at": _at(hours=22).isoformat(),
+    }
+    assert opening_state(table, _at(hours=23)) == {
+        "open_now": False,
+        "opens_at": _at(days=7, hours=6).isoformat(),
+        "closes_at": None,
+    }
+
+
+async def test_open_now_cheapest_follows_opening_hours(hass, freezer):
+    """Test the open now filter and the closing station's sensors update without polling."""
+    freezer.move_to(_at(hours=21, minutes=50))
+    entry_data = {
+        "client_id": "test_id",
+        "client_secret": "test_secret",
+        "environment": "test",
+        "latitude": 51.5074,
+        "longitude": -0.1278,
+        "radius": 5.0,
+        "update_interval": 30,
+        "cheapest_filters": ["open_now"],
+    }
+    stations = {
+        "day": {
+            "info": {"opening_times": {"monday": {"open": "06:00", "close": "22:00"}}},
+            "distance": 1.0,
+            "prices": {"e10": 139.9},
+        },
+        "always": {
+            "info": {"opening_times": {day: {"is_24_hours": True} for day in WEEKDAYS}},
+            "distance": 2.0,
+            "prices": {"e10": 149.9},
+        },
+    }
+
+    with patch("ukfuelfinder.FuelFinderClient"):
+        coordinator = UKFuelFinderCoordinator(hass, entry_data)
+    coordinator.station_index = StationIndex.build(stations)
+    coordinator.opening_tables = {
+        station_id: OpeningTable.compile(station["info"]["opening_times"])
+        for station_id, station in stations.items()
+    }
+    station_sets = {
+        "open_now": coordinator.cheapest_filters[0].select(
+            coordinator.station_index, coordinator._closed_now(dt_util.utcnow())
+        )
+    }
+    cheapest, filtered = coordinator._find_cheapest_by_filter(stations, station_sets)
+    coordinator.data = {"stations": stations, "cheapest": cheapest, "cheapest_filtered": filtered}
+    assert coordinator.get_cheapest_fuel("e10", "open_now")["station_id"] == "day"
+
+    # Listeners with the contexts station and cheapest sensors use
+    updates = []
+    remove_listeners = [
+        coordinator.async_add_listener(
+            callback(lambda context=context: updates.append(context)), context
+        )
+        for context in ("day", "always", "open_now", None)
+    ]
+    try:
+        freezer.move_to(_at(hours=22))
+        async_fire_time_changed(hass, _at(hours=22))
+        await hass.async_block_till_done()
+
+        # Only the station that closed and the open now sensors are updated
+        assert sorted(updates) == ["day", "open_now"]
+        assert coordinator.get_cheapest_fuel("e10", "open_now")["station_id"] == "always"
+        # The overall cheapest ignores opening hours
+        assert coordinator.get_cheapest_fuel("e10")["station_id"] == "day"
+    finally:
+        for remove_listener in remove_listeners:
+            remove_listener()
+        await coordinator.async_shutdown()
+
+    assert coordinator._unsub_opening_change is None
@@ -0,0 +1,102 @@
+"""Test price change detection between refreshes."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.ukfuelfinder.const import EVENT_PRICES_CHANGED
+from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
+from custom_components.ukfuelfinder.price_changes import PriceSnapshot
+
+UPDATED = datetime(2026, 2, 8, 12, 0, tzinfo=timezone.utc)
+
+
+def _station(name, prices):
+    """Build coordinator station data with prices in pence."""
+    return {
+        "info": {"trading_name": name},
+        "prices": prices,
+        "price_timestamps": {fuel_type: UPDATED for fuel_type in prices},
+    }
+
+
+def test_snapshot_reports_only_changed_prices():
+    """Test only moved prices of stations seen last time are reported."""
+    snapshot = PriceSnapshot()
+
+    assert snapshot.update({"1": _station("One", {"e10": 139.9, "b7": 149.9})}) == []
+    assert snapshot.update({"1": _station("One", {"e10": 139.9, "b7": 149.9})}) == []
+
+    changes = snapshot.update(
+        {
+            "1": _station("One", {"e10": 137.9, "b7": 149.9, "e5": 155.9}),
+            "2": _station("Two", {"e10": 129.9}),
+        }
+    )
+    assert changes == [
+        {
+            "station_id": "1",
+            "station_name": "One",
+            "fuel_type": "e10",
+            "old_price": 139.9,
+            "new_price": 137.9,
+            "price_last_updated": UPDATED.isoformat(),
+        },
+        {
+            "station_id": "1",
+            "station_name": "One",
+            "fuel_type": "e5",
+            "old_price": None,
+            "new_price": 155.9,
+            "price_last_updated": UPDATED.isoformat(),
+        },
+    ]
+    # The new station is compared from the next refresh on
+    assert snapshot.prices["2"] == {"e10": 129.9}
+
+
+async def test_coordinator_fires_one_event_per_refresh(hass, freezer):
+    """Test a refresh with moved prices fires a single batched event."""
+    entry_data = {
+        "client_id": "test_id",
+        "client_secret": "test_secret",
+        "environment": "test",
+        "latitude": 51.5074,
+        "longitude": -0.1278,
+        "radius": 5.0,
+        "update_interval": 30,
+    }
+    station_info = MagicMock(node_id="12345", trading_name="Test Station")
+    station_info.location = None
+    pfs = MagicMock(node_id="12345")
+    pfs.fuel_prices = [
+        MagicMock(fuel_type="E10", price=139.9, price_last_updated=UPDATED),
+        MagicMock(fuel_type="B7", price=149.9, price_last_updated=UPDATED),
+    ]
+    events = async_capture_events(hass, EVENT_PRICES_CHANGED)
+
+    with patch("ukfuelfinder.FuelFinderClient") as mock_client:
+        mock_instance = mock_client.return_value
+        mock_instance.search_by_location = MagicMock(return_value=[(2.5, station_info)])
+        mock_instance.get_all_pfs_prices = MagicMock(return_value=[pfs])
+
+        coordinator = UKFuelFinderCoordinator(hass, entry_data)
+        data = await coordinator._async_update_data()
+        assert data["price_changes"] == []
+
+        freezer.tick(timedelta(minutes=30))
+        pfs.fuel_prices[0].price = 136.9
+        pfs.fuel_prices[1].price = 152.9
+        data = await coordinator._async_update_data()
+        await hass.async_block_till_done()
+
+    assert len(events) == 1
+    changes = events[0].data["changes"]
+    assert [
+        (change["fuel_type"], change["old_price"], change["new_price"]) for change in changes
+    ] == [
+        ("e10", 139.9, 136.9),
+        ("b7", 149.9, 152.9),
+    ]
+    assert data["price_changes"] == changes
@@ -0,0 +1,132 @@
+"""Test regional price indexes."""
+
+from unittest.mock import MagicMock
+
+from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
+from custom_components.ukfuelfinder.regional import (
+    REGION_AREA,
+    REGION_COUNTY,
+    REGION_NATIONAL,
+    percentile,
+    postcode_area,
+    price_index,
+)
+from custom_components.ukfuelfinder.sensor import UKFuelFinderRegionalSensor
+from custom_components.ukfuelfinder.store import async_get_station_store
+from tests.fake_api import CLIENT_ID, CLIENT_SECRET, make_station
+
+ENTRY_DATA = {
+    "client_id": CLIENT_ID,
+    "client_secret": CLIENT_SECRET,
+    "environment": "test",
+    "latitude": 51.5074,
+    "longitude": -0.1278,
+    "radius": 5.0,
+    "update_interval": 30,
+}
+
+
+def _located(node_id, latitude, longitude, prices, postcode, county):
+    """Build a station with its own postcode and county."""
+    return make_station(
+        node_id,
+        latitude,
+        longitude,
+        prices,
+        location={
+            "latitude": latitude,
+            "longitude": longitude,
+            "address_line_1": f"{node_id} High Street",
+            "city": "Somewhere",
+            "country": "England",
+            "county": county,
+            "postcode": postcode,
+        },
+    )
+
+
+def test_price_index():
+    """Test postcode areas, interpolated percentiles and the local percentile."""
+    assert postcode_area("SW1A 1AA") == "SW"
+    assert postcode_area("m1 1ae") == "M"
+    assert postcode_area("") is None
+    assert postcode_area(None) is None
+
+    prices = [120.0, 130.0, 140.0, 150.0, 160.0]
+    assert percentile(prices, 0.5) == 140.0
+    assert percentile(prices, 0.1) == 124.0
+    assert percentile(prices, 0.9) == 156.0
+    assert percentile([135.9], 0.9) == 135.9
+
+    index = price_index(prices, 130.0)
+    assert index["median"] == 140.0
+    assert index["stations"] == 5
+    # Two of five stations are at or below the local price
+    assert index["cheapest_nearby_percentile"] == 40
+    assert price_index(prices)["cheapest_nearby_percentile"] is None
+
+
+async def test_coordinator_builds_regional_indexes(hass, fake_api):
+    """Test the area, county and UK indexes come from the stored national prices."""
+    fake_api.stations = [
+        _located("1001", 51.5080, -0.1280, {"e10": 139.9}, "SW1A 1AA", "Greater London"),
+        _located("1002", 51.5400, -0.2000, {"e10": 141.9}, "NW6 1AB", "Greater London"),
+        _located("1003", 51.4000, -0.3000, {"e10": 137.9}, "SW19 2CD", "Surrey"),
+        _located("2001", 53.4808, -2.2426, {"e10": 129.9, "b7": 139.9}, "M1 1AE", "Manchester"),
+    ]
+    store = await async_get_station_store(hass, "test")
+
+    coordinator = UKFuelFinderCoordinator(hass, ENTRY_DATA, station_store=store)
+    fake_api.configure_client(coordinator.client)
+    data = await coordinator._async_update_data()
+    await coordinator.async_shutdown()
+
+    regional = data["regional"]
+    # The region is that of the nearest station, 1001
+    assert regional[REGION_AREA]["name"] == "SW"
+    assert regional[REGION_AREA]["fuels"]["e10"]["stations"] == 2
+    assert regional[REGION_AREA]["fuels"]["e10"]["median"] == 138.9
+    assert regional[REGION_COUNTY]["name"] == "Greater London"
+    assert regional[REGION_COUNTY]["fuels"]["e10"]["stations"] == 2
+    assert regional[REGION_NATIONAL]["fuels"]["e10"]["stations"] == 4
+    assert regional[REGION_NATIONAL]["fuels"]["b7"]["median"] == 139.9
+    # Only 1001 is nearby, the UK has two stations at or below its price
+    assert regional[REGION_NATIONAL]["fuels"]["e10"]["cheapest_nearby_percentile"] == 75
+    assert data["metrics"]["last"]["phases"]["regional"] >= 0
+    # Regional prices were computed without extra API requests
+    assert fake_api.requests["/pfs/fuel-prices"] == 1
+
+
+async def test_regional_sensor(hass):
+    """Test the regional sensor shows the median in pounds and the spread."""
+    coordinator = MagicMock()
+    coordinator.config_entry = MagicMock(entry_id="entry")
+    coordinator.data = {
+        "regional": {
+            REGION_COUNTY: {
+                "name": "Greater London",
+                "fuels": {
+                    "e10": {
+                        "median": 140.9,
+                        "p10": 134.9,
+                        "p90": 147.9,
+                        "stations": 250,
+                        "cheapest_nearby_percentile": 8,
+                    }
+                },
+            }
+        }
+    }
+
+    sensor = UKFuelFinderRegionalSensor(coordinator, REGION_COUNTY, "e10")
+    assert sensor.unique_id == "entry_regional_county_e10"
+    assert sensor.name == "County E10 Median"
+    assert sensor.native_value == 1.409
+    attributes = sensor.extra_state_attributes
+    assert attributes["region"] == "Greater London"
+    assert attributes["p10_pence"] == 134.9
+    assert attributes["cheapest_nearby_percentile"] == 8
+
+    missing = UKFuelFinderRegionalSensor(coordinator, REGION_AREA, "e10")
+    assert missing.native_value is None
+    assert missing.extra_state_attributes == {}
@@ -38,7 +38,13 @@ def mock_coordinator():
 
 async def test_sensor_setup(hass, mock_coordinator):
     """Test sensor platform setup."""
-    from custom_components.ukfuelfinder.sensor import async_setup_entry
+    from custom_components.ukfuelfinder.sensor import (
+        UKFuelFinderCheapestSensor,
+        UKFuelFinderDiagnosticSensor,
+        UKFuelFinderRankSensor,
+        UKFuelFinderSensor,
+        async_setup_entry,
+    )
 
     entry = MockConfigEntry(
         domain=DOMAIN,
@@ -63,18 +69,33 @@ async def test_sensor_setup(hass, mock_coordinator):
 
     await async_setup_entry(hass, entry, add_entities)
 
-    # Should have 2 station sensors (e10, b7) + 6 cheapest sensors (one per fuel type)
-    assert len(entities) == 8
+    # Should have 2 station sensors (e10, b7) + 2 rank sensors + 6 cheapest sensors
+    # (one per fuel type) + 4 diagnostic sensors
+    assert len(entities) == 14
 
     # Check we have station sensors
-    station_sensors = [e for e in entities if hasattr(e, "_station_id")]
+    station_sensors = [e for e in entities if isinstance(e, UKFuelFinderSensor)]
     assert len(station_sensors) == 2
     assert station_sensors[0]._fuel_type in ["e10", "b7"]
 
+    # Check we have a rank sensor per station sensor, disabled by default
+    rank_sensors = [e for e in entities if isinstance(e, UKFuelFinderRankSensor)]
+    assert len(rank_sensors) == 2
+    assert not rank_sensors[0].entity_registry_enabled_default
+
     # Check we have cheapest sensors
-    cheapest_sensors = [e for e in entities if not hasattr(e, "_station_id")]
+    cheapest_sensors = [e for e in entities if isinstance(e, UKFuelFinderCheapestSensor)]
     assert len(cheapest_sensors) == 6
 
+    # Check we have diagnostic sensors
+    diagnostic_sensors = [e for e in entities if isinstance(e, UKFuelFinderDiagnosticSensor)]
+    assert {e.entity_description.key for e in diagnostic_sensors} == {
+        "refresh_duration",
+        "stations_tracked",
+        "download_size",
+        "api_queue_wait",
+    }
+
 
 async def test_sensor_state(hass, mock_coordinator):
     """Test sensor state."""
@@ -92,6 +113,8 @@ async def test_sensor_state(hass, mock_coordinator):
     assert sensor.native_value == 1.459  # 145.9 pence = 1.459 pounds
     assert sensor.native_unit_of_measurement == "GBP"
     assert sensor.available is True
+    # Updated when the station opens or closes
+    assert sensor.coordinator_context == "12345"
 
 
 async def test_sensor_attributes(hass, mock_coordinator):
@@ -99,6 +122,12 @@ async def test_sensor_attributes(hass, mock_coordinator):
     from custom_components.ukfuelfinder.sensor import UKFuelFinderSensor
 
     station_data = mock_coordinator.data["stations"]["12345"]
+    mock_coordinator.data["price_stats"] = {
+        "12345": {"e10": {"price_min_24h": 143.9, "price_trend_24h": 2.0}}
+    }
+    mock_coordinator.data["price_ranks"] = {
+        "12345": {"e10": {"rank": 2, "rank_of": 5, "percentile": 25}}
+    }
 
     sensor = UKFuelFinderSensor(
         mock_coordinator,
@@ -114,6 +143,35 @@ async def test_sensor_attributes(hass, mock_coordinator):
     assert attrs["distance_km"] == 2.5
     assert attrs["fuel_type"] == "e10"
     assert attrs["price_pence"] == 145.9
+    assert attrs["price_min_24h"] == 143.9
+    assert attrs["price_trend_24h"] == 2.0
+    assert attrs["price_rank"] == 2
+    assert attrs["price_rank_of"] == 5
+    assert attrs["price_percentile"] == 25
+    assert attrs["price_stale"] is False
+
+    mock_coordinator.data["stale_prices"] = {"12345": frozenset({"e10"})}
+    assert sensor.extra_state_attributes["price_stale"] is True
+
+
+async def test_rank_sensor(hass, mock_coordinator):
+    """Test the rank sensor reads the ranks computed by the coordinator."""
+    from custom_components.ukfuelfinder.sensor import UKFuelFinderRankSensor
+
+    station_data = mock_coordinator.data["stations"]["12345"]
+    mock_coordinator.data["price_ranks"] = {
+        "12345": {"e10": {"rank": 1, "rank_of": 5, "percentile": 0}}
+    }
+
+    sensor = UKFuelFinderRankSensor(mock_coordinator, "12345", "e10", station_data)
+    assert sensor.unique_id == "12345_e10_rank"
+    assert sensor.name == "E10 Rank"
+    assert sensor.native_value == 1
+    assert sensor.extra_state_attributes == {"rank_of": 5, "percentile": 0, "fuel_type": "e10"}
+
+    # No price for the fuel type, no rank
+    b7_sensor = UKFuelFinderRankSensor(mock_coordinator, "12345", "b7", station_data)
+    assert b7_sensor.native_value is None
 
 
 async def test_sensor_unavailable_when_no_data(hass):
@@ -161,7 +219,7 @@ async def test_sensor_display_precision(hass, mock_coordinator):
 
 async def test_dynamic_station_addition(hass):
     """Test that new stations are automatically added when detected."""
-    from custom_components.ukfuelfinder.sensor import async_setup_entry
+    from custom_components.ukfuelfinder.sensor import UKFuelFinderSensor, async_setup_entry
 
     # Create coordinator with initial station
     coordinator = MagicMock()
@@ -213,9 +271,10 @@ async def test_dynamic_station_addition(hass):
     # Initial setup
     await async_setup_entry(hass, entry, track_entities)
 
-    # Should have 1 station sensor + 6 cheapest sensors initially
-    assert len(entities_added) == 7
-    station_sensors = [e for e in entities_added if hasattr(e, "_station_id")]
+    # Should have 1 station sensor + 1 rank sensor + 6 cheapest sensors
+    # + 4 diagnostic sensors initially
+    assert len(entities_added) == 12
+    station_sensors = [e for e in entities_added if isinstance(e, UKFuelFinderSensor)]
     assert len(station_sensors) == 1
     assert station_sensors[0]._station_id == "12345"
     assert station_sensors[0]._fuel_type == "e10"
@@ -241,17 +300,17 @@ async def test_dynamic_station_addition(hass):
     assert len(listeners) == 1
     listeners[0]()
 
-    # Should now have 8 sensors total (7 initial + 1 new station sensor)
-    # Cheapest sensors don't get recreated
-    assert len(entities_added) == 8
-    station_sensors = [e for e in entities_added if hasattr(e, "_station_id")]
+    # Should now have 14 sensors total (12 initial + 1 new station and rank sensor)
+    # Cheapest and diagnostic sensors don't get recreated
+    assert len(entities_added) == 14
+    station_sensors = [e for e in entities_added if isinstance(e, UKFuelFinderSensor)]
     assert len(station_sensors) == 2
     assert station_sensors[1]._station_id == "67890"
     assert station_sensors[1]._fuel_type == "b7"
 
     # Trigger again with same data - should not add duplicates
     listeners[0]()
-    assert len(entities_added) == 8
+    assert len(entities_added) == 14
 
 
 async def test_sensor_includes_price_timestamp(hass, mock_coordinator):
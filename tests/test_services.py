@@ -0,0 +1,139 @@
+"""Test the UK Fuel Finder services."""
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ukfuelfinder.const import DOMAIN
+from custom_components.ukfuelfinder.services import SERVICE_FIND_CHEAPEST, QueryCache
+from custom_components.ukfuelfinder.store import StationStore
+from tests.fake_api import CLIENT_ID, CLIENT_SECRET, make_station
+
+ENTRY_DATA = {
+    "client_id": CLIENT_ID,
+    "client_secret": CLIENT_SECRET,
+    "environment": "test",
+    "latitude": 51.5074,
+    "longitude": -0.1278,
+    "radius": 5.0,
+    "update_interval": 30,
+}
+
+MANCHESTER = (53.4808, -2.2426)
+
+
+async def _find_cheapest(hass, **data):
+    """Call the find_cheapest service and return its response."""
+    return await hass.services.async_call(
+        DOMAIN, SERVICE_FIND_CHEAPEST, data, blocking=True, return_response=True
+    )
+
+
+@pytest.fixture
+async def loaded_entry(hass, fake_api, fake_client):
+    """Set up a config entry in London over stations in London and Manchester."""
+    fake_api.stations = [
+        make_station("1001", 51.5080, -0.1280, {"e10": 139.9, "b7": 149.9}),
+        make_station("2001", 53.4810, -2.2430, {"e10": 131.9}, brand_name="Tesco"),
+        make_station(
+            "2002", 53.4850, -2.2400, {"e10": 129.9}, brand_name="Esso", amenities=["car_wash"]
+        ),
+        make_station("2003", 53.4700, -2.2500, {"e10": 133.9}, brand_name="Tesco"),
+        # Cheapest, but not updated for longer than the default max price age
+        make_station("2004", 53.4820, -2.2420, {"e10": 119.9}, updated="2020-01-01T00:00:00Z"),
+    ]
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    yield entry
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_find_cheapest_anywhere(hass, fake_api, loaded_entry):
+    """Test stations far from the configured location are found without API requests.
+
+    Stale prices are left out like they are for the cheapest sensors.
+    """
+    requests_before = sum(fake_api.requests.values())
+
+    response = await _find_cheapest(
+        hass, fuel_type="e10", latitude=MANCHESTER[0], longitude=MANCHESTER[1], limit=2
+    )
+    assert [station["station_id"] for station in response["stations"]] == ["2002", "2001"]
+    assert response["stations"][0]["price"] == 1.299
+    assert response["stations"][0]["amenities"] == ["car_wash"]
+
+    response = await _find_cheapest(
+        hass, fuel_type="e10", latitude=MANCHESTER[0], longitude=MANCHESTER[1], brand="tesco"
+    )
+    assert [station["station_id"] for station in response["stations"]] == ["2001", "2003"]
+
+    response = await _find_cheapest(
+        hass,
+        fuel_type="e10",
+        latitude=MANCHESTER[0],
+        longitude=MANCHESTER[1],
+        amenity="car_wash",
+    )
+    assert [station["station_id"] for station in response["stations"]] == ["2002"]
+
+    # Around an entity's location, and the home location by default
+    hass.states.async_set(
+        "device_tracker.car", "away", {"latitude": MANCHESTER[0], "longitude": MANCHESTER[1]}
+    )
+    response = await _find_cheapest(
+        hass, fuel_type="e10", entity_id="device_tracker.car", radius=1.0
+    )
+    assert [station["station_id"] for station in response["stations"]] == ["2002", "2001"]
+
+    await hass.config.async_update(latitude=51.5074, longitude=-0.1278)
+    response = await _find_cheapest(hass, fuel_type="b7")
+    assert [station["station_id"] for station in response["stations"]] == ["1001"]
+
+    assert sum(fake_api.requests.values()) == requests_before
+
+
+async def test_find_cheapest_caches_until_refresh(hass, loaded_entry):
+    """Test repeated queries are served from the cache until the prices are refreshed."""
+    query = {"fuel_type": "e10", "latitude": MANCHESTER[0], "longitude": MANCHESTER[1]}
+
+    with patch.object(
+        StationStore, "find_cheapest", autospec=True, side_effect=StationStore.find_cheapest
+    ) as find_cheapest:
+        first = await _find_cheapest(hass, **query)
+        assert await _find_cheapest(hass, **query) == first
+        assert find_cheapest.call_count == 1
+
+        coordinator = hass.data[DOMAIN][loaded_entry.entry_id]
+        coordinator._last_fetch = None
+        await coordinator.async_refresh()
+        assert await _find_cheapest(hass, **query) == first
+        assert find_cheapest.call_count == 2
+
+
+async def test_find_cheapest_errors(hass, loaded_entry):
+    """Test invalid locations are rejected."""
+    hass.states.async_set("sensor.nowhere", "1")
+
+    with pytest.raises(ServiceValidationError):
+        await _find_cheapest(hass, fuel_type="e10", entity_id="sensor.nowhere")
+
+    with pytest.raises(ServiceValidationError):
+        await _find_cheapest(hass, fuel_type="e10", entity_id="sensor.missing")
+
+
+def test_query_cache_evicts_least_recently_used():
+    """Test the query cache keeps the most recently used results."""
+    cache = QueryCache(2)
+    cache.put(("a",), 1)
+    cache.put(("b",), 2)
+    assert cache.get(("a",)) == 1
+    cache.put(("c",), 3)
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == 1
+    assert cache.get(("c",)) == 3
+    assert (cache.hits, cache.misses) == (3, 1)
@@ -1,5 +1,6 @@
 """Test stale device removal with grace period."""
 
+from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -17,7 +18,7 @@ def mock_client():
         yield client
 
 
-async def test_stale_device_removal_grace_period(hass, mock_client):
+async def test_stale_device_removal_grace_period(hass, mock_client, freezer):
     """Test that devices are removed after 2 update cycles (grace period)."""
     from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
 
@@ -99,6 +100,7 @@ async def test_stale_device_removal_grace_period(hass, mock_client):
     mock_client.search_by_location.return_value = [(2.5, station1_info)]
     mock_client.get_all_pfs_prices.return_value = [station1_pfs]
 
+    freezer.tick(timedelta(minutes=30))
     await coordinator.async_refresh()
     assert "12345" in coordinator.data["stations"]
     assert "67890" not in coordinator.data["stations"]
@@ -110,10 +112,12 @@ async def test_stale_device_removal_grace_period(hass, mock_client):
     assert entry.entry_id in device.config_entries
 
     # Third update - station 2 still missing (second missing cycle, triggers removal)
+    freezer.tick(timedelta(minutes=30))
     await coordinator.async_refresh()
     assert coordinator.missing_stations.get("67890", 2) == 2  # Should be at count 2
 
     # Fourth update - triggers removal after grace period
+    freezer.tick(timedelta(minutes=30))
     await coordinator.async_refresh()
     assert coordinator.missing_stations.get("67890") is None  # Removed from tracking
 
@@ -127,7 +131,7 @@ async def test_stale_device_removal_grace_period(hass, mock_client):
     assert entry.entry_id in device.config_entries
 
 
-async def test_station_reappears_during_grace_period(hass, mock_client):
+async def test_station_reappears_during_grace_period(hass, mock_client, freezer):
     """Test that station reappearing during grace period resets the counter."""
     from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
 
@@ -183,12 +187,14 @@ async def test_station_reappears_during_grace_period(hass, mock_client):
     # Second update - station disappears
     mock_client.search_by_location.return_value = []
     mock_client.get_all_pfs_prices.return_value = []
+    freezer.tick(timedelta(minutes=30))
     await coordinator.async_refresh()
     assert coordinator.missing_stations["12345"] == 1
 
     # Third update - station reappears (should reset counter)
     mock_client.search_by_location.return_value = [(2.5, station1_info)]
     mock_client.get_all_pfs_prices.return_value = [station1_pfs]
+    freezer.tick(timedelta(minutes=30))
     await coordinator.async_refresh()
     assert "12345" not in coordinator.missing_stations  # Counter reset
     assert "12345" in coordinator.data["stations"]
@@ -0,0 +1,46 @@
+"""Test the inverted station indexes."""
+
+from custom_components.ukfuelfinder.station_index import StationIndex
+
+
+def _station(brand, amenities=(), **flags):
+    """Build coordinator station data with the indexed info fields."""
+    return {"info": {"brand": brand, "amenities": list(amenities), **flags}, "prices": {}}
+
+
+STATIONS = {
+    "1": _station("Tesco", ["car_wash", "shop"], is_supermarket=True),
+    "2": _station("Esso", ["shop"], is_motorway=True),
+    "3": _station("tesco", ["car_wash"], is_supermarket=True, temporary_closure=True),
+    "4": _station("BP", [], permanent_closure=True),
+    "5": _station(None),
+}
+
+
+def test_build_indexes():
+    """Test stations are indexed by case-folded brand, amenity and flag."""
+    index = StationIndex.build(STATIONS)
+
+    assert index.stations == {"1", "2", "3", "4", "5"}
+    assert index.brands["tesco"] == {"1", "3"}
+    assert index.amenities["car_wash"] == {"1", "3"}
+    assert index.flags["is_supermarket"] == {"1", "3"}
+    assert index.flags["is_motorway"] == {"2"}
+    assert index.flags["permanent_closure"] == {"4"}
+
+    assert StationIndex().select() == frozenset()
+
+
+def test_select_intersects_filters():
+    """Test filters combine as set intersections and differences."""
+    index = StationIndex.build(STATIONS)
+
+    assert index.select() == index.stations
+    assert index.select(brands=["TESCO", "bp"]) == {"1", "3", "4"}
+    assert index.select(brands=["Shell"]) == frozenset()
+    assert index.select(amenities=["car_wash", "shop"]) == {"1"}
+    assert index.select(amenities=["ev_charging"]) == frozenset()
+    assert index.select(is_supermarket=True) == {"1", "3"}
+    assert index.select(is_motorway=False) == {"1", "3", "4", "5"}
+    assert index.select(exclude_closed=True) == {"1", "2", "5"}
+    assert index.select(is_supermarket=True, amenities=["car_wash"], exclude_closed=True) == {"1"}
@@ -0,0 +1,159 @@
+"""Test the local SQLite station store."""
+
+import time
+
+from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
+from custom_components.ukfuelfinder.store import (
+    SYNC_PRICES,
+    SYNC_STATIONS,
+    StationStore,
+    async_get_station_store,
+    geohash,
+    geohash_cells,
+)
+from tests.fake_api import CLIENT_ID, CLIENT_SECRET, PAGE_SIZE, make_station
+from tests.synthetic import synthetic_models, synthetic_stations
+
+ENTRY_DATA = {
+    "client_id": CLIENT_ID,
+    "client_secret": CLIENT_SECRET,
+    "environment": "test",
+    "latitude": 51.5074,
+    "longitude": -0.1278,
+    "radius": 5.0,
+    "update_interval": 30,
+}
+
+
+def test_geohash_cells():
+    """Test geohash encoding and the cells covering a box."""
+    assert geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geohash(51.5074, -0.1278) == "gcpvj"
+
+    cells = geohash_cells((51.4, -0.3, 51.6, 0.0))
+    assert "gcpvj" in cells
+    assert geohash(51.4, -0.3) in cells
+    assert geohash(51.6, 0.0) in cells
+    assert geohash_cells((50.0, -5.7, 58.6, 1.7)) is None
+
+
+def test_store_queries(tmp_path):
+    """Test cheapest queries by fuel type, brand and box, and pruning after a sync."""
+    stations = [
+        make_station("1", 51.5080, -0.1280, {"e10": 139.9, "b7": 149.9}, brand_name="Esso"),
+        make_station("2", 51.5200, -0.1000, {"e10": 135.9}, brand_name="Tesco"),
+        make_station("3", 53.4808, -2.2426, {"e10": 129.9}, brand_name="Tesco"),
+    ]
+    infos, prices = synthetic_models(stations)
+
+    store = StationStore(str(tmp_path / "stations.db"))
+    store.setup()
+    synced = time.time()
+    store.upsert_stations(infos, synced)
+    store.finish_metadata_sync(synced)
+    store.upsert_prices(prices, synced)
+    store.finish_price_sync(synced)
+
+    assert [row["node_id"] for row in store.cheapest("e10")] == ["3", "2", "1"]
+    assert [row["node_id"] for row in store.cheapest("e10", brand="tesco")] == ["3", "2"]
+    london = (51.4, -0.3, 51.6, 0.0)
+    assert [row["node_id"] for row in store.cheapest("e10", bounds=london)] == ["2", "1"]
+    assert store.cheapest("b7", limit=1)[0]["price"] == 149.9
+    assert store.cheapest("lpg") == []
+
+    # Station 3 drops out of the next sync
+    resynced = synced + 1
+    store.upsert_stations(infos[:2], resynced)
+    store.finish_metadata_sync(resynced)
+    store.upsert_prices(prices[:2], resynced)
+    store.finish_price_sync(resynced)
+
+    # A fresh instance reads the same file, as after a restart
+    reopened = StationStore(store.path)
+    reopened.setup()
+    assert reopened.metadata_synced == resynced
+    assert not reopened.metadata_due()
+    assert reopened.stats() == {"stations": 2, "prices": 3, "metadata_synced": resynced}
+
+
+def test_store_sync_claims(tmp_path):
+    """Test each table is synced by one config entry at a time."""
+    store = StationStore(str(tmp_path / "stations.db"))
+
+    assert store.claim_sync(SYNC_PRICES)
+    assert not store.claim_sync(SYNC_PRICES)
+    assert store.claim_sync(SYNC_STATIONS)
+
+    store.release_sync(SYNC_PRICES)
+    assert store.claim_sync(SYNC_PRICES)
+
+
+def test_store_find_cheapest_within_radius(tmp_path):
+    """Test radius searches with brand and amenity filters, stopping at the limit."""
+    stations = [
+        make_station("1", 51.5080, -0.1280, {"e10": 139.9}, amenities=["car_wash", "shop"]),
+        make_station("2", 51.5300, -0.1000, {"e10": 135.9}, brand_name="Tesco"),
+        make_station("3", 51.5200, -0.1200, {"e10": 137.9}, amenities=["car_wash"]),
+        # Inside the bounding box of a 5 km circle, but outside the circle
+        make_station("4", 51.5400, -0.0600, {"e10": 125.9}),
+        make_station("5", 53.4808, -2.2426, {"e10": 119.9}),
+    ]
+    infos, prices = synthetic_models(stations)
+
+    store = StationStore(str(tmp_path / "stations.db"))
+    store.setup()
+    synced = time.time()
+    store.upsert_stations(infos, synced)
+    store.upsert_prices(prices, synced)
+
+    results = store.find_cheapest("e10", 51.5074, -0.1278, 5.0)
+    assert [row["node_id"] for row in results] == ["2", "3", "1"]
+    assert results[0]["distance"] < 5.0
+    assert results[2]["amenities"] == ["car_wash", "shop"]
+
+    assert [
+        row["node_id"] for row in store.find_cheapest("e10", 51.5074, -0.1278, 5.0, limit=1)
+    ] == ["2"]
+    assert [
+        row["node_id"] for row in store.find_cheapest("e10", 51.5074, -0.1278, 5.0, brand="TESCO")
+    ] == ["2"]
+    assert [
+        row["node_id"]
+        for row in store.find_cheapest("e10", 51.5074, -0.1278, 5.0, amenity="car_wash")
+    ] == ["3", "1"]
+    assert [row["node_id"] for row in store.find_cheapest("e10", 51.5074, -0.1278, 8.0)][0] == "4"
+
+
+async def test_coordinator_fills_store(hass, fake_api):
+    """Test a refresh copies national stations and prices without extra API requests."""
+    dataset_size = PAGE_SIZE + 100
+    fake_api.stations = synthetic_stations(dataset_size)
+    store = await async_get_station_store(hass, "test")
+
+    coordinator = UKFuelFinderCoordinator(hass, ENTRY_DATA, station_store=store)
+    fake_api.configure_client(coordinator.client)
+    data = await coordinator._async_update_data()
+
+    stats = await hass.async_add_executor_job(store.stats)
+    assert stats["stations"] == dataset_size
+    assert stats["metadata_synced"] is not None
+    # Metadata pages came from the client's cache of the station search
+    assert fake_api.requests["/pfs"] == 2
+    assert data["metrics"]["last"]["phases"]["store"] >= 0
+
+    cheapest = await hass.async_add_executor_job(store.cheapest, "e10")
+    _, national_prices = synthetic_models(fake_api.stations)
+    national_min = min(
+        fuel_price.price
+        for pfs in national_prices
+        for fuel_price in pfs.fuel_prices
+        if fuel_price.fuel_type == "E10"
+    )
+    assert cheapest[0]["price"] == national_min
+
+    # Metadata is not synced again on the next refresh
+    coordinator._last_fetch = None
+    await coordinator._async_update_data()
+    assert "store" not in coordinator.metrics.last["phases"]
+
+    await coordinator.async_shutdown()
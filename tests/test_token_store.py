@@ -0,0 +1,120 @@
+"""Test OAuth token persistence."""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.exceptions import ConfigEntryAuthFailed
+
+from custom_components.ukfuelfinder.coordinator import UKFuelFinderCoordinator
+from custom_components.ukfuelfinder.token_store import STORAGE_KEY, async_get_token_store
+from tests.fake_api import CLIENT_ID, CLIENT_SECRET, make_station
+
+ENTRY_DATA = {
+    "client_id": CLIENT_ID,
+    "client_secret": CLIENT_SECRET,
+    "environment": "test",
+    "latitude": 51.5074,
+    "longitude": -0.1278,
+    "radius": 5.0,
+    "update_interval": 30,
+}
+
+
+def _stored_token(expiry, refresh_token="refresh-1", environment="test"):
+    """Build a persisted token store payload."""
+    return {
+        "version": 1,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {
+            CLIENT_ID: {
+                "environment": environment,
+                "access_token": "stored-token",
+                "refresh_token": refresh_token,
+                "expiry": expiry,
+            }
+        },
+    }
+
+
+async def test_token_reused_across_coordinators(hass, fake_api):
+    """Test a reloaded coordinator reuses the token instead of re-authenticating."""
+    fake_api.stations = [make_station("1001", 51.5080, -0.1280, {"e10": 139.9})]
+    token_store = await async_get_token_store(hass)
+
+    coordinator = UKFuelFinderCoordinator(hass, ENTRY_DATA, token_store)
+    fake_api.configure_client(coordinator.client)
+    await coordinator._async_update_data()
+    await coordinator.async_shutdown()
+
+    assert fake_api.tokens_issued == 1
+
+    # Simulate a reload: a fresh coordinator and client for the same entry
+    reloaded = UKFuelFinderCoordinator(hass, ENTRY_DATA, token_store)
+    fake_api.configure_client(reloaded.client)
+    data = await reloaded._async_update_data()
+    await reloaded.async_shutdown()
+
+    assert "1001" in data["stations"]
+    assert fake_api.tokens_issued == 1
+    assert fake_api.requests["/oauth/generate_access_token"] == 1
+
+
+async def test_token_restored_after_restart(hass, hass_storage):
+    """Test a persisted, unexpired token is restored into a new client."""
+    hass_storage[STORAGE_KEY] = _stored_token(time.time() + 1800)
+    token_store = await async_get_token_store(hass)
+    client = MagicMock()
+
+    assert token_store.restore(client, CLIENT_ID, "test")
+    assert client.authenticator._access_token == "stored-token"
+    assert client.authenticator._refresh_token == "refresh-1"
+
+
+async def test_unusable_token_not_restored(hass, hass_storage):
+    """Test expired tokens without a refresh token and other environments are skipped."""
+    hass_storage[STORAGE_KEY] = _stored_token(time.time() - 60, refresh_token=None)
+    token_store = await async_get_token_store(hass)
+
+    assert not token_store.restore(MagicMock(), CLIENT_ID, "test")
+    assert not token_store.restore(MagicMock(), "other_id", "test")
+
+
+async def test_rejected_token_replaced_with_new_one(hass, hass_storage, fake_api):
+    """Test a cached token the API rejects is replaced by a fresh token exchange."""
+    fake_api.stations = [make_station("1001", 51.5080, -0.1280, {"e10": 139.9})]
+    hass_storage[STORAGE_KEY] = _stored_token(time.time() + 1800)
+    token_store = await async_get_token_store(hass)
+
+    coordinator = UKFuelFinderCoordinator(hass, ENTRY_DATA, token_store)
+    fake_api.configure_client(coordinator.client)
+
+    data = await coordinator._async_update_data()
+    await coordinator.async_shutdown()
+
+    assert "1001" in data["stations"]
+    assert fake_api.tokens_issued == 1
+    client = MagicMock()
+    assert token_store.restore(client, CLIENT_ID, "test")
+    assert client.authenticator._access_token not in (None, "stored-token")
+
+
+async def test_rejected_token_with_bad_credentials_fails_auth(hass, hass_storage, fake_api):
+    """Test reauth is only needed when the fresh token exchange fails too."""
+    hass_storage[STORAGE_KEY] = _stored_token(time.time() + 1800)
+    token_store = await async_get_token_store(hass)
+
+    coordinator = UKFuelFinderCoordinator(
+        hass, {**ENTRY_DATA, "client_secret": "wrong_secret"}, token_store
+    )
+    fake_api.configure_client(coordinator.client)
+
+    with pytest.raises(ConfigEntryAuthFailed):
+        await coordinator._async_update_data()
+    await coordinator.async_shutdown()
+
+    # The stored token was rejected, then the exchange with the wrong secret
+    assert fake_api.requests["/oauth/generate_access_token"] == 1
+    assert fake_api.tokens_issued == 0
+    assert not token_store.restore(MagicMock(), CLIENT_ID, "test")
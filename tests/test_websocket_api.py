@@ -0,0 +1,194 @@
+"""Test the UK Fuel Finder WebSocket API."""
+
+import logging
+from datetime import timedelta
+
+import pytest
+from homeassistant.components.websocket_api.connection import ActiveConnection
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ukfuelfinder.const import DOMAIN
+from tests.fake_api import CLIENT_ID, CLIENT_SECRET, make_station
+
+ENTRY_DATA = {
+    "client_id": CLIENT_ID,
+    "client_secret": CLIENT_SECRET,
+    "environment": "test",
+    "latitude": 51.5074,
+    "longitude": -0.1278,
+    "radius": 5.0,
+    "update_interval": 30,
+    "fuel_types": ["e10", "b7"],
+}
+
+STATIONS = [
+    make_station("1001", 51.5080, -0.1280, {"e10": 139.9, "b7": 149.9}),
+    make_station("1002", 51.5200, -0.1300, {"e10": 135.9}),
+    make_station("1003", 51.5130, -0.1250, {"e10": 141.9, "b7": 147.9}),
+]
+
+
+class _Client:
+    """WebSocket connection driven in process, collecting the messages sent to it."""
+
+    def __init__(self, connection: ActiveConnection, messages: list) -> None:
+        self.connection = connection
+        self.messages = messages
+        self.next_id = 0
+
+    def send(self, msg: dict) -> None:
+        """Handle a command as if it arrived over the socket."""
+        self.next_id += 1
+        self.connection.async_handle({"id": self.next_id, **msg})
+
+    def receive(self) -> dict:
+        """Return the oldest message not yet received."""
+        return self.messages.pop(0)
+
+
+@pytest.fixture
+async def ws_client(hass, hass_admin_user):
+    """Return a WebSocket connection without the HTTP transport."""
+    refresh_token = await hass.auth.async_create_refresh_token(
+        hass_admin_user, "https://example.com/"
+    )
+    messages = []
+    connection = ActiveConnection(
+        logging.getLogger(__name__), hass, messages.append, hass_admin_user, refresh_token
+    )
+    yield _Client(connection, messages)
+    connection.async_handle_close()
+
+
+@pytest.fixture
+async def loaded_entry(hass, fake_api, fake_client):
+    """Set up a config entry over three nearby stations."""
+    fake_api.stations = list(STATIONS)
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    yield entry
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_station_table_pages(hass, loaded_entry, ws_client):
+    """Test the station table is columnar, sorted and paginated."""
+    ws_client.send({"type": "ukfuelfinder/stations"})
+    response = ws_client.receive()
+    assert response["success"]
+    result = response["result"]
+    assert result["total"] == 3
+    assert result["fuel_types"] == ["e10", "b7"]
+    columns = result["columns"]
+    assert list(columns) == [
+        "station_id",
+        "name",
+        "brand",
+        "latitude",
+        "longitude",
+        "distance_km",
+        "price_e10",
+        "price_b7",
+        "rank_e10",
+        "rank_b7",
+    ]
+    # Nearest first by default
+    assert columns["station_id"] == ["1001", "1003", "1002"]
+    assert columns["price_b7"] == [149.9, 147.9, None]
+    assert columns["rank_e10"] == [2, 3, 1]
+
+    ws_client.send(
+        {
+            "type": "ukfuelfinder/stations",
+            "entry_id": loaded_entry.entry_id,
+            "sort_by": "price",
+            "fuel_type": "b7",
+            "offset": 1,
+            "limit": 5,
+        }
+    )
+    response = ws_client.receive()
+    # Stations without a b7 price come last
+    assert response["result"]["columns"]["station_id"] == ["1001", "1002"]
+    assert response["result"]["offset"] == 1
+
+    ws_client.send({"type": "ukfuelfinder/stations", "sort_by": "price"})
+    response = ws_client.receive()
+    assert not response["success"]
+
+    ws_client.send({"type": "ukfuelfinder/stations", "entry_id": "missing"})
+    response = ws_client.receive()
+    assert response["error"]["code"] == "not_found"
+
+
+async def test_subscription_sends_only_changes(hass, fake_api, loaded_entry, ws_client, freezer):
+    """Test subscribers get the full table once, then only changed and removed stations."""
+    coordinator = hass.data[DOMAIN][loaded_entry.entry_id]
+
+    ws_client.send({"type": "ukfuelfinder/subscribe_stations"})
+    response = ws_client.receive()
+    assert response["success"]
+    event = ws_client.receive()["event"]
+    assert sorted(event["upserted"]["station_id"]) == ["1001", "1002", "1003"]
+    assert event["removed"] == []
+
+    # 1003 lowers its b7 price without changing any rank
+    fake_api.stations = [
+        STATIONS[0],
+        STATIONS[1],
+        make_station("1003", 51.5130, -0.1250, {"e10": 141.9, "b7": 146.9}),
+    ]
+    freezer.tick(timedelta(minutes=30))
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    event = ws_client.receive()["event"]
+    assert event["upserted"]["station_id"] == ["1003"]
+    assert event["upserted"]["price_b7"] == [146.9]
+    assert event["upserted"]["rank_b7"] == [1]
+    assert event["removed"] == []
+
+    # Refreshes that change nothing send nothing
+    freezer.tick(timedelta(minutes=30))
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert ws_client.messages == []
+
+    # Stations that are no longer nearby are sent as removed
+    stations = dict(coordinator.data["stations"])
+    del stations["1002"]
+    coordinator.async_set_updated_data({**coordinator.data, "stations": stations})
+    event = ws_client.receive()["event"]
+    assert event["upserted"]["station_id"] == []
+    assert event["removed"] == ["1002"]
+
+
+async def test_subscription_ends_on_unload(hass, loaded_entry, ws_client):
+    """Test subscriptions end with an error when the entry reloads, so clients resubscribe."""
+    coordinator = hass.data[DOMAIN][loaded_entry.entry_id]
+    ws_client.send({"type": "ukfuelfinder/subscribe_stations"})
+    assert ws_client.receive()["success"]
+    ws_client.receive()
+    listeners = len(coordinator._listeners)
+
+    assert await hass.config_entries.async_reload(loaded_entry.entry_id)
+    await hass.async_block_till_done()
+
+    response = ws_client.receive()
+    assert response["id"] == 1
+    assert response["error"]["code"] == "not_found"
+    assert ws_client.connection.subscriptions == {}
+    assert ws_client.messages == []
+    # The old coordinator's entities are gone, and so is the subscription listener
+    assert len(coordinator._listeners) < listeners
+    assert not coordinator._listeners
+
+    # The reloaded entry can be subscribed to again
+    ws_client.send({"type": "ukfuelfinder/subscribe_stations"})
+    assert ws_client.receive()["success"]
+    assert sorted(ws_client.receive()["event"]["upserted"]["station_id"]) == [
+        "1001",
+        "1002",
+        "1003",
+    ]